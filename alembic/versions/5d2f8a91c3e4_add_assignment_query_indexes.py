@@ -0,0 +1,50 @@
+"""add_assignment_query_indexes
+
+Revision ID: 5d2f8a91c3e4
+Revises: b81e4fcded97
+Create Date: 2026-10-17 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a91c3e4'
+down_revision: Union[str, None] = 'b81e4fcded97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Remove duplicate occurrences left by repeated assign_chores calls so the
+    # unique constraint can be created. The oldest row of each set is kept.
+    op.execute(
+        "DELETE FROM chore_assignments WHERE id NOT IN ("
+        " SELECT id FROM ("
+        "  SELECT MIN(id) AS id FROM chore_assignments"
+        "  GROUP BY child_id, chore_id, week_start, occurrence_number"
+        " ) AS keep"
+        ")"
+    )
+    op.create_unique_constraint(
+        'uq_chore_assignments_occurrence', 'chore_assignments',
+        ['child_id', 'chore_id', 'week_start', 'occurrence_number']
+    )
+    op.create_index('ix_chore_assignments_child_user_week', 'chore_assignments', ['child_id', 'user_id', 'week_start'], unique=False)
+    op.create_index('ix_chore_assignments_user_id_id', 'chore_assignments', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_children_user_id'), 'children', ['user_id'], unique=False)
+    op.create_index(op.f('ix_chores_user_id'), 'chores', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_chores_user_id'), table_name='chores')
+    op.drop_index(op.f('ix_children_user_id'), table_name='children')
+    op.drop_index('ix_chore_assignments_user_id_id', table_name='chore_assignments')
+    op.drop_index('ix_chore_assignments_child_user_week', table_name='chore_assignments')
+    # MySQL may have dropped its implicit foreign key index on child_id in
+    # favour of the unique constraint, so give the foreign key one back first
+    op.create_index('ix_chore_assignments_child_id', 'chore_assignments', ['child_id'], unique=False)
+    op.drop_constraint('uq_chore_assignments_occurrence', 'chore_assignments', type_='unique')
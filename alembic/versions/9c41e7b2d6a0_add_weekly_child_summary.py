@@ -0,0 +1,54 @@
+"""add_weekly_child_summary
+
+Revision ID: 9c41e7b2d6a0
+Revises: 5d2f8a91c3e4
+Create Date: 2026-10-17 11:02:18.734415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e7b2d6a0'
+down_revision: Union[str, None] = '5d2f8a91c3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'weekly_child_summary',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False),
+        sa.Column('earned_allowance', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('child_id', 'week_start', name='uq_weekly_child_summary_child_week')
+    )
+    op.create_index(op.f('ix_weekly_child_summary_id'), 'weekly_child_summary', ['id'], unique=False)
+    op.create_index('ix_weekly_child_summary_user_week', 'weekly_child_summary', ['user_id', 'week_start'], unique=False)
+
+    # Backfill from existing assignments; same query as `python -m app.cli rebuild-summaries`
+    op.execute(
+        "INSERT INTO weekly_child_summary"
+        " (user_id, child_id, week_start, total_count, completed_count, earned_allowance)"
+        " SELECT a.user_id, a.child_id, a.week_start, COUNT(*),"
+        "  SUM(CASE WHEN a.is_completed THEN 1 ELSE 0 END),"
+        "  c.weekly_allowance * SUM(CASE WHEN a.is_completed THEN 1 ELSE 0 END) / COUNT(*)"
+        " FROM chore_assignments a JOIN children c ON c.id = a.child_id"
+        " GROUP BY a.user_id, a.child_id, a.week_start, c.weekly_allowance"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weekly_child_summary_user_week', table_name='weekly_child_summary')
+    op.drop_index(op.f('ix_weekly_child_summary_id'), table_name='weekly_child_summary')
+    op.drop_table('weekly_child_summary')
@@ -0,0 +1,51 @@
+"""add_chore_assignments_archive
+
+Revision ID: a6d0f3b8c215
+Revises: f1b2c8e4a7d3
+Create Date: 2026-10-17 18:31:44.907356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d0f3b8c215'
+down_revision: Union[str, None] = 'f1b2c8e4a7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chore_assignments_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=True),
+        sa.Column('chore_id', sa.Integer(), nullable=True),
+        sa.Column('is_completed', sa.Boolean(), nullable=True),
+        sa.Column('completion_date', sa.Date(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('occurrence_number', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.ForeignKeyConstraint(['chore_id'], ['chores.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chore_assignments_archive_child_user_week', 'chore_assignments_archive', ['child_id', 'user_id', 'week_start'], unique=False)
+    op.create_index('ix_chore_assignments_archive_user_id_id', 'chore_assignments_archive', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    # Move archived rows back before dropping the table
+    op.execute(
+        "INSERT INTO chore_assignments"
+        " (id, child_id, chore_id, is_completed, completion_date, user_id, week_start, occurrence_number)"
+        " SELECT id, child_id, chore_id, is_completed, completion_date, user_id, week_start, occurrence_number"
+        " FROM chore_assignments_archive"
+    )
+    op.drop_index('ix_chore_assignments_archive_user_id_id', table_name='chore_assignments_archive')
+    op.drop_index('ix_chore_assignments_archive_child_user_week', table_name='chore_assignments_archive')
+    op.drop_table('chore_assignments_archive')
@@ -0,0 +1,114 @@
+"""add_weekly_chore_completions
+
+Revision ID: d4c9e1f7a352
+Revises: a6d0f3b8c215
+Create Date: 2026-10-17 21:07:12.418093
+
+"""
+import struct
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4c9e1f7a352'
+down_revision: Union[str, None] = 'a6d0f3b8c215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Children converted per statement batch
+BATCH_SIZE = 100
+# Bits in the signed 64-bit completed_mask
+MAX_FREQUENCY = 63
+
+
+def upgrade() -> None:
+    op.create_table(
+        'weekly_chore_completions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('chore_id', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('frequency', sa.Integer(), nullable=False),
+        sa.Column('completed_mask', sa.BigInteger(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False),
+        sa.Column('completion_dates', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.ForeignKeyConstraint(['chore_id'], ['chores.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('child_id', 'chore_id', 'week_start', name='uq_weekly_chore_completions_child_chore_week')
+    )
+    op.create_index(op.f('ix_weekly_chore_completions_id'), 'weekly_chore_completions', ['id'], unique=False)
+    op.create_index('ix_weekly_chore_completions_child_user_week', 'weekly_chore_completions', ['child_id', 'user_id', 'week_start'], unique=False)
+    op.create_index('ix_weekly_chore_completions_user_id_id', 'weekly_chore_completions', ['user_id', 'id'], unique=False)
+
+    # Pack existing assignments, live and archived, into one row per child,
+    # chore and week; same as `python -m app.cli convert-assignments --to bitmap`.
+    # chore_assignments is left as is, so either storage can be used afterwards.
+    completions = sa.table(
+        'weekly_chore_completions',
+        sa.column('user_id'), sa.column('child_id'), sa.column('chore_id'), sa.column('week_start'),
+        sa.column('frequency'), sa.column('completed_mask'), sa.column('completed_count'),
+        sa.column('completion_dates'),
+    )
+    connection = op.get_bind()
+    next_children = sa.text(
+        "SELECT DISTINCT child_id FROM ("
+        " SELECT child_id FROM chore_assignments UNION ALL SELECT child_id FROM chore_assignments_archive"
+        ") a WHERE child_id > :after ORDER BY child_id LIMIT :limit"
+    )
+    occurrences = sa.text(
+        "SELECT user_id, child_id, chore_id, week_start, occurrence_number, is_completed, completion_date"
+        " FROM chore_assignments WHERE child_id IN :child_ids"
+        " UNION ALL"
+        " SELECT user_id, child_id, chore_id, week_start, occurrence_number, is_completed, completion_date"
+        " FROM chore_assignments_archive WHERE child_id IN :child_ids"
+    ).bindparams(sa.bindparam('child_ids', expanding=True)).columns(
+        week_start=sa.Date(), is_completed=sa.Boolean(), completion_date=sa.Date()
+    )
+
+    after = 0
+    while True:
+        child_ids = connection.execute(next_children, {'after': after, 'limit': BATCH_SIZE}).scalars().all()
+        if not child_ids:
+            break
+        weeks = defaultdict(dict)
+        for row in connection.execute(occurrences, {'child_ids': child_ids}):
+            weeks[(row.user_id, row.child_id, row.chore_id, row.week_start)][row.occurrence_number] = (
+                (row.completion_date or row.week_start) if row.is_completed else None
+            )
+
+        rows = []
+        for (user_id, child_id, chore_id, week_start), done in weeks.items():
+            frequency = max(done)
+            if frequency > MAX_FREQUENCY:
+                raise ValueError(f"Chore {chore_id} has {frequency} occurrences in a week, more than {MAX_FREQUENCY}")
+            dates = [done.get(number) for number in range(1, frequency + 1)]
+            mask = sum(1 << bit for bit, day in enumerate(dates) if day is not None)
+            rows.append({
+                'user_id': user_id,
+                'child_id': child_id,
+                'chore_id': chore_id,
+                'week_start': week_start,
+                'frequency': frequency,
+                'completed_mask': mask,
+                'completed_count': bin(mask).count('1'),
+                'completion_dates': struct.pack(
+                    f'<{frequency}h', *((day - week_start).days if day else 0 for day in dates)
+                ),
+            })
+        op.bulk_insert(completions, rows)
+        after = child_ids[-1]
+
+
+def downgrade() -> None:
+    # With ASSIGNMENT_STORAGE=bitmap, run `python -m app.cli convert-assignments --to rows` first
+    op.drop_index('ix_weekly_chore_completions_user_id_id', table_name='weekly_chore_completions')
+    op.drop_index('ix_weekly_chore_completions_child_user_week', table_name='weekly_chore_completions')
+    op.drop_index(op.f('ix_weekly_chore_completions_id'), table_name='weekly_chore_completions')
+    op.drop_table('weekly_chore_completions')
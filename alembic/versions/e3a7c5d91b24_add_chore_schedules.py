@@ -0,0 +1,41 @@
+"""add_chore_schedules
+
+Revision ID: e3a7c5d91b24
+Revises: 9c41e7b2d6a0
+Create Date: 2026-10-17 15:40:52.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5d91b24'
+down_revision: Union[str, None] = '9c41e7b2d6a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chore_schedules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('chore_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.ForeignKeyConstraint(['chore_id'], ['chores.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('child_id', 'chore_id', name='uq_chore_schedules_child_chore')
+    )
+    op.create_index(op.f('ix_chore_schedules_id'), 'chore_schedules', ['id'], unique=False)
+    op.create_index('ix_chore_schedules_user_id', 'chore_schedules', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chore_schedules_user_id', table_name='chore_schedules')
+    op.drop_index(op.f('ix_chore_schedules_id'), table_name='chore_schedules')
+    op.drop_table('chore_schedules')
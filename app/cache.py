@@ -0,0 +1,325 @@
+# app/cache.py
+import asyncio
+import hashlib
+import json
+import threading
+import uuid
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+from loguru import logger
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after a time to live.
+
+    Hit, miss and eviction counters are kept so the cache's effectiveness
+    can be checked from /health.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the cache's default for this entry."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InvalidationBus:
+    """
+    Fans cache invalidations (and change events, see app/events.py) out to
+    every worker over Redis pub/sub.
+
+    Handlers are registered per message kind and are applied locally as
+    soon as ``publish`` is called; other processes apply them when the
+    message arrives. Without a Redis client the bus is local only.
+    """
+
+    def __init__(self, client=None, channel: str = "chores:invalidate"):
+        self.client = client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def register(self, kind: str, handler: Callable[[str], None]) -> None:
+        self._handlers[kind] = handler
+
+    async def publish(self, kind: str, key: str) -> None:
+        self._handlers[kind](key)
+        if self.client is not None:
+            message = json.dumps({"origin": self.origin, "kind": kind, "key": key})
+            await self.client.publish(self.channel, message)
+
+    def _receive(self, data) -> None:
+        message = json.loads(data)
+        if message["origin"] != self.origin and message["kind"] in self._handlers:
+            self._handlers[message["kind"]](message["key"])
+
+    async def start(self) -> None:
+        if self.client is None or self._listener is not None:
+            return
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    try:
+                        self._receive(message["data"])
+                    except Exception:
+                        logger.exception("Ignoring malformed cache invalidation message")
+        finally:
+            await pubsub.aclose()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+class CacheBackend:
+    """
+    Byte-valued cache with per-namespace invalidation.
+
+    Every key lives in a namespace (e.g. one per user) and carries that
+    namespace's generation number; ``invalidate`` bumps the generation, so
+    all of a namespace's entries are dropped at once without a scan.
+    Invalidations are also published on the bus, if one is attached.
+    """
+
+    def __init__(self, bus: Optional[InvalidationBus] = None):
+        self.bus = bus
+        if bus is not None:
+            bus.register("namespace", self.apply_invalidation)
+
+    async def generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def invalidate(self, namespace: str) -> None:
+        if self.bus is not None:
+            await self.bus.publish("namespace", namespace)
+        else:
+            self.apply_invalidation(namespace)
+
+    def apply_invalidation(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU backend."""
+
+    def __init__(self, maxsize: int, ttl: float, bus: Optional[InvalidationBus] = None):
+        super().__init__(bus)
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def apply_invalidation(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._generations.clear()
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._entries.stats()}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend shared by all workers through a Redis-protocol server.
+
+    Generations are stored in Redis and read once per namespace per
+    process; bus messages make other workers re-read them after an
+    invalidation, so a lookup is normally a single GET.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "chores", bus: Optional[InvalidationBus] = None):
+        super().__init__(bus)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}:generation:{namespace}"
+
+    async def generation(self, namespace: str) -> int:
+        if namespace not in self._generations:
+            value = await self.client.get(self._generation_key(namespace))
+            self._generations[namespace] = int(value or 0)
+        return self._generations[namespace]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(f"{self.prefix}:{key}")
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        await self.client.set(f"{self.prefix}:{key}", value, px=max(1, int(ttl * 1000)))
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.client.incr(self._generation_key(namespace))
+        await super().invalidate(namespace)
+
+    def apply_invalidation(self, namespace: str) -> None:
+        # Re-read the shared generation on next use
+        self._generations.pop(namespace, None)
+
+    async def clear(self) -> None:
+        self._generations.clear()
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}:*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def make_cache_backend(
+    kind: str,
+    maxsize: int,
+    ttl: float,
+    redis_client=None,
+    bus: Optional[InvalidationBus] = None
+) -> CacheBackend:
+    """Build the backend named by ``kind``: "memory" or "redis"."""
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl, bus=bus)
+    if kind == "redis":
+        if redis_client is None:
+            raise ValueError("CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisCacheBackend(redis_client, ttl=ttl, bus=bus)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    Serialized response bodies and their strong ETags, namespaced per user.
+
+    Take the key with ``key`` before reading the database: a write
+    committed while the response is being built then leaves it stored
+    under a stale generation, where it is never read.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def key(self, user_id: int, route_key: str) -> str:
+        namespace = f"user:{user_id}"
+        return f"{namespace}:{await self.backend.generation(namespace)}:{route_key}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        value = await self.backend.get(key)
+        if value is None:
+            return None
+        etag, body = value.split(b"\n", 1)
+        return CachedResponse(body, etag.decode())
+
+    async def set(self, key: str, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        await self.backend.set(key, entry.etag.encode() + b"\n" + body)
+        return entry
+
+    async def invalidate(self, user_id: int) -> None:
+        await self.backend.invalidate(f"user:{user_id}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        return self.backend.stats()
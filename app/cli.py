@@ -0,0 +1,186 @@
+# app/cli.py
+"""
+Maintenance commands run against the configured database.
+
+    python -m app.cli rebuild-summaries [--user-id ID]
+    python -m app.cli seed [--households 100] [--weeks 52] [--seed 42] ...
+    python -m app.cli generate-week [--week-start YYYY-MM-DD] [--shard 0 --shards 1] [--dry-run]
+    python -m app.cli purge-idempotency-keys
+    python -m app.cli archive-assignments [--horizon-weeks N] [--batch-size 1000] [--pause 0]
+    python -m app.cli convert-assignments --to bitmap|rows [--batch-size 100]
+
+generate-week is meant to run from cron or a systemd timer ahead of each
+week; running it twice, or in several shards at once, is safe.
+
+convert-assignments rewrites one assignment storage from the other; run it
+while the app still uses the old ASSIGNMENT_STORAGE, then switch.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from loguru import logger
+from .database import engine
+from .dependencies import get_password_hash
+from .seed import SeedConfig, seed_database
+from .services.archive import ARCHIVE_BATCH_SIZE, ARCHIVE_HORIZON_WEEKS, archive_assignments, archive_cutoff
+from .services.completions import CONVERT_BATCH_SIZE, convert_to_bitmap, convert_to_rows
+from .services.idempotency import purge_expired
+from .services.scheduler import SCHEDULER_BATCH_SIZE, generate_week
+from .services.storage import STORAGE_MODES, uses_bitmap_storage
+from .services.summaries import rebuild_summaries
+
+
+def _rebuild_summaries(args):
+    with engine.begin() as connection:
+        rows = rebuild_summaries(connection, user_id=args.user_id)
+    logger.info(f"Rebuilt {rows} weekly summaries")
+
+
+def _seed(args):
+    config = SeedConfig(
+        households=args.households,
+        children=args.children,
+        chores=args.chores,
+        weeks=args.weeks,
+        max_frequency=args.max_frequency,
+        completion_rate=args.completion_rate,
+        seed=args.seed,
+        end_week=args.end_week,
+        password=args.password,
+        summaries=not args.skip_summaries,
+    )
+    logger.info(f"Seeding about {config.expected_assignments():,.0f} assignments")
+    started = time.perf_counter()
+    last_report = [started]
+
+    def progress(assignments):
+        now = time.perf_counter()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            logger.info(f"{assignments:,} assignments, {assignments / (now - started):,.0f} rows/s")
+
+    counts = seed_database(engine, config, get_password_hash(config.password), progress)
+    logger.info(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+def _generate_week(args):
+    week_start = args.week_start
+    if week_start is None:
+        today = date.today()
+        week_start = today + timedelta(days=7 - today.weekday())
+
+    def progress(run):
+        logger.info(
+            f"Shard {run.shard}/{run.shards}: {run.households:,} households, "
+            f"{run.assignments:,} assignments{' to create' if run.dry_run else ''} "
+            f"after {run.batches} batches"
+        )
+
+    generate_week(
+        engine, week_start, shard=args.shard, shards=args.shards,
+        batch_size=args.batch_size, dry_run=args.dry_run, progress=progress
+    )
+
+
+def _purge_idempotency_keys(args):
+    with engine.begin() as connection:
+        rows = purge_expired(connection)
+    logger.info(f"Deleted {rows} expired idempotency keys")
+
+
+def _archive_assignments(args):
+    if uses_bitmap_storage():
+        raise SystemExit("archive-assignments only applies to ASSIGNMENT_STORAGE=rows")
+    cutoff = archive_cutoff(args.horizon_weeks)
+    if cutoff is None:
+        raise SystemExit("Set --horizon-weeks or ARCHIVE_HORIZON_WEEKS to a positive number of weeks")
+    logger.info(f"Archiving assignments of weeks before {cutoff}")
+    started = time.perf_counter()
+
+    def progress(moved):
+        logger.info(f"{moved:,} assignments archived, {moved / (time.perf_counter() - started):,.0f} rows/s")
+
+    moved = archive_assignments(engine, cutoff, batch_size=args.batch_size, pause=args.pause, progress=progress)
+    logger.info(f"Archived {moved:,} assignments in {time.perf_counter() - started:.1f}s")
+
+
+def _convert_assignments(args):
+    convert = convert_to_bitmap if args.to == "bitmap" else convert_to_rows
+    started = time.perf_counter()
+
+    def progress(written):
+        logger.info(f"{written:,} {args.to} storage rows written")
+
+    written = convert(engine, batch_size=args.batch_size, progress=progress)
+    logger.info(
+        f"Converted assignments to {args.to} storage, {written:,} rows, in {time.perf_counter() - started:.1f}s; "
+        f"set ASSIGNMENT_STORAGE={args.to}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-summaries", help="Recompute weekly_child_summary from chore_assignments"
+    )
+    rebuild.add_argument("--user-id", type=int, help="Only rebuild this user's summaries")
+    rebuild.set_defaults(handler=_rebuild_summaries)
+
+    seed = commands.add_parser(
+        "seed", help="Append deterministic synthetic households with assignment history"
+    )
+    defaults = SeedConfig()
+    seed.add_argument("--households", type=int, default=defaults.households)
+    seed.add_argument("--children", type=int, default=defaults.children, help="per household")
+    seed.add_argument("--chores", type=int, default=defaults.chores, help="per household")
+    seed.add_argument("--weeks", type=int, default=defaults.weeks, help="weeks of history per household")
+    seed.add_argument("--max-frequency", type=int, default=defaults.max_frequency,
+                      help="chore frequencies are drawn from 1..N per week")
+    seed.add_argument("--completion-rate", type=float, default=defaults.completion_rate,
+                      help="share of past occurrences marked completed")
+    seed.add_argument("--seed", type=int, default=defaults.seed, help="RNG seed")
+    seed.add_argument("--end-week", type=date.fromisoformat,
+                      help="Monday of the last seeded week (default: this week)")
+    seed.add_argument("--password", default=defaults.password, help="password of every seeded user")
+    seed.add_argument("--skip-summaries", action="store_true",
+                      help="don't rebuild weekly_child_summary afterwards")
+    seed.set_defaults(handler=_seed)
+
+    generate = commands.add_parser(
+        "generate-week", help="Create a week of assignments for every household from its chore schedules"
+    )
+    generate.add_argument("--week-start", type=date.fromisoformat, help="Monday of the week (default: next Monday)")
+    generate.add_argument("--shard", type=int, default=0, help="handle households with user_id %% shards == shard")
+    generate.add_argument("--shards", type=int, default=1, help="number of processes sharing the run")
+    generate.add_argument("--batch-size", type=int, default=SCHEDULER_BATCH_SIZE, help="households per transaction")
+    generate.add_argument("--dry-run", action="store_true", help="only count the occurrences that would be created")
+    generate.set_defaults(handler=_generate_week)
+
+    purge = commands.add_parser("purge-idempotency-keys", help="Delete expired Idempotency-Key responses")
+    purge.set_defaults(handler=_purge_idempotency_keys)
+
+    archive = commands.add_parser(
+        "archive-assignments", help="Move assignments of weeks past the horizon to chore_assignments_archive"
+    )
+    archive.add_argument("--horizon-weeks", type=int, default=ARCHIVE_HORIZON_WEEKS,
+                         help="weeks kept live, counting back from this week (default: ARCHIVE_HORIZON_WEEKS)")
+    archive.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="rows per transaction")
+    archive.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    archive.set_defaults(handler=_archive_assignments)
+
+    convert = commands.add_parser(
+        "convert-assignments",
+        help="Replace the assignments of one storage (see ASSIGNMENT_STORAGE) with those of the other"
+    )
+    convert.add_argument("--to", choices=STORAGE_MODES, required=True, help="storage to write")
+    convert.add_argument("--batch-size", type=int, default=CONVERT_BATCH_SIZE, help="children per transaction")
+    convert.set_defaults(handler=_convert_assignments)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
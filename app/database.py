@@ -1,6 +1,11 @@
 # app/database.py
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
 from loguru import logger
@@ -11,19 +16,155 @@ load_dotenv()
 # Check if we're in test mode
 TEST_MODE = os.getenv('TEST_MODE', 'false').lower() == 'true'
 
-if TEST_MODE:
-    SQLITE_URL = "sqlite:///./test.db"
-    engine = create_engine(SQLITE_URL, connect_args={"check_same_thread": False})
+# asyncio driver used for MySQL on the request path: "aiomysql" or "asyncmy"
+MYSQL_ASYNC_DRIVER = os.getenv('DB_ASYNC_DRIVER', 'aiomysql')
+
+if os.getenv('DATABASE_URL'):
+    DATABASE_URL = os.getenv('DATABASE_URL')
+elif TEST_MODE:
+    DATABASE_URL = "sqlite:///./test.db"
 else:
-    MYSQL_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    engine = create_engine(MYSQL_URL)
+    DATABASE_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+
+def async_url(url):
+    """Swap the blocking driver in a database URL for its asyncio counterpart."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if url.get_backend_name() == "mysql":
+        return url.set(drivername=f"mysql+{MYSQL_ASYNC_DRIVER}")
+    return url
+
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+# Connection pool settings for MySQL. SQLite keeps SQLAlchemy's defaults.
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv('DB_POOL_SIZE', '5')),
+    "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', '10')),
+    "pool_timeout": float(os.getenv('DB_POOL_TIMEOUT', '30')),
+    # Recycle before MySQL's wait_timeout closes idle connections server side
+    "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', '1800')),
+    "pool_pre_ping": os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    "pool_use_lifo": os.getenv('DB_POOL_USE_LIFO', 'false').lower() == 'true',
+}
+pool_args = {} if IS_SQLITE else POOL_SETTINGS
+
+class PoolStats:
+    """Counters for the API engine's connection pool, fed by pool events."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_opened = 0
+            self.checkouts = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def attach(self, engine):
+        pool_target = getattr(engine, "sync_engine", engine)
+        event.listen(pool_target, "connect", self._on_connect)
+        event.listen(pool_target, "checkout", self._on_checkout)
+        event.listen(pool_target, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
 
+    def snapshot(self, pool):
+        stats = {
+            "connections_opened": self.connections_opened,
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+        # Queue pools report their live state; SQLite's NullPool has none
+        if hasattr(pool, "checkedout"):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return stats
+
+pool_stats = PoolStats()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waited for a connection."""
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start, timed_out=timed_out)
+
+# Blocking engine for migrations and command line tools
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **pool_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# asyncio engine used by the API so queries don't block the event loop
+if IS_SQLITE:
+    async_engine = create_async_engine(async_url(DATABASE_URL))
+else:
+    async_engine = create_async_engine(
+        async_url(DATABASE_URL), poolclass=InstrumentedAsyncQueuePool, **pool_args
+    )
+pool_stats.attach(async_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+async def get_stream_db():
+    """
+    Session for a StreamingResponse body. Teardown of yield dependencies runs
+    before the body is sent, so the response generator must close it.
+    """
+    return AsyncSessionLocal()
+
+class QueryCounter:
+    """Context manager counting the SQL statements an engine executes while active."""
+    def __init__(self, engine):
+        # Async engines emit cursor events on their underlying sync engine
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
@@ -1,19 +1,70 @@
 # app/dependencies.py
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from redis import asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .cache import InvalidationBus, ResponseCache, TTLCache, make_cache_backend
 from .database import get_db
+from .events import EventBroker
 from .models.user import User
 
 SECRET_KEY = "your-secret-key"  # Move to environment variable
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor; each extra round doubles hashing time
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# Threads hashing passwords at once; 0 hashes inline on the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+
+# Authenticated users cached by token subject. Keep the TTL well under the
+# token lifetime so changes made elsewhere are picked up quickly.
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '60'))
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# Subjects of tokens whose signature and claims were already checked, kept
+# until the token's own expiry. Keyed by a hash so raw tokens aren't held.
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '4096'))
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# With REDIS_URL set, invalidations are broadcast to every worker, and
+# CACHE_BACKEND=redis shares cached responses between them as well.
+REDIS_URL = os.getenv('REDIS_URL')
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+invalidation_bus = InvalidationBus(redis_client)
+invalidation_bus.register("user", user_cache.delete)
+
+# Serialized read responses per user, dropped by that user's writes
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '4096'))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '10'))
+response_cache = ResponseCache(make_cache_backend(
+    CACHE_BACKEND, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, redis_client, invalidation_bus
+))
+
+# Change events for open /api/events streams, shared across workers via the bus
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+EVENT_KEEPALIVE_SECONDS = float(os.getenv('EVENT_KEEPALIVE_SECONDS', '15'))
+event_broker = EventBroker(invalidation_bus, queue_size=EVENT_QUEUE_SIZE)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+# bcrypt releases the GIL, so a small thread pool keeps the event loop free
+# while bounding how much CPU concurrent logins can take
+password_executor = (
+    ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    if PASSWORD_HASH_WORKERS > 0 else None
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 def verify_password(plain_password, hashed_password):
@@ -22,19 +73,32 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def _run_password_task(func, *args):
+    if password_executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+
+async def verify_password_async(plain_password, hashed_password):
+    """verify_password on the bcrypt thread pool."""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """get_password_hash on the bcrypt thread pool."""
+    return await _run_password_task(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(
-    token: str | None = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User | None:
-    if token is None:
-        return None
-        
+def token_subject(token: str) -> str | None:
+    """Return the subject of a valid token, verifying each token only once."""
+    key = hashlib.sha256(token.encode()).digest()
+    username = token_cache.get(key)
+    if username is not None:
+        return username
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -42,10 +106,38 @@ async def get_current_user(
             return None
     except JWTError:
         return None
+
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        token_cache.set(key, username, ttl=expires_in)
+    return username
+
+async def get_current_user(
+    token: str | None = Depends(oauth2_scheme), 
+    db: AsyncSession = Depends(get_db)
+) -> User | None:
+    if token is None:
+        return None
+
+    username = token_subject(token)
+    if username is None:
+        return None
     
-    user = db.query(User).filter(User.username == username).first()
+    user = user_cache.get(username)
+    if user is None:
+        user = await db.scalar(select(User).where(User.username == username))
+        if user is not None:
+            # Detach so the cached copy is never refreshed through another session
+            db.expunge(user)
+            user_cache.set(username, user)
+    if user is not None and not user.is_active:
+        return None
     return user
 
+async def invalidate_cached_user(username: str) -> None:
+    """Drop a user from every worker's lookup cache after it is created or changed."""
+    await invalidation_bus.publish("user", username)
+
 async def get_current_user_or_error(
     current_user: User | None = Depends(get_current_user)
 ) -> User:
@@ -58,4 +150,16 @@ async def get_current_user_or_error(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_stream_user(
+    token: str | None = Depends(oauth2_scheme),
+    access_token: str | None = None,
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Like get_current_user_or_error, but also accepts the token as an
+    ``access_token`` query parameter, since browsers' EventSource can't
+    send an Authorization header.
+    """
+    return await get_current_user_or_error(await get_current_user(token or access_token, db))
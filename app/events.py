@@ -0,0 +1,103 @@
+# app/events.py
+"""
+Change events pushed to open dashboards over server-sent events.
+
+Write endpoints publish a small event per committed change (what changed
+and its ids) to the owning user's subscribers, so screens refetch or patch
+only when something happened instead of polling. With a Redis client on
+the invalidation bus, events reach streams held by every worker.
+"""
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+import orjson
+from .cache import InvalidationBus
+
+# Sent to a stream that fell too far behind; the client should refetch everything
+RESYNC = {"type": "resync", "data": {}}
+
+
+class EventBroker:
+    """
+    Per-user fan-out of change events to in-process subscriber queues.
+
+    Each open stream gets a bounded queue. A stream that stops reading
+    loses its backlog and receives a single ``resync`` event instead, so
+    one slow client can't grow memory without bound.
+    """
+
+    def __init__(self, bus: Optional[InvalidationBus] = None, queue_size: int = 100):
+        self.bus = bus
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self.delivered = 0
+        self.dropped = 0
+        if bus is not None:
+            bus.register("event", self._receive)
+
+    async def publish(self, user_id: int, event_type: str, data: dict) -> None:
+        event = {"user_id": user_id, "type": event_type, "data": data}
+        if self.bus is not None:
+            await self.bus.publish("event", orjson.dumps(event).decode())
+        else:
+            self.deliver(event)
+
+    def _receive(self, message: str) -> None:
+        self.deliver(orjson.loads(message))
+
+    def deliver(self, event: dict) -> None:
+        """Queue an event for every stream of its user in this process."""
+        self.delivered += 1
+        message = {"type": event["type"], "data": event["data"]}
+        for queue in self._subscribers.get(event["user_id"], ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers[user_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "users": len(self._subscribers),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+def format_event(message: dict) -> bytes:
+    return b"event: " + message["type"].encode() + b"\ndata: " + orjson.dumps(message["data"]) + b"\n\n"
+
+
+async def event_stream(broker: EventBroker, user_id: int, keepalive: float) -> AsyncIterator[bytes]:
+    """
+    Server-sent events body for one user's stream.
+
+    A comment line is sent every ``keepalive`` seconds without events, so
+    proxies keep the connection open and dead clients are noticed.
+    """
+    async with broker.subscribe(user_id) as queue:
+        # Tell EventSource how long to wait before reconnecting
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield format_event(message)
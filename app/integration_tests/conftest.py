@@ -1,55 +1,66 @@
 # app/integration_tests/conftest.py
+import os
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from datetime import date, timedelta
-from ..dependencies import create_access_token, get_password_hash
-from ..database import Base, get_db
+# Cheap bcrypt hashes keep the test suite fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+from ..dependencies import create_access_token, get_password_hash, response_cache, token_cache, user_cache
+from ..database import Base, get_db, get_stream_db
 from ..main import app
 from ..models.user import User
 
 # Use SQLite in memory for tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Every connection gets its own in-memory database, opened on the test's event loop
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-@pytest.fixture(scope="session", autouse=True)
-def create_test_database():
-    Base.metadata.create_all(bind=engine)
+@pytest.fixture(autouse=True)
+async def clear_caches():
+    """Users are rolled back after each test, so cached lookups must go too"""
+    user_cache.clear()
+    token_cache.clear()
+    await response_cache.clear()
     yield
-    Base.metadata.drop_all(bind=engine)
+    user_cache.clear()
+    token_cache.clear()
+    await response_cache.clear()
 
 @pytest.fixture
-def db_session():
-    connection = engine.connect()
-    transaction = connection.begin()
+async def db_session():
+    connection = await engine.connect()
+    transaction = await connection.begin()
+    await connection.run_sync(Base.metadata.create_all)
     session = TestingSessionLocal(bind=connection)
     
     yield session
     
-    session.close()
-    transaction.rollback()
-    connection.close()
+    await session.close()
+    await transaction.rollback()
+    await connection.close()
 
 @pytest.fixture
-def client(db_session):
-    def override_get_db():
+async def client(db_session):
+    async def override_get_db():
         try:
             yield db_session
         finally:
             pass
     
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+    app.dependency_overrides[get_stream_db] = lambda: db_session
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 @pytest.fixture
-def test_user(db_session):
+async def test_user(db_session):
     """Create a test user and return auth headers"""
     user = User(
         username="testuser",
@@ -58,7 +69,7 @@ def test_user(db_session):
         is_active=True
     )
     db_session.add(user)
-    db_session.commit()
+    await db_session.commit()
     
     access_token = create_access_token(data={"sub": user.username})
     return {
@@ -2,13 +2,13 @@
 import pytest
 from datetime import datetime, date, timedelta
 
-def test_full_chores_workflow(auth_client, test_user):
+async def test_full_chores_workflow(auth_client, test_user):
     # Create a child
     child_data = {
         "name": f"Test Child {datetime.now().isoformat()}",
         "weekly_allowance": 10.0
     }
-    child_response = auth_client.post('/api/children/', json=child_data)
+    child_response = await auth_client.post('/api/children/', json=child_data)
     assert child_response.status_code == 200
     child = child_response.json()
     child_id = child['id']
@@ -29,14 +29,14 @@ def test_full_chores_workflow(auth_client, test_user):
     ]
     
     for chore in chores:
-        response = auth_client.post('/api/chores/', json=chore)
+        response = await auth_client.post('/api/chores/', json=chore)
         assert response.status_code == 200
         chore_id = response.json()['id']
         chore_ids.append(chore_id)
 
     # Assign weekly chores
     week_start = datetime.now().date().isoformat()
-    assign_response = auth_client.post(
+    assign_response = await auth_client.post(
         '/api/weekly-assignments/',
         json={
             "child_id": child_id,
@@ -52,14 +52,14 @@ def test_full_chores_workflow(auth_client, test_user):
 
     # Complete some assignments
     for assignment in assignments[:3]:
-        complete_response = auth_client.put(f'/api/assignments/{assignment["id"]}/complete')
+        complete_response = await auth_client.put(f'/api/assignments/{assignment["id"]}/complete')
         assert complete_response.status_code == 200
         completed = complete_response.json()
         assert completed["is_completed"] is True
         assert completed["completion_date"] is not None
 
     # Verify weekly assignments
-    weekly_response = auth_client.get(
+    weekly_response = await auth_client.get(
         f'/api/weekly-assignments/{child_id}',
         params={"week_start": week_start}
     )
@@ -67,12 +67,12 @@ def test_full_chores_workflow(auth_client, test_user):
     weekly_assignments = weekly_response.json()
     assert len(weekly_assignments) == 5
 
-def test_error_handling(auth_client):
+async def test_error_handling(auth_client):
     """Test API error responses"""
-    response = auth_client.get('/api/children/99999')
+    response = await auth_client.get('/api/children/99999')
     assert response.status_code == 404
 
-def test_unauthenticated_access(client):
+async def test_unauthenticated_access(client):
     """Test that unauthenticated requests are rejected"""
     endpoints = [
         "/api/children/",
@@ -81,11 +81,11 @@ def test_unauthenticated_access(client):
     ]
     
     for endpoint in endpoints:
-        response = client.get(endpoint)
+        response = await client.get(endpoint)
         assert response.status_code == 401, f"Endpoint {endpoint} should require authentication"
 
-def test_invalid_token(client):
+async def test_invalid_token(client):
     """Test that invalid tokens are rejected"""
     headers = {"Authorization": "Bearer invalid_token"}
-    response = client.get("/api/children/", headers=headers)
+    response = await client.get("/api/children/", headers=headers)
     assert response.status_code == 401
\ No newline at end of file
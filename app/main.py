@@ -1,8 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth_router, users_router, chores_router
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from .routers import auth_router, users_router, chores_router, events_router
+from .database import async_engine, pool_stats
+from .dependencies import event_broker, invalidation_bus, response_cache, token_cache, user_cache
+from .metrics import MetricsMiddleware, metrics
+from .profiling import ProfilingMiddleware, settings as profiling_settings, slow_query_logger
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await invalidation_bus.start()
+    yield
+    await invalidation_bus.stop()
+
+# orjson encodes the final response bodies several times faster than the stdlib json module
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,13 +24,42 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+metrics.attach(async_engine)
+if profiling_settings.sample_rate > 0 or profiling_settings.header_enabled:
+    app.add_middleware(ProfilingMiddleware)
+if profiling_settings.slow_query_ms is not None:
+    slow_query_logger.attach(async_engine)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "db_pool": pool_stats.snapshot(async_engine.pool),
+        "caches": {
+            "users": user_cache.stats(),
+            "tokens": token_cache.stats(),
+            "responses": response_cache.stats(),
+        },
+        "events": event_broker.stats(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    extra = {
+        f"db_pool_{name}": value
+        for name, value in pool_stats.snapshot(async_engine.pool).items()
+    }
+    caches = {"users": user_cache, "tokens": token_cache, "responses": response_cache}
+    for cache_name, cache in caches.items():
+        for name, value in cache.stats().items():
+            if isinstance(value, (int, float)):
+                extra[f"cache_{cache_name}_{name}"] = value
+    return PlainTextResponse(metrics.render(extra), media_type="text/plain; version=0.0.4")
 
 # Include routers
 app.include_router(auth_router)
 app.include_router(users_router, prefix="/api")
 app.include_router(chores_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
 
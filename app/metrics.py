@@ -0,0 +1,176 @@
+# app/metrics.py
+"""
+Request and SQL metrics in Prometheus text format.
+
+MetricsMiddleware times every request and counts the SQL statements it
+runs; the counts come from cursor events on the API engine, attributed to
+the request through a context variable. Everything is updated on the event
+loop thread, so the hot path is a few dict lookups and additions.
+"""
+import bisect
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, label_values: Tuple, value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(self._series.items()):
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+class RequestStats:
+    """SQL work done on behalf of one request."""
+    __slots__ = ("scope", "statements", "sql_seconds")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        """Path template of the matched route, once routing has happened."""
+        route = self.scope.get("route") if self.scope is not None else None
+        return route.path if route is not None else "unmatched"
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Metrics:
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Request latency",
+            ("method", "route", "status"), LATENCY_BUCKETS
+        )
+        self.request_statements = Histogram(
+            "http_request_db_statements", "SQL statements executed per request",
+            ("method", "route"), STATEMENT_BUCKETS
+        )
+        self.request_sql_seconds = Histogram(
+            "http_request_db_seconds", "Time spent in SQL statements per request",
+            ("method", "route"), LATENCY_BUCKETS
+        )
+        self.in_flight = 0
+
+    def attach(self, engine) -> None:
+        """Count statements and their time for the request that runs them."""
+        target = getattr(engine, "sync_engine", engine)
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, engine) -> None:
+        target = getattr(engine, "sync_engine", engine)
+        event.remove(target, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if current_request_stats.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stats = current_request_stats.get()
+        started = getattr(context, "_metrics_started", None)
+        if stats is not None and started is not None:
+            stats.statements += 1
+            stats.sql_seconds += time.perf_counter() - started
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        self.request_duration.observe((method, route, str(status)), seconds)
+        self.request_statements.observe((method, route), stats.statements)
+        self.request_sql_seconds.observe((method, route), stats.sql_seconds)
+
+    def render(self, extra: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition; ``extra`` adds untyped samples such as pool stats."""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        for name, value in (extra or {}).items():
+            lines.extend([f"# TYPE {name} untyped", f"{name} {value}"])
+        for histogram in (self.request_duration, self.request_statements, self.request_sql_seconds):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for histogram in (self.request_duration, self.request_statements, self.request_sql_seconds):
+            histogram.clear()
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and SQL work per route.
+
+    Routes are labelled by their path template (e.g.
+    /api/weekly-assignments/{child_id}) so label cardinality stays bounded;
+    requests that match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        self.registry.in_flight += 1
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.registry.in_flight -= 1
+            current_request_stats.reset(token)
+            self.registry.record_request(scope["method"], stats.route, status, elapsed, stats)
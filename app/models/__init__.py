@@ -1,5 +1,6 @@
-from .chores import Child, Chore, ChoreAssignment
+from .chores import Child, Chore, ChoreAssignment, ChoreAssignmentArchive, ChoreSchedule, WeeklyChildSummary, WeeklyChoreCompletion
+from .idempotency import IdempotencyKey
 from .user import User
 from ..database import Base
 
-__all__ = ['User', 'Child', 'Chore', 'ChoreAssignment', 'Base']
\ No newline at end of file
+__all__ = ['User', 'Child', 'Chore', 'ChoreAssignment', 'ChoreAssignmentArchive', 'ChoreSchedule', 'WeeklyChildSummary', 'WeeklyChoreCompletion', 'IdempotencyKey', 'Base']
\ No newline at end of file
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Date
+from sqlalchemy import (
+    BigInteger, Column, Integer, String, Float, ForeignKey, Boolean, Date, Index, LargeBinary, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -8,7 +10,7 @@ class Child(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50))
     weekly_allowance = Column(Float)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     
     user = relationship("User", back_populates="children")
     assignments = relationship("ChoreAssignment", back_populates="child")
@@ -20,13 +22,24 @@ class Chore(Base):
     name = Column(String(100))
     description = Column(String(255))
     frequency_per_week = Column(Integer, default=1)  # Added this field
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     
     user = relationship("User", back_populates="chores")
     assignments = relationship("ChoreAssignment", back_populates="chore")
 
 class ChoreAssignment(Base):
     __tablename__ = "chore_assignments"
+    __table_args__ = (
+        # One row per occurrence of a chore in a child's week
+        UniqueConstraint(
+            "child_id", "chore_id", "week_start", "occurrence_number",
+            name="uq_chore_assignments_occurrence"
+        ),
+        # get_weekly_assignments
+        Index("ix_chore_assignments_child_user_week", "child_id", "user_id", "week_start"),
+        # complete_assignment and other lookups scoped to the owning user
+        Index("ix_chore_assignments_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("children.id"))
@@ -39,4 +52,82 @@ class ChoreAssignment(Base):
     
     child = relationship("Child", back_populates="assignments")
     chore = relationship("Chore", back_populates="assignments")
-    user = relationship("User", back_populates="assignments")
\ No newline at end of file
+    user = relationship("User", back_populates="assignments")
+
+class WeeklyChildSummary(Base):
+    """Per child and week totals, kept in step with chore_assignments."""
+    __tablename__ = "weekly_child_summary"
+    __table_args__ = (
+        UniqueConstraint("child_id", "week_start", name="uq_weekly_child_summary_child_week"),
+        # Date range reads for a household
+        Index("ix_weekly_child_summary_user_week", "user_id", "week_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
+    week_start = Column(Date, nullable=False)
+    total_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    earned_allowance = Column(Float, nullable=False, default=0.0)
+
+class ChoreSchedule(Base):
+    """A chore to assign a child every week; see app/services/scheduler.py."""
+    __tablename__ = "chore_schedules"
+    __table_args__ = (
+        UniqueConstraint("child_id", "chore_id", name="uq_chore_schedules_child_chore"),
+        # Scheduler batches walk households by user_id
+        Index("ix_chore_schedules_user_id", "user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
+    chore_id = Column(Integer, ForeignKey("chores.id"), nullable=False)
+
+class ChoreAssignmentArchive(Base):
+    """
+    Cold copy of chore_assignments for weeks older than the archive
+    horizon; see app/services/archive.py. Rows keep their original ids.
+    """
+    __tablename__ = "chore_assignments_archive"
+    __table_args__ = (
+        Index("ix_chore_assignments_archive_child_user_week", "child_id", "user_id", "week_start"),
+        Index("ix_chore_assignments_archive_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    child_id = Column(Integer, ForeignKey("children.id"))
+    chore_id = Column(Integer, ForeignKey("chores.id"))
+    is_completed = Column(Boolean, default=False)
+    completion_date = Column(Date, nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    week_start = Column(Date, nullable=False)
+    occurrence_number = Column(Integer, default=1)
+
+class WeeklyChoreCompletion(Base):
+    """
+    All occurrences of a chore in a child's week in one row, used instead
+    of chore_assignments when ASSIGNMENT_STORAGE=bitmap; see
+    app/services/completions.py.
+    """
+    __tablename__ = "weekly_chore_completions"
+    __table_args__ = (
+        UniqueConstraint("child_id", "chore_id", "week_start", name="uq_weekly_chore_completions_child_chore_week"),
+        Index("ix_weekly_chore_completions_child_user_week", "child_id", "user_id", "week_start"),
+        Index("ix_weekly_chore_completions_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
+    chore_id = Column(Integer, ForeignKey("chores.id"), nullable=False)
+    week_start = Column(Date, nullable=False)
+    # Occurrences assigned this week
+    frequency = Column(Integer, nullable=False)
+    # Bit n-1 set when occurrence n is completed
+    completed_mask = Column(BigInteger, nullable=False, default=0)
+    # Set bits in completed_mask, so summaries can be aggregated in SQL
+    completed_count = Column(Integer, nullable=False, default=0)
+    # Completion date of each occurrence as a little-endian int16 day offset from week_start
+    completion_dates = Column(LargeBinary, nullable=False, default=b"")
@@ -0,0 +1,129 @@
+# app/profiling.py
+"""
+Opt-in profiling hooks for finding slow SQL and CPU-heavy routes in production.
+
+- SLOW_QUERY_MS: log every statement slower than this many milliseconds,
+  with its route and the shape (not the values) of its parameters.
+- PROFILE_SAMPLE_RATE: fraction of requests to run under cProfile.
+- PROFILE_HEADER_ENABLED: also profile requests sending ``X-Profile: 1``.
+  Leave off on public deployments; any client could trigger it.
+- PROFILE_DIR: where .pstats files are written, one per profiled request.
+  Inspect them with ``python -m pstats`` or snakeviz.
+
+Only one request is profiled at a time. cProfile follows the event loop
+thread, so other requests interleaved with the profiled one show up too.
+"""
+import cProfile
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+from sqlalchemy import event
+from .metrics import current_request_stats
+
+
+def _optional_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+@dataclass
+class ProfilingSettings:
+    slow_query_ms: Optional[float] = _optional_float('SLOW_QUERY_MS')
+    sample_rate: float = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+    header_enabled: bool = os.getenv('PROFILE_HEADER_ENABLED', 'false').lower() == 'true'
+    profile_dir: str = os.getenv('PROFILE_DIR', './profiles')
+
+
+settings = ProfilingSettings()
+
+
+def parameters_shape(parameters) -> str:
+    """Describe bound parameters by type only, so no values reach the logs."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return f"{len(parameters)} x {parameters_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+class SlowQueryLogger:
+    def attach(self, engine) -> None:
+        target = getattr(engine, "sync_engine", engine)
+        event.listen(target, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def detach(self, engine) -> None:
+        target = getattr(engine, "sync_engine", engine)
+        event.remove(target, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(target, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if settings.slow_query_ms is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < settings.slow_query_ms:
+            return
+        stats = current_request_stats.get()
+        logger.warning(
+            "Slow query ({:.1f} ms) on {}: {} parameters={}",
+            elapsed_ms,
+            stats.route if stats is not None else "no request",
+            " ".join(statement.split()),
+            parameters_shape(parameters),
+        )
+
+
+slow_query_logger = SlowQueryLogger()
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware running sampled (or header-requested) requests
+    under cProfile and writing one .pstats file per profiled request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    def _wants_profile(self, scope) -> bool:
+        if settings.header_enabled and (b"x-profile", b"1") in scope["headers"]:
+            return True
+        return settings.sample_rate > 0 and random.random() < settings.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._busy = False
+            self._dump(profiler, scope, time.perf_counter() - started)
+
+    def _dump(self, profiler, scope, elapsed: float) -> None:
+        route = scope.get("route")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route.path if route is not None else scope["path"]).strip("_")
+        directory = Path(settings.profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{slug or 'root'}-{os.getpid()}-{random.randrange(1 << 16):04x}.pstats"
+        profiler.dump_stats(path)
+        logger.info("Profiled {} {} in {:.1f} ms: {}", scope["method"], scope["path"], elapsed * 1000, path)
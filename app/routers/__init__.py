@@ -1,3 +1,4 @@
 from .auth import router as auth_router
 from .users import router as users_router
-from .chores import router as chores_router
\ No newline at end of file
+from .chores import router as chores_router
+from .events import router as events_router
\ No newline at end of file
@@ -1,141 +1,377 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable, List, Literal, Optional
 from datetime import date
-from ..dependencies import get_current_user, get_current_user_or_error
-from ..database import get_db
-from ..models import Child, Chore, ChoreAssignment, User
+from urllib.parse import urlencode
+from ..dependencies import event_broker, get_current_user, get_current_user_or_error, response_cache
+from ..database import get_db, get_stream_db
+from ..models import Child, Chore, ChoreSchedule, User, WeeklyChildSummary
+from ..services import assignments as row_storage, completions as bitmap_storage
+from ..services.archive import is_archived_week
+from ..services.export import MEDIA_TYPES, stream_assignment_history
+from ..services.idempotency import find_response, request_fingerprint, store_response
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from ..services.storage import uses_bitmap_storage
 from ..schemas.chores import (
+    AssignmentCompletionResult,
+    AssignmentCompletionUpdate,
     ChildCreate,
     Child as ChildResponse,
     ChoreCreate,
     Chore as ChoreResponse,
     ChoreAssignmentCreate,
-    ChoreAssignment as ChoreAssignmentResponse
+    ChoreAssignment as ChoreAssignmentResponse,
+    ChoreScheduleCreate,
+    ChoreSchedule as ChoreScheduleResponse,
+    WeeklySummary
 )
+from ..schemas.pagination import Page
 
 router = APIRouter()
 
-@router.get("/children/", response_model=List[ChildResponse])
+child_page_adapter = TypeAdapter(Page[ChildResponse])
+chore_page_adapter = TypeAdapter(Page[ChoreResponse])
+assignment_list_adapter = TypeAdapter(List[ChoreAssignmentResponse])
+
+# Columns the list responses need. Selecting just these keeps read-only
+# listings out of the ORM: no entities, identity map or relationship state.
+CHILD_COLUMNS = (Child.id, Child.name, Child.weekly_allowance)
+CHORE_COLUMNS = (Chore.id, Chore.name, Chore.description, Chore.frequency_per_week)
+
+def _storage():
+    """Assignment functions of the configured ASSIGNMENT_STORAGE; both return the same payloads."""
+    return bitmap_storage if uses_bitmap_storage() else row_storage
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+async def _cached_response(
+    request: Request,
+    user_id: int,
+    adapter: Optional[TypeAdapter],
+    build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Serve a read endpoint from the per-user response cache.
+
+    On a miss `build` runs the queries and the result is serialized once
+    through `adapter`. With no adapter, `build` must already return plain
+    JSON-ready data in the response schema's shape, and it is dumped with
+    orjson without validation. Clients sending a matching If-None-Match
+    get a 304 with no body.
+    """
+    route_key = f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+    key = await response_cache.key(user_id, route_key)
+    entry = await response_cache.get(key)
+    if entry is None:
+        if adapter is None:
+            body = orjson.dumps(await build())
+        else:
+            body = adapter.dump_json(adapter.validate_python(await build(), from_attributes=True))
+        entry = await response_cache.set(key, body)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+async def _publish_change(user_id: int, event_type: str, data: dict) -> None:
+    """After a commit: drop the user's cached reads and notify their open event streams."""
+    await response_cache.invalidate(user_id)
+    await event_broker.publish(user_id, event_type, data)
+
+@router.get("/children/", response_model=Page[ChildResponse])
 async def get_children(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    name: Optional[str] = None,
     current_user: User = Depends(get_current_user_or_error),  # Changed from get_current_user
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return db.query(Child).filter(Child.user_id == current_user.id).all()
+    async def build():
+        stmt = select(*CHILD_COLUMNS).where(Child.user_id == current_user.id)
+        if name is not None:
+            stmt = stmt.where(Child.name == name)
+        return await paginate(db, stmt, Child.id, limit, after)
+
+    return await _cached_response(request, current_user.id, child_page_adapter, build)
 
 @router.post("/children/", response_model=ChildResponse)
 async def create_child(
     child: ChildCreate,
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     db_child = Child(**child.dict(), user_id=current_user.id)
     db.add(db_child)
-    db.commit()
-    db.refresh(db_child)
+    await db.commit()
+    await db.refresh(db_child)
+    await _publish_change(current_user.id, "child.created", {
+        "id": db_child.id, "name": db_child.name, "weekly_allowance": db_child.weekly_allowance
+    })
     return db_child
 
-@router.get("/chores/", response_model=List[ChoreResponse])
+@router.get("/chores/", response_model=Page[ChoreResponse])
 async def get_chores(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    name: Optional[str] = None,
+    frequency_per_week: Optional[int] = None,
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return db.query(Chore).filter(Chore.user_id == current_user.id).all()
+    async def build():
+        stmt = select(*CHORE_COLUMNS).where(Chore.user_id == current_user.id)
+        if name is not None:
+            stmt = stmt.where(Chore.name == name)
+        if frequency_per_week is not None:
+            stmt = stmt.where(Chore.frequency_per_week == frequency_per_week)
+        return await paginate(db, stmt, Chore.id, limit, after)
+
+    return await _cached_response(request, current_user.id, chore_page_adapter, build)
 
 @router.post("/chores/", response_model=ChoreResponse)
 async def create_chore(
     chore: ChoreCreate,
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     db_chore = Chore(**chore.dict(), user_id=current_user.id)
     db.add(db_chore)
-    db.commit()
-    db.refresh(db_chore)
+    await db.commit()
+    await db.refresh(db_chore)
+    await _publish_change(current_user.id, "chore.created", {
+        "id": db_chore.id, "name": db_chore.name, "description": db_chore.description,
+        "frequency_per_week": db_chore.frequency_per_week
+    })
     return db_chore
 
 @router.get("/weekly-assignments/{child_id}", response_model=List[ChoreAssignmentResponse])
 async def get_weekly_assignments(
+    request: Request,
     child_id: int,
     week_start: date,
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    # First verify the child belongs to the user
-    child = db.query(Child).filter(
-        Child.id == child_id,
-        Child.user_id == current_user.id
-    ).first()
-    
-    if not child:
-        raise HTTPException(status_code=404, detail="Child not found")
+    async def build():
+        # First verify the child belongs to the user
+        child = await db.scalar(select(Child).where(
+            Child.id == child_id,
+            Child.user_id == current_user.id
+        ))
 
-    # Fetch assignments for the specific week
-    assignments = db.query(ChoreAssignment).filter(
-        ChoreAssignment.child_id == child_id,
-        ChoreAssignment.user_id == current_user.id,
-        ChoreAssignment.week_start == week_start
-    ).all()
+        if not child:
+            raise HTTPException(status_code=404, detail="Child not found")
 
-    return assignments
+        return await _storage().weekly_assignment_payloads(db, current_user.id, child_id, week_start)
+
+    return await _cached_response(request, current_user.id, None, build)
 
 @router.post("/weekly-assignments/", response_model=List[ChoreAssignmentResponse])
 async def assign_chores(
     assignment: ChoreAssignmentCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
+    """
+    Assign every occurrence of the chores for the week. Safe to repeat:
+    only missing occurrences are added. With an Idempotency-Key header a
+    retry is answered from the stored response without touching the
+    assignments.
+    """
+    if idempotency_key is not None:
+        fingerprint = request_fingerprint("POST /api/weekly-assignments/", assignment.model_dump_json().encode())
+        stored = await find_response(db, current_user.id, idempotency_key)
+        if stored is not None:
+            if stored.request_hash != fingerprint:
+                raise HTTPException(
+                    status_code=422, detail="Idempotency-Key was already used for a different request"
+                )
+            return Response(
+                stored.response_body, status_code=stored.status_code,
+                media_type="application/json", headers={"Idempotent-Replayed": "true"}
+            )
+
     # Verify child belongs to user
-    child = db.query(Child).filter(
+    child = await db.scalar(select(Child).where(
         Child.id == assignment.child_id,
         Child.user_id == current_user.id
-    ).first()
+    ))
     if not child:
         raise HTTPException(status_code=404, detail="Child not found")
+    if is_archived_week(assignment.week_start):
+        raise HTTPException(status_code=409, detail="Week is archived and read-only")
 
-    assignments = []
-    for chore_id in assignment.chore_ids:
-        # Verify chore belongs to user
-        chore = db.query(Chore).filter(
-            Chore.id == chore_id,
-            Chore.user_id == current_user.id
-        ).first()
-        if not chore:
-            continue
-
-        for occurrence in range(1, chore.frequency_per_week + 1):
-            db_assignment = ChoreAssignment(
-                child_id=assignment.child_id,
-                chore_id=chore_id,
-                user_id=current_user.id,
-                week_start=assignment.week_start,
-                occurrence_number=occurrence,
-                is_completed=False
-            )
-            db.add(db_assignment)
-            assignments.append(db_assignment)
+    try:
+        assignments = await _storage().create_weekly_assignments(db, current_user.id, assignment)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    await _publish_change(current_user.id, "assignments.created", {
+        "child_id": assignment.child_id,
+        "week_start": assignment.week_start,
+        "ids": [row["id"] for row in assignments],
+    })
+    if idempotency_key is None:
+        return assignments
 
-    db.commit()
-    for a in assignments:
-        db.refresh(a)
-    return assignments
+    body = assignment_list_adapter.dump_json(assignment_list_adapter.validate_python(assignments))
+    await store_response(db, current_user.id, idempotency_key, fingerprint, 200, body)
+    return Response(body, media_type="application/json")
+
+@router.get("/assignments/export")
+async def export_assignments(
+    child_id: Optional[int] = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db),
+    stream_db: AsyncSession = Depends(get_stream_db)
+):
+    if child_id is not None:
+        child = await db.scalar(select(Child).where(
+            Child.id == child_id,
+            Child.user_id == current_user.id
+        ))
+        if not child:
+            await stream_db.close()
+            raise HTTPException(status_code=404, detail="Child not found")
+
+    return StreamingResponse(
+        stream_assignment_history(stream_db, current_user.id, child_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="assignments.{format}"'}
+    )
+
+@router.put("/assignments/complete", response_model=List[AssignmentCompletionResult])
+async def complete_assignments(
+    batch: AssignmentCompletionUpdate,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        results = await _storage().set_completion(db, current_user.id, batch.assignment_ids, batch.completed)
+    except bitmap_storage.ConcurrentUpdateError:
+        raise HTTPException(status_code=409, detail="Assignments changed concurrently, retry")
+    updated = [result["id"] for result in results if result["status"] == "updated"]
+    if updated:
+        await _publish_change(current_user.id, "assignments.completed", {
+            "ids": updated, "completed": batch.completed
+        })
+    return results
 
 @router.put("/assignments/{assignment_id}/complete")
 async def complete_assignment(
     assignment_id: int,
     current_user: User = Depends(get_current_user_or_error),  # Changed
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    assignment = db.query(ChoreAssignment).filter(
-        ChoreAssignment.id == assignment_id,
-        ChoreAssignment.user_id == current_user.id
-    ).first()
-    
-    if not assignment:
+    try:
+        completed = await _storage().complete_assignment(db, current_user.id, assignment_id)
+    except bitmap_storage.ConcurrentUpdateError:
+        raise HTTPException(status_code=409, detail="Assignment changed concurrently, retry")
+    if completed is None:
         raise HTTPException(status_code=404, detail="Assignment not found")
-    
-    assignment.is_completed = True
-    assignment.completion_date = date.today()
-    db.commit()
-    db.refresh(assignment)
-    return assignment
\ No newline at end of file
+
+    assignment, changed = completed
+    if changed:
+        await _publish_change(current_user.id, "assignments.completed", {
+            "ids": [assignment["id"]], "completed": True
+        })
+    return assignment
+
+
+@router.get("/summaries/", response_model=List[WeeklySummary])
+async def get_weekly_summaries(
+    start: date,
+    end: date,
+    child_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    stmt = select(WeeklyChildSummary).where(
+        WeeklyChildSummary.user_id == current_user.id,
+        WeeklyChildSummary.week_start >= start,
+        WeeklyChildSummary.week_start <= end
+    )
+    if child_id is not None:
+        stmt = stmt.where(WeeklyChildSummary.child_id == child_id)
+    stmt = stmt.order_by(WeeklyChildSummary.week_start, WeeklyChildSummary.child_id)
+    return (await db.scalars(stmt)).all()
+
+
+@router.get("/schedules/", response_model=List[ChoreScheduleResponse])
+async def get_schedules(
+    child_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    stmt = select(ChoreSchedule.id, ChoreSchedule.child_id, ChoreSchedule.chore_id).where(
+        ChoreSchedule.user_id == current_user.id
+    )
+    if child_id is not None:
+        stmt = stmt.where(ChoreSchedule.child_id == child_id)
+    return [row._asdict() for row in await db.execute(stmt.order_by(ChoreSchedule.id))]
+
+@router.post("/schedules/", response_model=List[ChoreScheduleResponse])
+async def create_schedules(
+    schedule: ChoreScheduleCreate,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Assign chores to a child every week from now on; `python -m app.cli
+    generate-week` materializes them. Chores already scheduled for the
+    child and chore ids that don't belong to the user are skipped. Returns
+    the child's schedules.
+    """
+    child = await db.scalar(select(Child).where(
+        Child.id == schedule.child_id,
+        Child.user_id == current_user.id
+    ))
+    if not child:
+        raise HTTPException(status_code=404, detail="Child not found")
+
+    chore_ids = set(await db.scalars(select(Chore.id).where(
+        Chore.id.in_(set(schedule.chore_ids)),
+        Chore.user_id == current_user.id
+    )))
+    chore_ids -= set(await db.scalars(select(ChoreSchedule.chore_id).where(
+        ChoreSchedule.child_id == schedule.child_id
+    )))
+    if chore_ids:
+        db.add_all([
+            ChoreSchedule(user_id=current_user.id, child_id=schedule.child_id, chore_id=chore_id)
+            for chore_id in sorted(chore_ids)
+        ])
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Schedule changed concurrently, retry")
+    return await get_schedules(schedule.child_id, current_user, db)
+
+@router.delete("/schedules/{schedule_id}", status_code=204)
+async def delete_schedule(
+    schedule_id: int,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stop scheduling a chore; assignments already generated are kept."""
+    deleted = await db.execute(delete(ChoreSchedule).where(
+        ChoreSchedule.id == schedule_id,
+        ChoreSchedule.user_id == current_user.id
+    ))
+    if not deleted.rowcount:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    await db.commit()
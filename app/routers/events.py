@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from ..dependencies import EVENT_KEEPALIVE_SECONDS, event_broker, get_stream_user
+from ..events import event_stream
+from ..models import User
+
+router = APIRouter()
+
+@router.get("/events")
+async def stream_events(current_user: User = Depends(get_stream_user)):
+    """
+    Server-sent events for the current user's changes: child.created,
+    chore.created, assignments.created and assignments.completed, each
+    with the ids needed to patch or refetch the affected view.
+    """
+    return StreamingResponse(
+        event_stream(event_broker, current_user.id, EVENT_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        # Stop nginx and similar proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
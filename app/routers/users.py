@@ -1,45 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from ..database import get_db
-from ..dependencies import get_current_user, get_password_hash
+from ..dependencies import (
+    get_current_user,
+    get_current_user_or_error,
+    get_password_hash_async,
+    invalidate_cached_user
+)
 from ..models.user import User
-from ..schemas.user import UserCreate, UserResponse
+from ..schemas.pagination import Page
+from ..schemas.user import UserCreate, UserUpdate, UserResponse
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
 
 router = APIRouter(
     prefix="/users",
     tags=["users"]
 )
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Page[UserResponse])
 async def get_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    is_admin: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized")
-    return db.query(User).all()
+    stmt = select(User.id, User.username, User.email, User.is_admin, User.is_active)
+    if is_admin is not None:
+        stmt = stmt.where(User.is_admin == is_admin)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    return await paginate(db, stmt, User.id, limit, after)
 
 @router.post("/", response_model=UserResponse)
 async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_current_user)  # Changed this line
 ):
     # Check if this is the first user
-    is_first_user = db.query(User).first() is None
+    is_first_user = await db.scalar(select(User).limit(1)) is None
     
     # If not first user, check authorization
     if not is_first_user and (not current_user or not current_user.is_admin):
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    if db.query(User).filter(User.username == user.username).first():
+    if await db.scalar(select(User).where(User.username == user.username)):
         raise HTTPException(status_code=400, detail="Username already registered")
     
-    if db.query(User).filter(User.email == user.email).first():
+    if await db.scalar(select(User).where(User.email == user.email)):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -48,6 +65,54 @@ async def create_user(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    await invalidate_cached_user(db_user.username)
+    return db_user
+
+async def _get_user_for_admin(user_id: int, current_user: User, db: AsyncSession) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    db_user = await db.get(User, user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    user: UserUpdate,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    db_user = await _get_user_for_admin(user_id, current_user, db)
+    old_username = db_user.username
+
+    if user.username != db_user.username and await db.scalar(select(User).where(User.username == user.username)):
+        raise HTTPException(status_code=400, detail="Username already registered")
+    if user.email != db_user.email and await db.scalar(select(User).where(User.email == user.email)):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    db_user.username = user.username
+    db_user.email = user.email
+    db_user.is_admin = user.is_admin
+    if user.password:
+        db_user.hashed_password = await get_password_hash_async(user.password)
+    await db.commit()
+    await db.refresh(db_user)
+    await invalidate_cached_user(old_username)
+    await invalidate_cached_user(db_user.username)
+    return db_user
+
+@router.post("/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: int,
+    current_user: User = Depends(get_current_user_or_error),
+    db: AsyncSession = Depends(get_db)
+):
+    db_user = await _get_user_for_admin(user_id, current_user, db)
+    db_user.is_active = False
+    await db.commit()
+    await db.refresh(db_user)
+    await invalidate_cached_user(db_user.username)
     return db_user
\ No newline at end of file
@@ -1,6 +1,8 @@
 # app/schemas/__init__.py
 from .user import UserBase, UserCreate, UserUpdate, UserResponse, Token
 from .chores import (
+    AssignmentCompletionResult,
+    AssignmentCompletionUpdate,
     ChoreAssignmentCreate,
     ChoreBase,
     ChoreCreate,
@@ -9,5 +11,7 @@ from .chores import (
     ChoreAssignment,
     ChildBase,
     ChildCreate,
-    Child
-)
\ No newline at end of file
+    Child,
+    WeeklySummary
+)
+from .pagination import Page
\ No newline at end of file
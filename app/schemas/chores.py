@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, computed_field
+from typing import Literal, Optional, List
 from datetime import date
 
 class ChoreAssignmentCreate(BaseModel):
@@ -8,6 +8,26 @@ class ChoreAssignmentCreate(BaseModel):
     week_start: date
     
 
+class ChoreScheduleCreate(BaseModel):
+    child_id: int
+    chore_ids: List[int] = Field(min_length=1)
+
+class ChoreSchedule(BaseModel):
+    id: int
+    child_id: int
+    chore_id: int
+
+    class Config:
+        from_attributes = True
+
+class AssignmentCompletionUpdate(BaseModel):
+    assignment_ids: List[int] = Field(min_length=1, max_length=500)
+    completed: bool = True
+
+class AssignmentCompletionResult(BaseModel):
+    id: int
+    status: Literal["updated", "unchanged", "not_found"]
+
 class ChoreBase(BaseModel):
     name: str
     description: str
@@ -49,4 +69,19 @@ class Child(ChildBase):
     chore_assignments: List[ChoreAssignment] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class WeeklySummary(BaseModel):
+    child_id: int
+    week_start: date
+    total_count: int
+    completed_count: int
+    earned_allowance: float
+
+    @computed_field
+    @property
+    def completion_rate(self) -> float:
+        return self.completed_count / self.total_count if self.total_count else 0.0
+
+    class Config:
+        from_attributes = True
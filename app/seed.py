@@ -0,0 +1,193 @@
+# app/seed.py
+"""
+Deterministic synthetic data for load tests and index/pagination work.
+
+Households (a user with children and chores) get ``weeks`` weeks of
+assignment history ending at ``end_week``. Everything random comes from
+one seeded RNG, so the same settings always produce the same rows. Rows
+are written in chunks of multi-row inserts with explicit ids, each chunk
+in its own transaction, so tens of millions of assignments can be
+generated without holding them in memory or in one huge transaction.
+
+Assignments are always seeded as chore_assignments rows; with
+ASSIGNMENT_STORAGE=bitmap, run ``python -m app.cli convert-assignments``
+afterwards.
+"""
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Optional
+from loguru import logger
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import Engine
+from .models import Child, Chore, ChoreAssignment, User
+from .services.summaries import rebuild_summaries
+
+# Rows per INSERT batch; pymysql and sqlite3 both turn a batch into few round trips
+SEED_CHUNK_SIZE = 10000
+
+ASSIGNMENT_COLUMNS = (
+    "id", "child_id", "chore_id", "user_id", "week_start",
+    "occurrence_number", "is_completed", "completion_date",
+)
+
+
+@dataclass
+class SeedConfig:
+    households: int = 100
+    children: int = 2
+    chores: int = 8
+    weeks: int = 52
+    max_frequency: int = 7
+    completion_rate: float = 0.8
+    seed: int = 42
+    end_week: Optional[date] = None
+    password: str = "password"
+    summaries: bool = True
+
+    def expected_assignments(self) -> float:
+        """Approximate assignment count; frequencies are drawn uniformly from 1..max_frequency."""
+        return self.households * self.children * self.chores * self.weeks * (self.max_frequency + 1) / 2
+
+
+def _next_ids(engine: Engine) -> dict:
+    with engine.connect() as conn:
+        return {
+            model: (conn.scalar(select(func.max(model.id))) or 0) + 1
+            for model in (User, Child, Chore, ChoreAssignment)
+        }
+
+
+def _fast_sqlite_writes(engine: Engine):
+    # Seeding writes a throwaway or rebuildable dataset; skip fsyncs on SQLite
+    if engine.dialect.name != "sqlite":
+        return None
+
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA synchronous = OFF")
+        dbapi_connection.execute("PRAGMA journal_mode = MEMORY")
+
+    event.listen(engine, "connect", on_connect)
+    engine.dispose()
+    return on_connect
+
+
+def _assignment_insert(dialect):
+    """
+    Driver-level INSERT taking tuples in ASSIGNMENT_COLUMNS order.
+
+    Assignments are nearly all of the rows; sending them through
+    exec_driver_sql skips Core's per-row parameter processing, which
+    otherwise costs more than the inserts themselves.
+    """
+    compiled = insert(ChoreAssignment.__table__).compile(
+        dialect=dialect, column_keys=list(ASSIGNMENT_COLUMNS)
+    )
+    if not compiled.positional:
+        return str(compiled), lambda rows: [dict(zip(ASSIGNMENT_COLUMNS, row)) for row in rows]
+    order = [ASSIGNMENT_COLUMNS.index(name) for name in compiled.positiontup]
+    if order == list(range(len(ASSIGNMENT_COLUMNS))):
+        return str(compiled), lambda rows: rows
+    return str(compiled), lambda rows: [tuple(row[i] for i in order) for row in rows]
+
+
+def seed_database(
+    engine: Engine,
+    config: SeedConfig,
+    hashed_password: str,
+    progress: Optional[Callable[[int], None]] = None
+) -> dict:
+    """
+    Append ``config.households`` households after any existing rows and
+    return the number of rows written per table.
+
+    ``hashed_password`` is stored for every user, so bcrypt runs once per
+    seed rather than once per user. ``progress`` is called with the running
+    assignment count after each chunk.
+    """
+    rng = random.Random(config.seed)
+    end_week = config.end_week or date.today() - timedelta(days=date.today().weekday())
+    first_week = end_week - timedelta(weeks=config.weeks - 1)
+    next_ids = _next_ids(engine)
+    listener = _fast_sqlite_writes(engine)
+    counts = {"users": 0, "children": 0, "chores": 0, "chore_assignments": 0}
+    pending = {User: [], Child: [], Chore: [], ChoreAssignment: []}
+    assignment_sql, assignment_params = _assignment_insert(engine.dialect)
+    # SQLite stores dates as ISO strings; convert once per date, not per row
+    as_date = date.isoformat if engine.dialect.name == "sqlite" else (lambda d: d)
+
+    def flush():
+        with engine.begin() as conn:
+            # Parents first, so foreign keys are satisfied within the chunk
+            for model in (User, Child, Chore):
+                if pending[model]:
+                    conn.execute(insert(model), pending[model])
+                    counts[model.__tablename__] += len(pending[model])
+                    pending[model] = []
+            if pending[ChoreAssignment]:
+                conn.exec_driver_sql(assignment_sql, assignment_params(pending[ChoreAssignment]))
+                counts["chore_assignments"] += len(pending[ChoreAssignment])
+                pending[ChoreAssignment] = []
+        if progress is not None:
+            progress(counts["chore_assignments"])
+
+    try:
+        for _ in range(config.households):
+            user_id = next_ids[User]
+            next_ids[User] += 1
+            pending[User].append({
+                "id": user_id, "username": f"seed{user_id}", "email": f"seed{user_id}@example.com",
+                "hashed_password": hashed_password, "is_admin": False, "is_active": True,
+            })
+
+            child_ids = list(range(next_ids[Child], next_ids[Child] + config.children))
+            next_ids[Child] += config.children
+            pending[Child].extend(
+                {"id": child_id, "name": f"Child {child_id}",
+                 "weekly_allowance": float(rng.randint(1, 20)), "user_id": user_id}
+                for child_id in child_ids
+            )
+
+            chores = []
+            for _ in range(config.chores):
+                chores.append((next_ids[Chore], rng.randint(1, config.max_frequency)))
+                next_ids[Chore] += 1
+            pending[Chore].extend(
+                {"id": chore_id, "name": f"Chore {chore_id}", "description": "",
+                 "frequency_per_week": frequency, "user_id": user_id}
+                for chore_id, frequency in chores
+            )
+
+            rows = pending[ChoreAssignment]
+            assignment_id = next_ids[ChoreAssignment]
+            for week in range(config.weeks):
+                week_start = first_week + timedelta(weeks=week)
+                past = week_start < end_week
+                week_value = as_date(week_start)
+                days = [as_date(week_start + timedelta(days=day)) for day in range(7)]
+                for child_id in child_ids:
+                    for chore_id, frequency in chores:
+                        for occurrence in range(1, frequency + 1):
+                            completed = past and rng.random() < config.completion_rate
+                            rows.append((
+                                assignment_id, child_id, chore_id, user_id, week_value, occurrence,
+                                completed, days[int(rng.random() * 7)] if completed else None,
+                            ))
+                            assignment_id += 1
+                if len(rows) >= SEED_CHUNK_SIZE:
+                    flush()
+                    rows = pending[ChoreAssignment]
+            next_ids[ChoreAssignment] = assignment_id
+        flush()
+
+        if config.summaries:
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                counts["weekly_child_summary"] = rebuild_summaries(conn, storage="rows")
+            logger.info(f"Rebuilt weekly summaries in {time.perf_counter() - started:.1f}s")
+    finally:
+        if listener is not None:
+            event.remove(engine, "connect", listener)
+            engine.dispose()
+    return counts
@@ -0,0 +1,97 @@
+# app/services/archive.py
+"""
+Hot/cold split of assignment history.
+
+Weeks older than ARCHIVE_HORIZON_WEEKS are read-only history. The mover
+(``python -m app.cli archive-assignments``) copies their rows into
+chore_assignments_archive and deletes them from chore_assignments in
+small batches, each its own short transaction, so the live table and its
+indexes only hold recent weeks. Reads of an archived week look in both
+tables, so results don't depend on whether the mover has run yet.
+
+A horizon of 0 (the default) disables archiving: all weeks stay writable
+and reads only look at the live table.
+"""
+import os
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional, Sequence
+from sqlalchemy import Table, delete, insert, select, union_all
+from sqlalchemy.engine import Engine
+from ..models import ChoreAssignment, ChoreAssignmentArchive
+
+ARCHIVE_HORIZON_WEEKS = int(os.getenv('ARCHIVE_HORIZON_WEEKS', '0'))
+# Rows moved per transaction
+ARCHIVE_BATCH_SIZE = 1000
+
+live_table = ChoreAssignment.__table__
+archive_table = ChoreAssignmentArchive.__table__
+
+
+def archive_cutoff(horizon_weeks: int = None, today: Optional[date] = None) -> Optional[date]:
+    """First week still kept live; earlier weeks are archived. None when archiving is off."""
+    horizon_weeks = ARCHIVE_HORIZON_WEEKS if horizon_weeks is None else horizon_weeks
+    if horizon_weeks <= 0:
+        return None
+    today = today or date.today()
+    return today - timedelta(days=today.weekday(), weeks=horizon_weeks)
+
+
+def is_archived_week(week_start: date) -> bool:
+    cutoff = archive_cutoff()
+    return cutoff is not None and week_start < cutoff
+
+
+def all_assignments(columns: Sequence[str], where: Callable[[Table], list] = lambda table: []):
+    """
+    UNION ALL of the live and archived assignments as a subquery with the
+    given columns, for reads spanning any weeks. ``where`` returns the
+    filters for one table; they go inside each branch so both can use
+    their indexes instead of the database materializing the whole union.
+    """
+    return union_all(*(
+        select(*(table.c[name] for name in columns)).where(*where(table))
+        for table in (live_table, archive_table)
+    )).subquery("all_assignments")
+
+
+def archive_assignments(
+    engine: Engine,
+    cutoff: date,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause: float = 0.0,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Move every assignment of a week before ``cutoff`` to the archive and
+    return how many rows were moved.
+
+    Batches walk the primary key, so each one is a short range scan, and
+    copy and delete the same ids in one transaction: a crash leaves each
+    row in exactly one table. ``pause`` seconds between batches lets
+    replicas and other writers keep up.
+    """
+    columns = [column.name for column in live_table.columns]
+    moved = 0
+    after = 0
+    while True:
+        with engine.begin() as connection:
+            ids = list(connection.scalars(
+                select(live_table.c.id).where(
+                    live_table.c.id > after,
+                    live_table.c.week_start < cutoff
+                ).order_by(live_table.c.id).limit(batch_size)
+            ))
+            if not ids:
+                break
+            connection.execute(insert(archive_table).from_select(
+                columns, select(*live_table.c).where(live_table.c.id.in_(ids))
+            ))
+            connection.execute(delete(live_table).where(live_table.c.id.in_(ids)))
+        moved += len(ids)
+        after = ids[-1]
+        if progress is not None:
+            progress(moved)
+        if pause:
+            time.sleep(pause)
+    return moved
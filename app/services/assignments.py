@@ -0,0 +1,284 @@
+# app/services/assignments.py
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Chore, ChoreAssignment, ChoreAssignmentArchive
+from ..schemas.chores import ChoreAssignmentCreate
+from .archive import is_archived_week
+from .summaries import apply_summary_delta
+
+# Rows per INSERT statement, keeping bound parameters under SQLite's limit
+INSERT_CHUNK_SIZE = 1000
+
+
+async def owned_chores(db: AsyncSession, user_id: int, chore_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    The user's chores among ``chore_ids``, by id, as dicts matching the
+    Chore response schema. Ids of other users' chores are left out.
+    """
+    return {
+        row.id: row._asdict()
+        for row in await db.execute(select(
+            Chore.id, Chore.name, Chore.description, Chore.frequency_per_week
+        ).where(
+            Chore.id.in_(set(chore_ids)),
+            Chore.user_id == user_id
+        ))
+    }
+
+
+async def create_weekly_assignments(
+    db: AsyncSession,
+    user_id: int,
+    assignment: ChoreAssignmentCreate
+) -> List[dict]:
+    """
+    Make sure the child has every occurrence of each requested chore in
+    the week, and return those occurrences.
+
+    Idempotent: rows are written with a multi-row INSERT that skips
+    occurrences already present (ON CONFLICT DO NOTHING / INSERT IGNORE
+    on the occurrence unique key), so a repeated or overlapping request
+    only adds what is missing and the weekly summary grows by the number
+    of rows actually inserted. All chores are resolved with a single IN
+    query and the occurrences, old and new, are read back with one more,
+    so round trips don't grow with the number of chores or their
+    frequency. Chore ids that don't belong to the user are skipped. The
+    returned dicts match the ChoreAssignment response schema.
+    """
+    chores = await owned_chores(db, user_id, assignment.chore_ids)
+
+    rows = []
+    for chore_id in dict.fromkeys(assignment.chore_ids):
+        chore = chores.get(chore_id)
+        if not chore:
+            continue
+        for occurrence in range(1, chore["frequency_per_week"] + 1):
+            rows.append({
+                "child_id": assignment.child_id,
+                "chore_id": chore_id,
+                "user_id": user_id,
+                "week_start": assignment.week_start,
+                "occurrence_number": occurrence,
+                "is_completed": False,
+                "completion_date": None,
+            })
+
+    if not rows:
+        return []
+
+    inserted = await _insert_missing(db, rows)
+    await apply_summary_delta(
+        db, user_id, assignment.child_id, assignment.week_start, total_delta=inserted
+    )
+    stored = {
+        (row.chore_id, row.occurrence_number): row
+        for row in await db.execute(select(
+            ChoreAssignment.id,
+            ChoreAssignment.chore_id,
+            ChoreAssignment.occurrence_number,
+            ChoreAssignment.is_completed,
+            ChoreAssignment.completion_date
+        ).where(
+            ChoreAssignment.child_id == assignment.child_id,
+            ChoreAssignment.week_start == assignment.week_start,
+            ChoreAssignment.chore_id.in_(chores)
+        ))
+    }
+    await db.commit()
+
+    payloads = []
+    for row in rows:
+        current = stored[(row["chore_id"], row["occurrence_number"])]
+        payloads.append({
+            **row,
+            "id": current.id,
+            "is_completed": bool(current.is_completed),
+            "completion_date": current.completion_date,
+            "chore": chores[row["chore_id"]],
+        })
+    return payloads
+
+
+def _week_rows(table, user_id: int, child_id: int, week_start: date):
+    return select(
+        # Labelled so SQLite can ORDER BY it across a UNION
+        table.c.id.label("id"),
+        table.c.chore_id,
+        table.c.child_id,
+        table.c.week_start,
+        table.c.occurrence_number,
+        table.c.is_completed,
+        table.c.completion_date,
+        Chore.name,
+        Chore.description,
+        Chore.frequency_per_week
+    ).join(Chore, Chore.id == table.c.chore_id).where(
+        table.c.child_id == child_id,
+        table.c.user_id == user_id,
+        table.c.week_start == week_start
+    )
+
+
+async def weekly_assignment_payloads(
+    db: AsyncSession,
+    user_id: int,
+    child_id: int,
+    week_start: date
+) -> List[dict]:
+    """
+    A child's assignments for one week, as plain dicts matching the
+    ChoreAssignment response schema.
+
+    Selects the needed columns of both tables in one join and builds the
+    dicts straight from the row tuples: no ORM instances, identity map or
+    re-validation, so the result can go directly to a JSON encoder. Weeks
+    past the archive horizon are also looked up in the archive.
+    """
+    stmt = _week_rows(ChoreAssignment.__table__, user_id, child_id, week_start)
+    if is_archived_week(week_start):
+        # The mover may not have reached this week yet, so read both tables
+        stmt = union_all(stmt, _week_rows(ChoreAssignmentArchive.__table__, user_id, child_id, week_start))
+    rows = await db.execute(stmt.order_by(stmt.selected_columns.id))
+
+    chores = {}
+    payloads = []
+    for (assignment_id, chore_id, child, week, occurrence, is_completed, completion_date,
+         name, description, frequency) in rows:
+        chore = chores.get(chore_id)
+        if chore is None:
+            # Occurrences of one chore share its payload
+            chore = chores[chore_id] = {
+                "name": name,
+                "description": description,
+                "frequency_per_week": frequency,
+                "id": chore_id,
+            }
+        payloads.append({
+            "chore_id": chore_id,
+            "child_id": child,
+            "week_start": week,
+            "occurrence_number": occurrence,
+            "id": assignment_id,
+            "is_completed": bool(is_completed),
+            "completion_date": completion_date,
+            "chore": chore,
+        })
+    return payloads
+
+
+async def _insert_missing(db: AsyncSession, rows: List[dict]) -> int:
+    """
+    Insert the rows whose occurrence doesn't exist yet, with multi-row
+    INSERTs that ignore unique-key conflicts. Returns how many were inserted.
+    """
+    table = ChoreAssignment.__table__
+    if db.get_bind().dialect.name == "mysql":
+        # INSERT IGNORE rather than a no-op ON DUPLICATE KEY UPDATE: with
+        # CLIENT_FOUND_ROWS, which SQLAlchemy sets, skipped rows would count
+        stmt = insert(table).prefix_with("IGNORE", dialect="mysql")
+    else:
+        stmt = sqlite_insert(table).on_conflict_do_nothing()
+
+    inserted = 0
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        inserted += (await db.execute(stmt.values(rows[start:start + INSERT_CHUNK_SIZE]))).rowcount
+    return inserted
+
+
+async def set_completion(
+    db: AsyncSession,
+    user_id: int,
+    assignment_ids: List[int],
+    completed: bool = True
+) -> List[dict]:
+    """
+    Mark many of the user's assignments completed (or not completed) in
+    one transaction.
+
+    The rows are locked and read with one SELECT, changed with a single
+    ownership-checked UPDATE ... WHERE id IN (...), and the weekly
+    summaries get one upsert per child and week touched. Returns a status
+    per requested id: "updated", "unchanged" or "not_found".
+    """
+    current = {
+        row.id: row
+        for row in await db.execute(select(
+            ChoreAssignment.id,
+            ChoreAssignment.child_id,
+            ChoreAssignment.week_start,
+            ChoreAssignment.is_completed
+        ).where(
+            ChoreAssignment.id.in_(set(assignment_ids)),
+            ChoreAssignment.user_id == user_id
+        ).with_for_update())
+    }
+    changing = [row for row in current.values() if bool(row.is_completed) != completed]
+
+    if changing:
+        await db.execute(update(ChoreAssignment).where(
+            ChoreAssignment.id.in_([row.id for row in changing]),
+            ChoreAssignment.user_id == user_id
+        ).values(
+            is_completed=completed,
+            completion_date=date.today() if completed else None
+        ).execution_options(synchronize_session=False))
+
+        delta = 1 if completed else -1
+        weeks = Counter((row.child_id, row.week_start) for row in changing)
+        for (child_id, week_start), count in weeks.items():
+            await apply_summary_delta(
+                db, user_id, child_id, week_start, completed_delta=delta * count
+            )
+    await db.commit()
+
+    changed = {row.id for row in changing}
+    return [
+        {
+            "id": assignment_id,
+            "status": "updated" if assignment_id in changed
+            else "unchanged" if assignment_id in current
+            else "not_found"
+        }
+        for assignment_id in assignment_ids
+    ]
+
+
+async def complete_assignment(
+    db: AsyncSession,
+    user_id: int,
+    assignment_id: int
+) -> Optional[Tuple[dict, bool]]:
+    """
+    Mark one of the user's assignments completed. Returns the assignment's
+    columns as a dict and whether it changed, or None if the user has no
+    such assignment.
+    """
+    assignment = await db.scalar(select(ChoreAssignment).where(
+        ChoreAssignment.id == assignment_id,
+        ChoreAssignment.user_id == user_id
+    ))
+    if not assignment:
+        return None
+
+    changed = False
+    if not assignment.is_completed:
+        # Guarded so concurrent completions of one occurrence are counted once
+        completed = await db.execute(update(ChoreAssignment).where(
+            ChoreAssignment.id == assignment.id,
+            ChoreAssignment.is_completed == False
+        ).values(is_completed=True, completion_date=date.today()))
+        if completed.rowcount:
+            changed = True
+            await apply_summary_delta(
+                db, user_id, assignment.child_id, assignment.week_start, completed_delta=1
+            )
+    await db.commit()
+    await db.refresh(assignment)
+    return {
+        column.name: getattr(assignment, column.name)
+        for column in ChoreAssignment.__table__.columns
+    }, changed
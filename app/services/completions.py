@@ -0,0 +1,463 @@
+# app/services/completions.py
+"""
+Bitmap storage of weekly assignments (ASSIGNMENT_STORAGE=bitmap).
+
+Instead of one chore_assignments row per occurrence, a chore assigned to
+a child for a week is a single weekly_chore_completions row: ``frequency``
+occurrences, bit n-1 of ``completed_mask`` set when occurrence n is done,
+and each occurrence's completion date packed into ``completion_dates`` as
+a little-endian int16 day offset from week_start. A chore done daily takes
+one row a week instead of seven.
+
+The functions here mirror app/services/assignments.py and return the same
+payloads. Each occurrence is given the id
+
+    row id * OCCURRENCE_ID_STRIDE + occurrence_number
+
+which the completion endpoints decode back into a row and a bit, so
+clients can't tell the storages apart. Completions rewrite a row's mask
+and dates together, guarded by the mask they read (compare-and-swap), so
+concurrent completions of occurrences of the same week never lose each
+other's updates.
+"""
+import struct
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Chore, ChoreAssignment, ChoreAssignmentArchive, WeeklyChoreCompletion
+from ..schemas.chores import ChoreAssignmentCreate
+from .archive import all_assignments
+from .assignments import INSERT_CHUNK_SIZE, owned_chores
+from .summaries import apply_summary_delta
+
+# Occurrence ids are row id * OCCURRENCE_ID_STRIDE + occurrence_number
+OCCURRENCE_ID_STRIDE = 64
+# completed_mask is a signed 64-bit integer
+MAX_FREQUENCY = 63
+# Times a completion is retried when another request changed the row first
+COMPLETION_ATTEMPTS = 5
+# Children per transaction when converting between storages
+CONVERT_BATCH_SIZE = 100
+
+table = WeeklyChoreCompletion.__table__
+
+
+class ConcurrentUpdateError(Exception):
+    """A completion kept losing the compare-and-swap to other writers."""
+
+
+def occurrence_id(row_id: int, occurrence_number: int) -> int:
+    return row_id * OCCURRENCE_ID_STRIDE + occurrence_number
+
+
+def split_occurrence_id(assignment_id: int) -> Tuple[int, int]:
+    """(row id, occurrence_number) of an occurrence id; occurrence 0 never exists."""
+    return divmod(assignment_id, OCCURRENCE_ID_STRIDE)
+
+
+def pack_dates(week_start: date, dates: List[Optional[date]]) -> bytes:
+    return struct.pack(
+        f"<{len(dates)}h", *((day - week_start).days if day else 0 for day in dates)
+    )
+
+
+def unpack_dates(week_start: date, packed: bytes, mask: int, frequency: int) -> List[Optional[date]]:
+    """
+    Completion date of each of the ``frequency`` occurrences, None when not
+    completed. ``packed`` may be shorter than ``frequency`` entries after
+    the frequency grew; the extra occurrences can't have been completed.
+    """
+    offsets = struct.unpack(f"<{len(packed) // 2}h", packed)
+    return [
+        week_start + timedelta(days=offsets[bit]) if mask >> bit & 1 else None
+        for bit in range(frequency)
+    ]
+
+
+def occurrences(row) -> Iterator[Tuple[int, int, bool, Optional[date]]]:
+    """(id, occurrence_number, is_completed, completion_date) of each occurrence a row holds."""
+    dates = unpack_dates(row.week_start, row.completion_dates, row.completed_mask, row.frequency)
+    for number, completion_date in enumerate(dates, start=1):
+        yield occurrence_id(row.id, number), number, completion_date is not None, completion_date
+
+
+def _payloads(row, chore: dict) -> List[dict]:
+    return [
+        {
+            "chore_id": row.chore_id,
+            "child_id": row.child_id,
+            "week_start": row.week_start,
+            "occurrence_number": number,
+            "id": assignment_id,
+            "is_completed": is_completed,
+            "completion_date": completion_date,
+            "chore": chore,
+        }
+        for assignment_id, number, is_completed, completion_date in occurrences(row)
+    ]
+
+
+ROW_COLUMNS = (
+    table.c.id,
+    table.c.child_id,
+    table.c.chore_id,
+    table.c.week_start,
+    table.c.frequency,
+    table.c.completed_mask,
+    table.c.completion_dates,
+)
+
+
+def _upsert(dialect_name: str, rows: List[dict]):
+    """Multi-row insert that, for weeks already present, only raises the frequency."""
+    if dialect_name == "mysql":
+        stmt = mysql_insert(table).values(rows)
+        return stmt.on_duplicate_key_update(
+            frequency=func.greatest(table.c.frequency, stmt.inserted.frequency)
+        )
+    stmt = sqlite_insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["child_id", "chore_id", "week_start"],
+        set_={"frequency": func.max(table.c.frequency, stmt.excluded.frequency)}
+    )
+
+
+async def create_weekly_assignments(
+    db: AsyncSession,
+    user_id: int,
+    assignment: ChoreAssignmentCreate
+) -> List[dict]:
+    """
+    Bitmap counterpart of assignments.create_weekly_assignments: one
+    upserted row per chore, only adding occurrences the week doesn't have
+    yet. Raises ValueError for chores done more than MAX_FREQUENCY times
+    a week, which don't fit in the mask.
+    """
+    chores = await owned_chores(db, user_id, assignment.chore_ids)
+    chore_ids = [chore_id for chore_id in dict.fromkeys(assignment.chore_ids) if chore_id in chores]
+    if not chore_ids:
+        return []
+    too_frequent = [chore_id for chore_id in chore_ids if chores[chore_id]["frequency_per_week"] > MAX_FREQUENCY]
+    if too_frequent:
+        raise ValueError(
+            f"Chores {too_frequent} exceed {MAX_FREQUENCY} occurrences a week, the most bitmap storage holds"
+        )
+
+    week = (
+        table.c.child_id == assignment.child_id,
+        table.c.week_start == assignment.week_start,
+        table.c.chore_id.in_(chore_ids),
+    )
+    assigned = dict((await db.execute(
+        select(table.c.chore_id, table.c.frequency).where(*week).with_for_update()
+    )).all())
+    added = sum(
+        max(chores[chore_id]["frequency_per_week"] - assigned.get(chore_id, 0), 0)
+        for chore_id in chore_ids
+    )
+
+    rows = [
+        {
+            "user_id": user_id,
+            "child_id": assignment.child_id,
+            "chore_id": chore_id,
+            "week_start": assignment.week_start,
+            "frequency": chores[chore_id]["frequency_per_week"],
+            "completed_mask": 0,
+            "completed_count": 0,
+            "completion_dates": b"",
+        }
+        for chore_id in chore_ids
+    ]
+    dialect_name = db.get_bind().dialect.name
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await db.execute(_upsert(dialect_name, rows[start:start + INSERT_CHUNK_SIZE]))
+    await apply_summary_delta(
+        db, user_id, assignment.child_id, assignment.week_start, total_delta=added
+    )
+    stored = {row.chore_id: row for row in await db.execute(select(*ROW_COLUMNS).where(*week))}
+    await db.commit()
+
+    return [
+        payload
+        for chore_id in chore_ids
+        for payload in _payloads(stored[chore_id], chores[chore_id])
+    ]
+
+
+async def weekly_assignment_payloads(
+    db: AsyncSession,
+    user_id: int,
+    child_id: int,
+    week_start: date
+) -> List[dict]:
+    """A child's assignments for one week, expanded from one row per chore."""
+    rows = await db.execute(select(
+        *ROW_COLUMNS,
+        Chore.name,
+        Chore.description,
+        Chore.frequency_per_week
+    ).join(Chore, Chore.id == table.c.chore_id).where(
+        table.c.child_id == child_id,
+        table.c.user_id == user_id,
+        table.c.week_start == week_start
+    ).order_by(table.c.id))
+
+    payloads = []
+    for row in rows:
+        payloads.extend(_payloads(row, {
+            "name": row.name,
+            "description": row.description,
+            "frequency_per_week": row.frequency_per_week,
+            "id": row.chore_id,
+        }))
+    return payloads
+
+
+async def _apply_completion(
+    db: AsyncSession,
+    user_id: int,
+    wanted: Dict[int, set],
+    completed: bool
+) -> Tuple[set, set]:
+    """
+    One attempt at setting the wanted occurrences of each row. Returns the
+    ids of the occurrences that exist and of those that changed, or raises
+    ConcurrentUpdateError if a row changed since it was read.
+    """
+    rows = await db.execute(select(
+        table.c.id,
+        table.c.child_id,
+        table.c.week_start,
+        table.c.frequency,
+        table.c.completed_mask,
+        table.c.completion_dates
+    ).where(
+        table.c.id.in_(wanted),
+        table.c.user_id == user_id
+    ))
+
+    found, changed = set(), set()
+    weeks = Counter()
+    today = date.today()
+    for row in rows:
+        mask = row.completed_mask
+        dates = unpack_dates(row.week_start, row.completion_dates, mask, row.frequency)
+        for number in wanted[row.id]:
+            if number > row.frequency:
+                continue
+            found.add(occurrence_id(row.id, number))
+            bit = 1 << (number - 1)
+            if bool(mask & bit) == completed:
+                continue
+            mask ^= bit
+            dates[number - 1] = today if completed else None
+            changed.add(occurrence_id(row.id, number))
+            weeks[(row.child_id, row.week_start)] += 1 if completed else -1
+        if mask == row.completed_mask:
+            continue
+        swapped = await db.execute(update(WeeklyChoreCompletion).where(
+            WeeklyChoreCompletion.id == row.id,
+            WeeklyChoreCompletion.completed_mask == row.completed_mask
+        ).values(
+            completed_mask=mask,
+            completed_count=mask.bit_count(),
+            completion_dates=pack_dates(row.week_start, dates)
+        ).execution_options(synchronize_session=False))
+        if not swapped.rowcount:
+            raise ConcurrentUpdateError(f"weekly_chore_completions row {row.id} changed concurrently")
+
+    for (child_id, week_start), delta in weeks.items():
+        await apply_summary_delta(db, user_id, child_id, week_start, completed_delta=delta)
+    return found, changed
+
+
+async def set_completion(
+    db: AsyncSession,
+    user_id: int,
+    assignment_ids: List[int],
+    completed: bool = True
+) -> List[dict]:
+    """
+    Bitmap counterpart of assignments.set_completion. Occurrences are
+    grouped by row, so one UPDATE covers all of a chore's week; if another
+    request changed one of the rows first, the whole batch is rolled back
+    and retried up to COMPLETION_ATTEMPTS times.
+    """
+    wanted = defaultdict(set)
+    for assignment_id in assignment_ids:
+        row_id, number = split_occurrence_id(assignment_id)
+        if number:
+            wanted[row_id].add(number)
+
+    for attempt in range(COMPLETION_ATTEMPTS):
+        try:
+            found, changed = await _apply_completion(db, user_id, wanted, completed)
+        except ConcurrentUpdateError:
+            await db.rollback()
+            if attempt == COMPLETION_ATTEMPTS - 1:
+                raise
+            continue
+        await db.commit()
+        break
+
+    return [
+        {
+            "id": assignment_id,
+            "status": "updated" if assignment_id in changed
+            else "unchanged" if assignment_id in found
+            else "not_found"
+        }
+        for assignment_id in assignment_ids
+    ]
+
+
+async def complete_assignment(
+    db: AsyncSession,
+    user_id: int,
+    assignment_id: int
+) -> Optional[Tuple[dict, bool]]:
+    """Bitmap counterpart of assignments.complete_assignment."""
+    [result] = await set_completion(db, user_id, [assignment_id], True)
+    if result["status"] == "not_found":
+        return None
+
+    row_id, number = split_occurrence_id(assignment_id)
+    row = (await db.execute(
+        select(*ROW_COLUMNS, table.c.user_id).where(table.c.id == row_id)
+    )).one()
+    completion_date = unpack_dates(row.week_start, row.completion_dates, row.completed_mask, number)[-1]
+    return {
+        "id": assignment_id,
+        "child_id": row.child_id,
+        "chore_id": row.chore_id,
+        "is_completed": completion_date is not None,
+        "completion_date": completion_date,
+        "user_id": row.user_id,
+        "week_start": row.week_start,
+        "occurrence_number": number,
+    }, result["status"] == "updated"
+
+
+def _child_batches(engine: Engine, source, batch_size: int) -> Iterator[List[int]]:
+    """Walk the child ids in ``source`` in batches."""
+    after = 0
+    while True:
+        with engine.connect() as connection:
+            child_ids = list(connection.scalars(
+                select(source.c.child_id).distinct().where(
+                    source.c.child_id > after
+                ).order_by(source.c.child_id).limit(batch_size)
+            ))
+        if not child_ids:
+            return
+        yield child_ids
+        after = child_ids[-1]
+
+
+def _packed_row(user_id: int, child_id: int, chore_id: int, week_start: date, done: Dict[int, Optional[date]]) -> dict:
+    """
+    A weekly_chore_completions row from a week's occurrences: ``done``
+    maps each occurrence_number to its completion date, None if not completed.
+    """
+    frequency = max(done)
+    if frequency > MAX_FREQUENCY:
+        raise ValueError(
+            f"Chore {chore_id} has {frequency} occurrences in the week of {week_start} for child {child_id}, "
+            f"more than the {MAX_FREQUENCY} bitmap storage holds"
+        )
+    dates = [done.get(number) for number in range(1, frequency + 1)]
+    mask = sum(1 << bit for bit, day in enumerate(dates) if day is not None)
+    return {
+        "user_id": user_id,
+        "child_id": child_id,
+        "chore_id": chore_id,
+        "week_start": week_start,
+        "frequency": frequency,
+        "completed_mask": mask,
+        "completed_count": mask.bit_count(),
+        "completion_dates": pack_dates(week_start, dates),
+    }
+
+
+def convert_to_bitmap(
+    engine: Engine,
+    batch_size: int = CONVERT_BATCH_SIZE,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Replace weekly_chore_completions with the contents of chore_assignments
+    and its archive, a batch of children per transaction, and return the
+    number of rows written. Run it while the app still uses row storage,
+    then switch ASSIGNMENT_STORAGE; occurrences get new ids.
+    """
+    columns = [
+        "user_id", "child_id", "chore_id", "week_start",
+        "occurrence_number", "is_completed", "completion_date",
+    ]
+    with engine.begin() as connection:
+        connection.execute(delete(table))
+
+    written = 0
+    for child_ids in _child_batches(engine, all_assignments(["child_id"]), batch_size):
+        weeks = defaultdict(dict)
+        with engine.begin() as connection:
+            assignments = all_assignments(columns, lambda source: [source.c.child_id.in_(child_ids)])
+            for row in connection.execute(select(assignments)):
+                # Completed occurrences missing a date count as done on week_start
+                weeks[(row.user_id, row.child_id, row.chore_id, row.week_start)][row.occurrence_number] = (
+                    (row.completion_date or row.week_start) if row.is_completed else None
+                )
+            rows = [_packed_row(*key, done) for key, done in weeks.items()]
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                connection.execute(insert(table), rows[start:start + INSERT_CHUNK_SIZE])
+        written += len(rows)
+        if progress is not None:
+            progress(written)
+    return written
+
+
+def convert_to_rows(
+    engine: Engine,
+    batch_size: int = CONVERT_BATCH_SIZE,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Replace chore_assignments and its archive with one row per occurrence
+    of weekly_chore_completions, a batch of children per transaction, and
+    return the number of rows written. Everything lands in the live table;
+    run archive-assignments again afterwards if archiving is on.
+    """
+    with engine.begin() as connection:
+        connection.execute(delete(ChoreAssignmentArchive))
+        connection.execute(delete(ChoreAssignment))
+
+    written = 0
+    for child_ids in _child_batches(engine, table, batch_size):
+        with engine.begin() as connection:
+            rows = [
+                {
+                    "child_id": row.child_id,
+                    "chore_id": row.chore_id,
+                    "user_id": row.user_id,
+                    "week_start": row.week_start,
+                    "occurrence_number": number,
+                    "is_completed": is_completed,
+                    "completion_date": completion_date,
+                }
+                for row in connection.execute(
+                    select(*ROW_COLUMNS, table.c.user_id).where(table.c.child_id.in_(child_ids)).order_by(table.c.id)
+                )
+                for _, number, is_completed, completion_date in occurrences(row)
+            ]
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                connection.execute(insert(ChoreAssignment), rows[start:start + INSERT_CHUNK_SIZE])
+        written += len(rows)
+        if progress is not None:
+            progress(written)
+    return written
@@ -0,0 +1,112 @@
+# app/services/export.py
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Chore, WeeklyChoreCompletion
+from .archive import all_assignments
+from .completions import ROW_COLUMNS, occurrences
+from .storage import uses_bitmap_storage
+
+# Rows fetched from the server-side cursor and written per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [
+    "id", "child_id", "chore_id", "chore_name", "week_start",
+    "occurrence_number", "is_completed", "completion_date",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def _csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_assignment_history(
+    db: AsyncSession,
+    user_id: int,
+    child_id: Optional[int] = None,
+    format: str = "ndjson"
+) -> AsyncIterator[bytes]:
+    """
+    Yield the user's assignment history (optionally for one child) as
+    NDJSON or CSV chunks, oldest week first.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    each batch is encoded into one chunk, so memory stays constant and the
+    first bytes go out before the query finishes. With bitmap storage each
+    fetched row is expanded into its occurrences, so the output has the
+    same shape either way. Closes `db` when done.
+    """
+    def where(table):
+        criteria = [table.c.user_id == user_id]
+        if child_id is not None:
+            criteria.append(table.c.child_id == child_id)
+        return criteria
+
+    if uses_bitmap_storage():
+        stmt, expand = _bitmap_history(where)
+    else:
+        stmt, expand = _row_history(where), list
+
+    encode = _csv if format == "csv" else _ndjson
+    try:
+        if format == "csv":
+            yield _csv([EXPORT_FIELDS]).encode()
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode(expand(rows)).encode()
+    finally:
+        await db.close()
+
+
+def _row_history(where):
+    # History spans archived and live weeks
+    assignments = all_assignments([
+        "id", "child_id", "chore_id", "week_start",
+        "occurrence_number", "is_completed", "completion_date",
+    ], where)
+    return select(
+        assignments.c.id,
+        assignments.c.child_id,
+        assignments.c.chore_id,
+        Chore.name.label("chore_name"),
+        assignments.c.week_start,
+        assignments.c.occurrence_number,
+        assignments.c.is_completed,
+        assignments.c.completion_date,
+    ).join(Chore, Chore.id == assignments.c.chore_id).order_by(
+        assignments.c.week_start, assignments.c.id
+    )
+
+
+def _bitmap_history(where):
+    """Rows of weekly_chore_completions and a function expanding them into occurrences."""
+    table = WeeklyChoreCompletion.__table__
+    stmt = select(*ROW_COLUMNS, Chore.name.label("chore_name")).join(
+        Chore, Chore.id == table.c.chore_id
+    ).where(*where(table)).order_by(table.c.week_start, table.c.id)
+
+    def expand(rows):
+        return [
+            (assignment_id, row.child_id, row.chore_id, row.chore_name, row.week_start,
+             number, is_completed, completion_date)
+            for row in rows
+            for assignment_id, number, is_completed, completion_date in occurrences(row)
+        ]
+    return stmt, expand
@@ -0,0 +1,77 @@
+# app/services/idempotency.py
+"""
+Stored responses for writes retried with the same Idempotency-Key header.
+
+The first request with a key runs normally and its response is saved
+under (user, key); a retry with the key gets the saved response back
+with one indexed SELECT instead of redoing the write. Reusing a key for a
+different request is rejected. Keys expire after IDEMPOTENCY_KEY_TTL_HOURS;
+``python -m app.cli purge-idempotency-keys`` deletes expired rows.
+"""
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import IdempotencyKey
+
+IDEMPOTENCY_KEY_TTL_HOURS = float(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+
+
+def _cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def request_fingerprint(route: str, body: bytes) -> str:
+    return hashlib.sha256(route.encode() + b"\n" + body).hexdigest()
+
+
+async def find_response(db: AsyncSession, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """The unexpired stored response for a key, if any."""
+    return await db.scalar(select(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at >= _cutoff()
+    ))
+
+
+async def store_response(
+    db: AsyncSession,
+    user_id: int,
+    key: str,
+    request_hash: str,
+    status_code: int,
+    body: bytes
+) -> None:
+    """
+    Save a response under its key, replacing an expired entry. If a
+    concurrent retry stored the key first, that entry is kept; the write
+    itself must be idempotent, so both responses describe the same state.
+    """
+    await db.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.created_at < _cutoff()
+    ))
+    db.add(IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=body.decode(),
+        created_at=datetime.utcnow()
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+
+
+def purge_expired(connection: Connection) -> int:
+    """Delete expired keys and return how many were removed."""
+    return connection.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.created_at < _cutoff())
+    ).rowcount
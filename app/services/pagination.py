@@ -0,0 +1,37 @@
+# app/services/pagination.py
+from typing import Optional
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    id_column,
+    limit: int,
+    after: Optional[int] = None
+) -> dict:
+    """
+    Fetch one page of `stmt` ordered by `id_column`, starting after the
+    `after` cursor.
+
+    `stmt` should select plain columns, one of them labelled "id", rather
+    than ORM entities: rows come back as dicts, with no instances built or
+    tracked in the session's identity map, ready to validate into the
+    response model.
+
+    Uses keyset pagination rather than OFFSET: the cursor is the last id
+    returned, so each page is a range seek on the primary key (or on an
+    index ending in it) and costs the same however deep the client pages.
+    One extra row is fetched to tell whether another page follows. The
+    returned dict matches the Page response schema.
+    """
+    if after is not None:
+        stmt = stmt.where(id_column > after)
+    rows = (await db.execute(stmt.order_by(id_column).limit(limit + 1))).all()
+    items = [row._asdict() for row in rows[:limit]]
+    next_cursor = items[-1]["id"] if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,215 @@
+# app/services/scheduler.py
+"""
+Materialize a week of assignments for every household from its chore
+schedules.
+
+Households are processed in batches of user ids, each batch with one
+INSERT ... SELECT that expands every scheduled (child, chore) into its
+``frequency_per_week`` occurrences, followed by a rebuild of that batch's
+weekly summaries, all in one short transaction. Conflicts on the
+occurrence unique key are ignored, so a rerun, an overlapping process or
+a week already assigned by hand only adds what is missing.
+
+Work can be split across processes with ``shards``/``shard``: each
+process takes the households whose user_id % shards == shard.
+
+With ASSIGNMENT_STORAGE=bitmap each scheduled chore becomes one
+weekly_chore_completions row instead; chores done more often than
+completions.MAX_FREQUENCY times a week are skipped, as the API rejects them.
+"""
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional
+from loguru import logger
+from sqlalchemy import LargeBinary, and_, exists, false, func, insert, literal, null, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from ..models import Chore, ChoreAssignment, ChoreSchedule, WeeklyChoreCompletion
+from .completions import MAX_FREQUENCY
+from .storage import uses_bitmap_storage
+from .summaries import rebuild_summaries
+
+# Households per transaction
+SCHEDULER_BATCH_SIZE = 500
+
+ASSIGNMENT_COLUMNS = [
+    "child_id", "chore_id", "user_id", "week_start",
+    "occurrence_number", "is_completed", "completion_date",
+]
+
+
+@dataclass
+class SchedulerRun:
+    week_start: date
+    shard: int
+    shards: int
+    dry_run: bool
+    households: int = 0
+    batches: int = 0
+    # Occurrences inserted, or that would be inserted on a dry run
+    assignments: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "week_start": self.week_start.isoformat(),
+            "shard": f"{self.shard}/{self.shards}",
+            "dry_run": self.dry_run,
+            "households": self.households,
+            "batches": self.batches,
+            "assignments": self.assignments,
+            "seconds": round(self.seconds, 2),
+            "rows_per_sec": round(self.assignments / self.seconds) if self.seconds else 0,
+        }
+
+
+def _occurrences(connection: Connection, user_ids: List[int], week_start: date):
+    """SELECT of every scheduled occurrence for the given households and week."""
+    max_frequency = connection.scalar(
+        select(func.max(Chore.frequency_per_week)).join(
+            ChoreSchedule, ChoreSchedule.chore_id == Chore.id
+        ).where(ChoreSchedule.user_id.in_(user_ids))
+    )
+    if not max_frequency:
+        return None
+    # 1..max_frequency as rows, joined against each chore's frequency. A
+    # derived table rather than a CTE: MySQL 5.7 has no WITH, and sqlite3
+    # reports no rowcount for statements starting with one.
+    numbers = union_all(*(
+        select(literal(n).label("n")) for n in range(1, max_frequency + 1)
+    )).subquery("occurrence_numbers")
+
+    return select(
+        ChoreSchedule.child_id,
+        ChoreSchedule.chore_id,
+        ChoreSchedule.user_id,
+        literal(week_start, ChoreAssignment.week_start.type),
+        numbers.c.n,
+        false(),
+        null(),
+    ).join(Chore, and_(
+        Chore.id == ChoreSchedule.chore_id,
+        Chore.user_id == ChoreSchedule.user_id
+    )).join(
+        numbers, numbers.c.n <= Chore.frequency_per_week
+    ).where(ChoreSchedule.user_id.in_(user_ids))
+
+
+def _insert_ignore(connection: Connection, table, columns: List[str], source):
+    if connection.dialect.name == "mysql":
+        # Not a no-op ON DUPLICATE KEY UPDATE: SQLAlchemy connects with
+        # CLIENT_FOUND_ROWS, so existing rows would count as inserted
+        return insert(table).from_select(columns, source).prefix_with("IGNORE", dialect="mysql")
+    if connection.dialect.name == "sqlite":
+        return sqlite_insert(table).from_select(columns, source).on_conflict_do_nothing()
+    return insert(table).from_select(columns, source)
+
+
+def _materialize_bitmap(connection: Connection, user_ids: List[int], week_start: date, dry_run: bool) -> int:
+    """One weekly_chore_completions row per scheduled chore the week doesn't have yet."""
+    table = WeeklyChoreCompletion.__table__
+    missing = select(
+        ChoreSchedule.user_id,
+        ChoreSchedule.child_id,
+        ChoreSchedule.chore_id,
+        literal(week_start, table.c.week_start.type),
+        Chore.frequency_per_week,
+        literal(0),
+        literal(0),
+        literal(b"", LargeBinary),
+    ).join(Chore, and_(
+        Chore.id == ChoreSchedule.chore_id,
+        Chore.user_id == ChoreSchedule.user_id
+    )).where(
+        ChoreSchedule.user_id.in_(user_ids),
+        Chore.frequency_per_week <= MAX_FREQUENCY,
+        ~exists(select(table.c.id).where(
+            table.c.child_id == ChoreSchedule.child_id,
+            table.c.chore_id == ChoreSchedule.chore_id,
+            table.c.week_start == week_start
+        ))
+    )
+    # Occurrences, not rows, so runs report the same numbers in either storage
+    occurrences = connection.scalar(
+        select(func.coalesce(func.sum(missing.subquery().c.frequency_per_week), 0))
+    )
+    if dry_run or not occurrences:
+        return occurrences
+
+    connection.execute(_insert_ignore(connection, table, [
+        "user_id", "child_id", "chore_id", "week_start",
+        "frequency", "completed_mask", "completed_count", "completion_dates",
+    ], missing))
+    rebuild_summaries(connection, user_ids=user_ids, week_start=week_start)
+    return occurrences
+
+
+def _materialize(connection: Connection, user_ids: List[int], week_start: date, dry_run: bool) -> int:
+    if uses_bitmap_storage():
+        return _materialize_bitmap(connection, user_ids, week_start, dry_run)
+
+    source = _occurrences(connection, user_ids, week_start)
+    if source is None:
+        return 0
+
+    if dry_run:
+        existing = select(ChoreAssignment.id).where(
+            ChoreAssignment.child_id == ChoreSchedule.child_id,
+            ChoreAssignment.chore_id == ChoreSchedule.chore_id,
+            ChoreAssignment.week_start == week_start,
+            ChoreAssignment.occurrence_number == source.selected_columns[4]
+        )
+        missing = source.where(~exists(existing)).subquery()
+        return connection.scalar(select(func.count()).select_from(missing))
+
+    inserted = connection.execute(
+        _insert_ignore(connection, ChoreAssignment.__table__, ASSIGNMENT_COLUMNS, source)
+    ).rowcount
+    if inserted:
+        rebuild_summaries(connection, user_ids=user_ids, week_start=week_start)
+    return inserted
+
+
+def generate_week(
+    engine: Engine,
+    week_start: date,
+    shard: int = 0,
+    shards: int = 1,
+    batch_size: int = SCHEDULER_BATCH_SIZE,
+    dry_run: bool = False,
+    progress: Optional[Callable[[SchedulerRun], None]] = None
+) -> SchedulerRun:
+    """
+    Create the missing occurrences of ``week_start`` for this shard's
+    households. With ``dry_run`` nothing is written and the result counts
+    the occurrences that would be created. ``progress`` is called after
+    every batch.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in 0..{shards - 1}")
+
+    run = SchedulerRun(week_start=week_start, shard=shard, shards=shards, dry_run=dry_run)
+    started = time.perf_counter()
+    after = 0
+    while True:
+        with engine.begin() as connection:
+            user_ids = list(connection.scalars(
+                select(ChoreSchedule.user_id).distinct().where(
+                    ChoreSchedule.user_id > after,
+                    ChoreSchedule.user_id % shards == shard
+                ).order_by(ChoreSchedule.user_id).limit(batch_size)
+            ))
+            if not user_ids:
+                break
+            run.assignments += _materialize(connection, user_ids, week_start, dry_run)
+        after = user_ids[-1]
+        run.households += len(user_ids)
+        run.batches += 1
+        run.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(run)
+
+    run.seconds = time.perf_counter() - started
+    logger.info(f"Scheduler run finished: {run.as_dict()}")
+    return run
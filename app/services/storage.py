@@ -0,0 +1,26 @@
+# app/services/storage.py
+"""
+Where weekly assignments are stored, chosen with ASSIGNMENT_STORAGE:
+
+``rows`` (default)
+    one chore_assignments row per occurrence; app/services/assignments.py
+``bitmap``
+    one weekly_chore_completions row per child, chore and week;
+    app/services/completions.py
+
+Both serve the same API responses. ``python -m app.cli convert-assignments``
+copies the data from one to the other before switching.
+"""
+import os
+from typing import Optional
+
+STORAGE_MODES = ("rows", "bitmap")
+
+ASSIGNMENT_STORAGE = os.getenv('ASSIGNMENT_STORAGE', 'rows')
+if ASSIGNMENT_STORAGE not in STORAGE_MODES:
+    raise ValueError(f"ASSIGNMENT_STORAGE must be one of {', '.join(STORAGE_MODES)}")
+
+
+def uses_bitmap_storage(storage: Optional[str] = None) -> bool:
+    """Whether ``storage``, or the configured storage when None, is the bitmap one."""
+    return (storage or ASSIGNMENT_STORAGE) == "bitmap"
@@ -0,0 +1,126 @@
+# app/services/summaries.py
+from datetime import date
+from typing import Optional, Sequence
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Child, WeeklyChildSummary, WeeklyChoreCompletion
+from .archive import all_assignments
+from .storage import uses_bitmap_storage
+
+
+def _earned(allowance, completed, total):
+    return case((total > 0, allowance * completed / total), else_=0.0)
+
+
+async def apply_summary_delta(
+    db: AsyncSession,
+    user_id: int,
+    child_id: int,
+    week_start: date,
+    total_delta: int = 0,
+    completed_delta: int = 0
+) -> None:
+    """
+    Add to a child's weekly totals in the caller's transaction.
+
+    A single dialect-specific upsert creates the row on first use, so
+    writers never read the summary before changing it. Earned allowance is
+    recomputed from the child's current weekly_allowance.
+    """
+    if not total_delta and not completed_delta:
+        return
+
+    table = WeeklyChildSummary.__table__
+    allowance = select(Child.weekly_allowance).where(Child.id == child_id).scalar_subquery()
+    new_total = table.c.total_count + total_delta
+    new_completed = table.c.completed_count + completed_delta
+
+    mysql = db.get_bind().dialect.name == "mysql"
+    if mysql:
+        stmt = mysql_insert(table)
+    else:
+        stmt = sqlite_insert(table)
+    stmt = stmt.values(
+        user_id=user_id,
+        child_id=child_id,
+        week_start=week_start,
+        total_count=total_delta,
+        completed_count=completed_delta,
+        earned_allowance=_earned(allowance, literal(completed_delta), literal(total_delta))
+    )
+    # earned_allowance goes first: MySQL applies ON DUPLICATE KEY assignments
+    # left to right, so later ones would otherwise see the updated counts.
+    updates = [
+        ("earned_allowance", _earned(allowance, new_completed, new_total)),
+        ("total_count", new_total),
+        ("completed_count", new_completed),
+    ]
+    if mysql:
+        stmt = stmt.on_duplicate_key_update(updates)
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["child_id", "week_start"], set_=dict(updates)
+        )
+    await db.execute(stmt)
+
+
+def rebuild_summaries(
+    connection: Connection,
+    user_id: Optional[int] = None,
+    user_ids: Optional[Sequence[int]] = None,
+    week_start: Optional[date] = None,
+    storage: Optional[str] = None
+) -> int:
+    """
+    Recompute weekly_child_summary from the assignments with one INSERT ...
+    SELECT, optionally only for a single user, a set of users and/or one
+    week. Assignments are read from ``storage`` (default: the configured
+    ASSIGNMENT_STORAGE): chore_assignments and its archive, or
+    weekly_chore_completions. Returns the number of summary rows written.
+    """
+    def where(table):
+        criteria = []
+        if user_id is not None:
+            criteria.append(table.c.user_id == user_id)
+        if user_ids is not None:
+            criteria.append(table.c.user_id.in_(user_ids))
+        if week_start is not None:
+            criteria.append(table.c.week_start == week_start)
+        return criteria
+
+    if uses_bitmap_storage(storage):
+        table = WeeklyChoreCompletion.__table__
+        assignments = select(
+            table.c.user_id, table.c.child_id, table.c.week_start,
+            table.c.frequency, table.c.completed_count
+        ).where(*where(table)).subquery("assignments")
+        completed = func.sum(assignments.c.completed_count)
+        total = func.sum(assignments.c.frequency)
+    else:
+        assignments = all_assignments(["user_id", "child_id", "week_start", "is_completed"], where)
+        completed = func.sum(case((assignments.c.is_completed, 1), else_=0))
+        total = func.count()
+    source = select(
+        assignments.c.user_id,
+        assignments.c.child_id,
+        assignments.c.week_start,
+        total,
+        completed,
+        _earned(Child.weekly_allowance, completed, total),
+    ).join(Child, Child.id == assignments.c.child_id).group_by(
+        assignments.c.user_id,
+        assignments.c.child_id,
+        assignments.c.week_start,
+        Child.weekly_allowance,
+    )
+    clear = delete(WeeklyChildSummary).where(*where(WeeklyChildSummary.__table__))
+
+    connection.execute(clear)
+    result = connection.execute(insert(WeeklyChildSummary).from_select(
+        ["user_id", "child_id", "week_start", "total_count", "completed_count", "earned_allowance"],
+        source
+    ))
+    return result.rowcount
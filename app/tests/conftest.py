@@ -1,57 +1,82 @@
 # app/tests/conftest.py
+import os
 import pytest
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from datetime import date, timedelta
 from jose import jwt
-from app.dependencies import create_access_token, get_password_hash
+# Cheap bcrypt hashes keep the test suite fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+from app.dependencies import create_access_token, get_password_hash, response_cache, token_cache, user_cache
 
-from app.database import Base, get_db
+from app.database import Base, QueryCounter, get_db, get_stream_db
 from app.main import app
 from app.models.chores import Child, Chore, ChoreAssignment
 from app.models.user import User
 
 # Use SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# NullPool so every test opens its connection on its own event loop
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture(autouse=True)
+async def clear_caches():
+    """Users are rolled back after each test, so cached lookups must go too"""
+    user_cache.clear()
+    token_cache.clear()
+    await response_cache.clear()
+    yield
+    user_cache.clear()
+    token_cache.clear()
+    await response_cache.clear()
 
 @pytest.fixture(scope="session")
 def db_engine():
-    Base.metadata.create_all(bind=engine)
+    schema_engine = create_engine("sqlite:///./test.db")
+    Base.metadata.create_all(bind=schema_engine)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=schema_engine)
+    schema_engine.dispose()
 
 @pytest.fixture(scope="function")
-def db_session(db_engine):
-    connection = db_engine.connect()
-    transaction = connection.begin()
+async def db_session(db_engine):
+    connection = await db_engine.connect()
+    transaction = await connection.begin()
     session = TestingSessionLocal(bind=connection)
     
     yield session
     
-    session.close()
-    transaction.rollback()
-    connection.close()
+    await session.close()
+    await transaction.rollback()
+    await connection.close()
+
+@pytest.fixture
+def count_queries(db_engine):
+    """Context manager factory counting statements sent to the test database"""
+    return lambda: QueryCounter(db_engine)
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    def override_get_db():
+async def client(db_session):
+    async def override_get_db():
         try:
             yield db_session
         finally:
             pass
     
     app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
+    app.dependency_overrides[get_stream_db] = lambda: db_session
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
     app.dependency_overrides.clear()
 
 @pytest.fixture(scope="function")
-def test_user(db_session):
+async def test_user(db_session):
     """Create a test user for authentication"""
     user = User(
         username="testuser",
@@ -60,8 +85,8 @@ def test_user(db_session):
         is_active=True
     )
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    await db_session.commit()
+    await db_session.refresh(user)
     return user
 
 @pytest.fixture
@@ -77,12 +102,12 @@ def authenticated_client(client, auth_headers):
     return client
 
 @pytest.fixture
-def sample_data(db_session, test_user):
+async def sample_data(db_session, test_user):
     # Create test children
     alice = Child(name="Alice", weekly_allowance=10.0, user_id=test_user.id)
     bob = Child(name="Bob", weekly_allowance=15.0, user_id=test_user.id)
     db_session.add_all([alice, bob])
-    db_session.commit()
+    await db_session.commit()
 
     # Create test chores
     chores = [
@@ -106,7 +131,7 @@ def sample_data(db_session, test_user):
         )
     ]
     db_session.add_all(chores)
-    db_session.commit()
+    await db_session.commit()
 
     # Create some assignments
     today = date.today()
@@ -138,11 +163,11 @@ def sample_data(db_session, test_user):
         )
     
     db_session.add_all(assignments)
-    db_session.commit()
+    await db_session.commit()
 
     return {
         "children": {"alice": alice, "bob": bob},
         "chores": chores,
         "assignments": assignments,
         "user": test_user
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,81 @@
+# app/tests/test_archive.py
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import create_engine, func, insert, select
+from app.database import Base
+from app.models import ChoreAssignment, ChoreAssignmentArchive, WeeklyChildSummary
+from app.seed import SeedConfig, seed_database
+from app.services.archive import archive_assignments, archive_cutoff
+from app.services.summaries import rebuild_summaries
+
+OLD_WEEK = date(2020, 1, 6)
+
+
+def test_archive_cutoff():
+    assert archive_cutoff(0) is None
+    assert archive_cutoff(2, today=date(2024, 1, 17)) == date(2024, 1, 1)
+
+
+def test_archive_moves_old_weeks_in_batches(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    Base.metadata.create_all(engine)
+    seed_database(engine, SeedConfig(households=3, weeks=6, end_week=date(2024, 1, 29)), hashed_password="x")
+    cutoff = date(2024, 1, 15)
+    with engine.connect() as conn:
+        rows = conn.execute(select(ChoreAssignment.__table__).order_by(ChoreAssignment.id)).all()
+        summaries = conn.execute(select(WeeklyChildSummary.__table__).order_by(WeeklyChildSummary.id)).all()
+    old = [row for row in rows if row.week_start < cutoff]
+
+    batches = []
+    assert archive_assignments(engine, cutoff, batch_size=50, progress=batches.append) == len(old)
+    assert len(batches) == -(-len(old) // 50)
+    # Running again finds nothing left to move
+    assert archive_assignments(engine, cutoff) == 0
+
+    with engine.begin() as conn:
+        archived = conn.execute(select(ChoreAssignmentArchive.__table__).order_by(ChoreAssignmentArchive.id)).all()
+        assert archived == old
+        assert conn.scalar(select(func.min(ChoreAssignment.week_start))) == cutoff
+        # Summaries still cover archived weeks after a rebuild
+        rebuild_summaries(conn)
+        rebuilt = conn.execute(select(WeeklyChildSummary.__table__).order_by(WeeklyChildSummary.id)).all()
+    assert [row[1:] for row in rebuilt] == [row[1:] for row in summaries]
+    engine.dispose()
+
+
+@pytest.fixture
+async def archived_week(db_session, sample_data, test_user, monkeypatch):
+    monkeypatch.setattr("app.services.archive.ARCHIVE_HORIZON_WEEKS", 52)
+    child = sample_data["children"]["alice"]
+    chore = sample_data["chores"][2]
+    await db_session.execute(insert(ChoreAssignmentArchive), [
+        {"id": 100000 + occurrence, "child_id": child.id, "chore_id": chore.id, "user_id": test_user.id,
+         "week_start": OLD_WEEK, "occurrence_number": occurrence, "is_completed": True,
+         "completion_date": OLD_WEEK + timedelta(days=occurrence)}
+        for occurrence in (1, 2)
+    ])
+    await db_session.commit()
+    return child
+
+
+async def test_old_weeks_are_read_from_the_archive(authenticated_client, archived_week):
+    response = await authenticated_client.get(
+        f"/api/weekly-assignments/{archived_week.id}", params={"week_start": OLD_WEEK.isoformat()}
+    )
+    assert response.status_code == 200
+    assert [(a["id"], a["chore"]["name"], a["is_completed"]) for a in response.json()] == [
+        (100001, "Take Out Trash", True), (100002, "Take Out Trash", True)
+    ]
+
+    response = await authenticated_client.get("/api/assignments/export", params={"child_id": archived_week.id})
+    exported = [line for line in response.text.splitlines() if '"week_start":"2020-01-06"' in line]
+    assert len(exported) == 2
+
+
+async def test_archived_weeks_are_read_only(authenticated_client, archived_week, sample_data):
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        "child_id": archived_week.id,
+        "chore_ids": [sample_data["chores"][0].id],
+        "week_start": OLD_WEEK.isoformat()
+    })
+    assert response.status_code == 409
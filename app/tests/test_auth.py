@@ -0,0 +1,79 @@
+# app/tests/test_auth.py
+from datetime import timedelta
+from app import dependencies
+from app.dependencies import create_access_token, response_cache, token_cache, user_cache
+from app.models.user import User
+
+
+async def test_current_user_lookup_is_cached(authenticated_client, test_user, count_queries):
+    """Test that repeated requests with the same token skip the users query"""
+    before = user_cache.stats()
+    response = await authenticated_client.get("/api/chores/")
+    assert response.status_code == 200
+    assert user_cache.stats()["misses"] == before["misses"] + 1
+
+    await response_cache.clear()
+    with count_queries() as counter:
+        response = await authenticated_client.get("/api/chores/")
+    assert response.status_code == 200
+    assert counter.count == 1  # only the chores query
+    assert user_cache.stats()["hits"] == before["hits"] + 1
+
+
+async def test_deactivated_user_is_rejected(client, db_session, test_user):
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", is_admin=True)
+    db_session.add(admin)
+    await db_session.commit()
+    admin_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin'})}"}
+    user_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': test_user.username})}"}
+
+    # Warm the cache for the user that is about to be deactivated
+    assert (await client.get("/api/chores/", headers=user_headers)).status_code == 200
+
+    response = await client.post(f"/api/users/{test_user.id}/deactivate", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+    assert (await client.get("/api/chores/", headers=user_headers)).status_code == 401
+
+
+async def test_update_user_invalidates_cached_username(client, db_session, test_user):
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", is_admin=True)
+    db_session.add(admin)
+    await db_session.commit()
+    admin_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin'})}"}
+    old_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'testuser'})}"}
+    assert (await client.get("/api/chores/", headers=old_headers)).status_code == 200
+
+    response = await client.put(
+        f"/api/users/{test_user.id}",
+        headers=admin_headers,
+        json={"username": "renamed", "email": "test@example.com"}
+    )
+    assert response.status_code == 200
+    assert response.json()["username"] == "renamed"
+
+    assert (await client.get("/api/chores/", headers=old_headers)).status_code == 401
+    new_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'renamed'})}"}
+    assert (await client.get("/api/chores/", headers=new_headers)).status_code == 200
+
+
+async def test_verified_token_skips_decode(authenticated_client, test_user, monkeypatch):
+    """Test that a token is only verified once while it is cached"""
+    decode_calls = []
+    real_decode = dependencies.jwt.decode
+    monkeypatch.setattr(
+        dependencies.jwt, "decode",
+        lambda *args, **kwargs: decode_calls.append(1) or real_decode(*args, **kwargs)
+    )
+
+    for _ in range(3):
+        assert (await authenticated_client.get("/api/chores/")).status_code == 200
+    assert len(decode_calls) == 1
+
+
+async def test_expired_token_is_not_cached(client, test_user):
+    token = create_access_token(data={"sub": test_user.username}, expires_delta=timedelta(seconds=-1))
+    response = await client.get("/api/chores/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert token_cache.stats()["size"] == 0
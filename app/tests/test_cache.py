@@ -0,0 +1,121 @@
+# app/tests/test_cache.py
+import asyncio
+import time
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from app.cache import (
+    InvalidationBus,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    TTLCache,
+    make_cache_backend
+)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now)
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=1)
+
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now + 2)
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now + 6)
+    assert cache.get("default") is None
+    assert cache.stats() == {
+        "size": 0, "maxsize": 10, "hits": 1, "misses": 2, "evictions": 0, "hit_ratio": 0.3333
+    }
+
+
+@pytest.fixture
+def redis_server():
+    return FakeServer()
+
+
+async def _eventually(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not await condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_response_cache_invalidates_one_user(kind, redis_server):
+    backend = make_cache_backend(kind, maxsize=10, ttl=60, redis_client=FakeRedis(server=redis_server))
+    cache = ResponseCache(backend)
+    alice_key = await cache.key(1, "/api/chores/?")
+    bob_key = await cache.key(2, "/api/chores/?")
+    entry = await cache.set(alice_key, b'{"items": []}')
+    await cache.set(bob_key, b'{"items": [1]}')
+
+    assert await cache.get(alice_key) == entry
+    await cache.invalidate(1)
+    assert await cache.get(await cache.key(1, "/api/chores/?")) is None
+    assert await cache.get(await cache.key(2, "/api/chores/?")) is not None
+
+
+async def test_key_taken_before_invalidation_is_never_read(redis_server):
+    cache = ResponseCache(MemoryCacheBackend(maxsize=10, ttl=60))
+    stale_key = await cache.key(1, "/api/chores/?")
+    await cache.invalidate(1)  # a write commits while the response is built
+    await cache.set(stale_key, b"stale")
+    assert await cache.get(await cache.key(1, "/api/chores/?")) is None
+
+
+async def test_shared_backend_is_visible_to_other_workers(redis_server):
+    worker_a = ResponseCache(RedisCacheBackend(FakeRedis(server=redis_server), ttl=60))
+    worker_b = ResponseCache(RedisCacheBackend(FakeRedis(server=redis_server), ttl=60))
+    entry = await worker_a.set(await worker_a.key(1, "/api/chores/?"), b"body")
+    assert await worker_b.get(await worker_b.key(1, "/api/chores/?")) == entry
+
+
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_invalidation_reaches_other_workers(kind, redis_server):
+    workers = []
+    for _ in range(2):
+        client = FakeRedis(server=redis_server)
+        bus = InvalidationBus(client)
+        users = TTLCache(maxsize=10, ttl=60)
+        bus.register("user", users.delete)
+        cache = ResponseCache(make_cache_backend(kind, 10, 60, client, bus))
+        await bus.start()
+        workers.append((bus, users, cache))
+    (bus_a, users_a, cache_a), (bus_b, users_b, cache_b) = workers
+
+    try:
+        users_b.set("alice", "cached user")
+        key_b = await cache_b.key(1, "/api/chores/?")
+        await cache_b.set(key_b, b"body")
+
+        await bus_a.publish("user", "alice")
+        await cache_a.invalidate(1)
+
+        async def user_dropped():
+            return users_b.get("alice") is None
+
+        async def response_dropped():
+            return await cache_b.get(await cache_b.key(1, "/api/chores/?")) is None
+
+        await _eventually(user_dropped)
+        await _eventually(response_dropped)
+    finally:
+        await bus_a.stop()
+        await bus_b.stop()
@@ -0,0 +1,144 @@
+# app/tests/test_completions.py
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import create_engine, func, select
+from app.database import Base
+from app.models import Chore, ChoreAssignment, WeeklyChildSummary, WeeklyChoreCompletion
+from app.seed import SeedConfig, seed_database
+from app.services.completions import (
+    convert_to_bitmap, convert_to_rows, occurrence_id, pack_dates, split_occurrence_id, unpack_dates
+)
+from app.services.summaries import rebuild_summaries
+
+WEEK = date(2024, 1, 1)
+
+
+def test_packed_dates_and_ids():
+    dates = [WEEK, None, WEEK + timedelta(days=9), WEEK - timedelta(days=2)]
+    packed = pack_dates(WEEK, dates)
+    assert len(packed) == 8
+    assert unpack_dates(WEEK, packed, 0b1101, 4) == dates
+    # Occurrences beyond the packed dates were never completed
+    assert unpack_dates(WEEK, packed, 0b1101, 6) == dates + [None, None]
+    assert split_occurrence_id(occurrence_id(12, 7)) == (12, 7)
+
+
+@pytest.fixture
+def bitmap_storage(monkeypatch):
+    monkeypatch.setattr("app.services.storage.ASSIGNMENT_STORAGE", "bitmap")
+
+
+async def _summary(db_session, child_id):
+    return (await db_session.execute(select(
+        WeeklyChildSummary.total_count, WeeklyChildSummary.completed_count
+    ).where(
+        WeeklyChildSummary.child_id == child_id, WeeklyChildSummary.week_start == WEEK
+    ).execution_options(populate_existing=True))).one()
+
+
+async def test_bitmap_storage_serves_the_same_api(authenticated_client, sample_data, db_session, bitmap_storage):
+    child_id = sample_data["children"]["bob"].id
+    chores = sample_data["chores"]
+    request = {"child_id": child_id, "chore_ids": [chores[1].id, chores[0].id], "week_start": WEEK.isoformat()}
+
+    response = await authenticated_client.post("/api/weekly-assignments/", json=request)
+    assert response.status_code == 200
+    assigned = response.json()
+    assert [(a["chore_id"], a["occurrence_number"]) for a in assigned] == (
+        [(chores[1].id, n) for n in range(1, 8)] + [(chores[0].id, 1)]
+    )
+    assert assigned[0]["chore"] == {
+        "id": chores[1].id, "name": "Do Dishes", "description": "Load/unload dishwasher", "frequency_per_week": 7
+    }
+    # Eight occurrences, two rows
+    assert await db_session.scalar(
+        select(func.count()).select_from(WeeklyChoreCompletion).where(WeeklyChoreCompletion.week_start == WEEK)
+    ) == 2
+
+    response = await authenticated_client.post("/api/weekly-assignments/", json=request)
+    assert response.json() == assigned
+    assert await _summary(db_session, child_id) == (8, 0)
+
+    first, second, third = (assigned[i]["id"] for i in range(3))
+    response = await authenticated_client.put(f"/api/assignments/{second}/complete")
+    assert response.status_code == 200
+    completed = response.json()
+    assert completed["id"] == second and completed["is_completed"] is True
+    assert completed["completion_date"] == date.today().isoformat()
+
+    response = await authenticated_client.put("/api/assignments/complete", json={
+        "assignment_ids": [first, second, third, occurrence_id(99999, 1), assigned[-1]["id"] + 1]
+    })
+    assert [r["status"] for r in response.json()] == ["updated", "unchanged", "updated", "not_found", "not_found"]
+    assert await _summary(db_session, child_id) == (8, 3)
+
+    response = await authenticated_client.put("/api/assignments/complete", json={
+        "assignment_ids": [third], "completed": False
+    })
+    assert response.json() == [{"id": third, "status": "updated"}]
+
+    response = await authenticated_client.get(
+        f"/api/weekly-assignments/{child_id}", params={"week_start": WEEK.isoformat()}
+    )
+    week = response.json()
+    assert [a["id"] for a in week] == [a["id"] for a in assigned]
+    assert [a["is_completed"] for a in week[:3]] == [True, True, False]
+    assert week[1]["completion_date"] == date.today().isoformat()
+
+    response = await authenticated_client.get("/api/assignments/export", params={"child_id": child_id})
+    assert response.text.count('"week_start":"2024-01-01"') == 8
+
+    # The incrementally kept summary matches one rebuilt from the bitmap rows
+    await db_session.run_sync(lambda session: rebuild_summaries(session.connection(), week_start=WEEK))
+    assert await _summary(db_session, child_id) == (8, 2)
+
+    response = await authenticated_client.put(f"/api/assignments/{occurrence_id(99999, 1)}/complete")
+    assert response.status_code == 404
+
+
+async def test_bitmap_storage_rejects_chores_too_frequent_to_pack(
+    authenticated_client, sample_data, db_session, bitmap_storage
+):
+    chore = sample_data["chores"][0]
+    chore.frequency_per_week = 64
+    await db_session.commit()
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        "child_id": sample_data["children"]["alice"].id, "chore_ids": [chore.id], "week_start": WEEK.isoformat()
+    })
+    assert response.status_code == 422
+
+
+def _occurrences(conn):
+    return sorted(conn.execute(select(
+        ChoreAssignment.child_id, ChoreAssignment.chore_id, ChoreAssignment.week_start,
+        ChoreAssignment.occurrence_number, ChoreAssignment.is_completed, ChoreAssignment.completion_date
+    )).all())
+
+
+def test_convert_between_storages(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'convert.db'}")
+    Base.metadata.create_all(engine)
+    seed_database(engine, SeedConfig(households=3, weeks=4, end_week=WEEK), hashed_password="x")
+    with engine.connect() as conn:
+        before = _occurrences(conn)
+        summaries = conn.execute(select(WeeklyChildSummary.__table__).order_by(WeeklyChildSummary.id)).all()
+        weeks = conn.scalar(select(func.count()).select_from(
+            select(ChoreAssignment.child_id, ChoreAssignment.chore_id, ChoreAssignment.week_start).distinct().subquery()
+        ))
+
+    batches = []
+    assert convert_to_bitmap(engine, batch_size=2, progress=batches.append) == weeks
+    assert len(batches) == 3
+    # Converting again replaces rather than duplicates
+    assert convert_to_bitmap(engine) == weeks
+
+    with engine.begin() as conn:
+        assert conn.scalar(select(func.sum(WeeklyChoreCompletion.frequency))) == len(before)
+        rebuild_summaries(conn, storage="bitmap")
+        rebuilt = conn.execute(select(WeeklyChildSummary.__table__).order_by(WeeklyChildSummary.id)).all()
+    assert [row[1:] for row in rebuilt] == [row[1:] for row in summaries]
+
+    assert convert_to_rows(engine) == len(before)
+    with engine.connect() as conn:
+        assert _occurrences(conn) == before
+    engine.dispose()
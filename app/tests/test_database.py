@@ -0,0 +1,34 @@
+# app/tests/test_database.py
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.database import PoolStats
+
+
+async def test_pool_stats_count_checkouts_and_state():
+    stats = PoolStats()
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=1
+    )
+    stats.attach(engine)
+    try:
+        for _ in range(3):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                snapshot = stats.snapshot(engine.pool)
+                assert snapshot["checked_out"] == 1
+    finally:
+        await engine.dispose()
+
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["connections_opened"] == 1
+    assert snapshot["checkouts"] == 3
+    assert snapshot["size"] == 2
+
+
+async def test_health_reports_pool_stats(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert set(data["db_pool"]) >= {"checkouts", "connections_opened", "wait_seconds_total"}
@@ -1,10 +1,16 @@
 # app/tests/test_endpoints.py
-from fastapi.testclient import TestClient
+import csv
+import io
+import json
 from datetime import date, timedelta
 import pytest
+from sqlalchemy import select
+from app.dependencies import create_access_token, user_cache
+from app.models.chores import ChoreAssignment, WeeklyChildSummary
+from app.models.user import User
 
-def test_create_child(authenticated_client):
-    response = authenticated_client.post(
+async def test_create_child(authenticated_client):
+    response = await authenticated_client.post(
         "/api/children/",
         json={"name": "Charlie", "weekly_allowance": 12.0}
     )
@@ -14,16 +20,45 @@ def test_create_child(authenticated_client):
     assert data["weekly_allowance"] == 12.0
     assert "id" in data
 
-def test_get_children(authenticated_client, sample_data):
-    response = authenticated_client.get("/api/children/")
+async def test_get_children(authenticated_client, sample_data):
+    response = await authenticated_client.get("/api/children/")
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 2
     assert any(child["name"] == "Alice" for child in data)
     assert any(child["name"] == "Bob" for child in data)
 
-def test_create_chore(authenticated_client):
-    response = authenticated_client.post(
+async def test_get_chores_paginates_with_cursor(authenticated_client, sample_data):
+    """Test that pages follow the cursor without repeating or skipping chores"""
+    seen = []
+    after = None
+    while True:
+        params = {"limit": 2}
+        if after is not None:
+            params["after"] = after
+        response = await authenticated_client.get("/api/chores/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(chore["id"] for chore in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert seen == sorted(chore.id for chore in sample_data["chores"])
+
+async def test_get_chores_filters(authenticated_client, sample_data):
+    response = await authenticated_client.get("/api/chores/", params={"frequency_per_week": 7})
+    assert response.status_code == 200
+    page = response.json()
+    assert [chore["name"] for chore in page["items"]] == ["Do Dishes"]
+    assert page["next_cursor"] is None
+
+async def test_page_size_is_bounded(authenticated_client):
+    response = await authenticated_client.get("/api/children/", params={"limit": 100000})
+    assert response.status_code == 422
+
+async def test_create_chore(authenticated_client):
+    response = await authenticated_client.post(
         "/api/chores/",
         json={
             "name": "Feed Pet",
@@ -36,9 +71,9 @@ def test_create_chore(authenticated_client):
     assert data["name"] == "Feed Pet"
     assert data["frequency_per_week"] == 7
 
-def test_create_chore_default_frequency(authenticated_client):
+async def test_create_chore_default_frequency(authenticated_client):
     """Test that chores default to frequency of 1 if not specified"""
-    response = authenticated_client.post(
+    response = await authenticated_client.post(
         "/api/chores/",
         json={
             "name": "Clean Garage",
@@ -49,9 +84,9 @@ def test_create_chore_default_frequency(authenticated_client):
     data = response.json()
     assert data["frequency_per_week"] == 1
 
-def test_invalid_frequency(authenticated_client):
+async def test_invalid_frequency(authenticated_client):
     """Test that frequency must be positive"""
-    response = authenticated_client.post(
+    response = await authenticated_client.post(
         "/api/chores/",
         json={
             "name": "Test Chore",
@@ -61,20 +96,20 @@ def test_invalid_frequency(authenticated_client):
     )
     assert response.status_code == 422  # Validation error
 
-def test_get_chores(authenticated_client, sample_data):
-    response = authenticated_client.get("/api/chores/")
+async def test_get_chores(authenticated_client, sample_data):
+    response = await authenticated_client.get("/api/chores/")
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 3
     assert any(chore["name"] == "Clean Room" for chore in data)
 
-def test_get_weekly_assignments(authenticated_client, sample_data):
+async def test_get_weekly_assignments(authenticated_client, sample_data):
     """Test getting weekly assignments"""
     child_id = sample_data["children"]["alice"].id
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
     
-    response = authenticated_client.get(
+    response = await authenticated_client.get(
         f"/api/weekly-assignments/{child_id}",
         params={"week_start": week_start.isoformat()}
     )
@@ -87,7 +122,7 @@ def test_get_weekly_assignments(authenticated_client, sample_data):
         assert "chore" in assignment
         assert "week_start" in assignment
 
-def test_weekly_assignments_create_with_frequency(authenticated_client, sample_data):
+async def test_weekly_assignments_create_with_frequency(authenticated_client, sample_data):
     """Test that assignments are created according to chore frequency"""
     child_id = sample_data["children"]["alice"].id
     
@@ -97,14 +132,14 @@ def test_weekly_assignments_create_with_frequency(authenticated_client, sample_d
         "description": "30 minutes of exercise",
         "frequency_per_week": 5
     }
-    chore_response = authenticated_client.post("/api/chores/", json=chore_data)
+    chore_response = await authenticated_client.post("/api/chores/", json=chore_data)
     assert chore_response.status_code == 200
     chore = chore_response.json()
     
     # Assign the chore
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
-    assign_response = authenticated_client.post(
+    assign_response = await authenticated_client.post(
         "/api/weekly-assignments/",
         json={
             "child_id": child_id,
@@ -123,30 +158,30 @@ def test_weekly_assignments_create_with_frequency(authenticated_client, sample_d
     occurrence_numbers = {a["occurrence_number"] for a in assignments}
     assert occurrence_numbers == {1, 2, 3, 4, 5}
 
-def test_complete_assignment(authenticated_client, sample_data):
+async def test_complete_assignment(authenticated_client, sample_data):
     """Test completing an assignment"""
     assignment_id = sample_data["assignments"][0].id
-    response = authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
+    response = await authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
     assert response.status_code == 200
     data = response.json()
     assert data["is_completed"] is True
     assert "completion_date" in data
 
-def test_get_nonexistent_weekly_assignments(authenticated_client):
+async def test_get_nonexistent_weekly_assignments(authenticated_client):
     """Test getting assignments for nonexistent child/week"""
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
     
-    response = authenticated_client.get(
+    response = await authenticated_client.get(
         "/api/weekly-assignments/99999",
         params={"week_start": week_start.isoformat()}
     )
     assert response.status_code == 404
 
-def test_complete_assignment_with_date(authenticated_client, sample_data):
+async def test_complete_assignment_with_date(authenticated_client, sample_data):
     """Test completing an assignment sets completion date"""
     assignment_id = sample_data["assignments"][0].id
-    response = authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
+    response = await authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
     assert response.status_code == 200
     
     data = response.json()
@@ -154,14 +189,14 @@ def test_complete_assignment_with_date(authenticated_client, sample_data):
     assert "completion_date" in data
     assert data["completion_date"] is not None
 
-def test_weekly_assignment_filtering(authenticated_client, sample_data):
+async def test_weekly_assignment_filtering(authenticated_client, sample_data):
     """Test that assignments are properly filtered by week"""
     child_id = sample_data["children"]["alice"].id
     
     # Get assignments for current week
     today = date.today()
     current_week = today - timedelta(days=today.weekday())
-    current_response = authenticated_client.get(
+    current_response = await authenticated_client.get(
         f"/api/weekly-assignments/{child_id}",
         params={"week_start": current_week.isoformat()}
     )
@@ -169,7 +204,7 @@ def test_weekly_assignment_filtering(authenticated_client, sample_data):
     
     # Get assignments for next week
     next_week = current_week + timedelta(days=7)
-    next_response = authenticated_client.get(
+    next_response = await authenticated_client.get(
         f"/api/weekly-assignments/{child_id}",
         params={"week_start": next_week.isoformat()}
     )
@@ -180,17 +215,17 @@ def test_weekly_assignment_filtering(authenticated_client, sample_data):
     next_assignments = next_response.json()
     assert len(next_assignments) == 0  # Should be no assignments for next week
 
-def test_error_handling(authenticated_client):
+async def test_error_handling(authenticated_client):
     """Test API error responses"""
-    response = authenticated_client.get("/api/children/99999")
+    response = await authenticated_client.get("/api/children/99999")
     assert response.status_code == 404
 
-def test_assign_chores_to_nonexistent_child(authenticated_client):
+async def test_assign_chores_to_nonexistent_child(authenticated_client):
     """Test assigning chores to nonexistent child"""
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
     
-    response = authenticated_client.post(
+    response = await authenticated_client.post(
         "/api/weekly-assignments/",
         json={
             "child_id": 99999,
@@ -200,7 +235,7 @@ def test_assign_chores_to_nonexistent_child(authenticated_client):
     )
     assert response.status_code == 404
 
-def test_invalid_token(client):
+async def test_invalid_token(client):
     """Test that invalid tokens are rejected"""
     headers = {"Authorization": "Bearer invalid_token"}
     endpoints = [
@@ -210,13 +245,13 @@ def test_invalid_token(client):
     ]
     
     for endpoint in endpoints:
-        response = client.get(endpoint, headers=headers)
+        response = await client.get(endpoint, headers=headers)
         assert response.status_code == 401, f"Endpoint {endpoint} should reject invalid token"
 
-def test_full_workflow(authenticated_client):
+async def test_full_workflow(authenticated_client):
     """Test the complete chore assignment workflow"""
     # 1. Create a child
-    child_response = authenticated_client.post(
+    child_response = await authenticated_client.post(
         "/api/children/",
         json={"name": "David", "weekly_allowance": 10.0}
     )
@@ -229,14 +264,14 @@ def test_full_workflow(authenticated_client):
         {"name": "Study", "description": "Do homework", "frequency_per_week": 5},
         {"name": "Exercise", "description": "30 minutes activity", "frequency_per_week": 3}
     ]:
-        chore_response = authenticated_client.post("/api/chores/", json=chore_data)
+        chore_response = await authenticated_client.post("/api/chores/", json=chore_data)
         assert chore_response.status_code == 200
         chore_ids.append(chore_response.json()["id"])
 
     # 3. Assign chores to child
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
-    assign_response = authenticated_client.post(
+    assign_response = await authenticated_client.post(
         "/api/weekly-assignments/",
         json={
             "child_id": child_id,
@@ -252,14 +287,14 @@ def test_full_workflow(authenticated_client):
 
     # 4. Complete some assignments and verify completion
     for assignment in assignments[:3]:
-        complete_response = authenticated_client.put(f'/api/assignments/{assignment["id"]}/complete')
+        complete_response = await authenticated_client.put(f'/api/assignments/{assignment["id"]}/complete')
         assert complete_response.status_code == 200
         completed_assignment = complete_response.json()
         assert completed_assignment["is_completed"] is True
         assert completed_assignment["completion_date"] is not None
 
     # 5. Verify assignments were properly created
-    get_response = authenticated_client.get(
+    get_response = await authenticated_client.get(
         f"/api/weekly-assignments/{child_id}",
         params={"week_start": week_start.isoformat()}
     )
@@ -277,4 +312,232 @@ def test_full_workflow(authenticated_client):
     study_occurrences = {a["occurrence_number"] for a in study_assignments}
     exercise_occurrences = {a["occurrence_number"] for a in exercise_assignments}
     assert study_occurrences == {1, 2, 3, 4, 5}
-    assert exercise_occurrences == {1, 2, 3}
\ No newline at end of file
+    assert exercise_occurrences == {1, 2, 3}
+
+
+async def test_assign_chores_returns_persisted_rows(authenticated_client, sample_data, db_session):
+    """Test that batched assignment returns the stored ids and skips unknown chores"""
+    child_id = sample_data["children"]["bob"].id
+    chores = sample_data["chores"]
+    week_start = date(2024, 1, 1)
+
+    response = await authenticated_client.post(
+        "/api/weekly-assignments/",
+        json={
+            "child_id": child_id,
+            "chore_ids": [chores[2].id, 99999, chores[0].id],
+            "week_start": week_start.isoformat()
+        }
+    )
+    assert response.status_code == 200
+    assignments = response.json()
+
+    # 2 occurrences of "Take Out Trash" + 1 of "Clean Room", unknown chore skipped
+    assert [(a["chore"]["name"], a["occurrence_number"]) for a in assignments] == [
+        ("Take Out Trash", 1),
+        ("Take Out Trash", 2),
+        ("Clean Room", 1),
+    ]
+    for a in assignments:
+        stored = await db_session.get(ChoreAssignment, a["id"])
+        assert stored.chore_id == a["chore_id"]
+        assert stored.occurrence_number == a["occurrence_number"]
+        assert stored.week_start == week_start
+        assert stored.is_completed is False
+
+async def test_weekly_assignments_query_count_is_constant(authenticated_client, sample_data, db_session, count_queries):
+    """Test that assigning and listing chores don't load each chore separately"""
+    week_start = date(2024, 1, 1)
+    chore_ids = [c.id for c in sample_data["chores"]]
+    alice_id = sample_data["children"]["alice"].id
+    bob_id = sample_data["children"]["bob"].id
+
+    # Expire on commit like a default session, so chores can't be reused after it
+    db_session.sync_session.expire_on_commit = True
+
+    async def assign_and_list(child_id, chore_ids):
+        # Start from an empty identity map and user cache so both calls do the same lookups
+        db_session.expunge_all()
+        user_cache.clear()
+        with count_queries() as assign_counter:
+            response = await authenticated_client.post(
+                "/api/weekly-assignments/",
+                json={"child_id": child_id, "chore_ids": chore_ids, "week_start": week_start.isoformat()}
+            )
+        assert response.status_code == 200
+        assert all(a["chore"]["id"] in chore_ids for a in response.json())
+
+        db_session.expunge_all()
+        with count_queries() as list_counter:
+            response = await authenticated_client.get(
+                f"/api/weekly-assignments/{child_id}",
+                params={"week_start": week_start.isoformat()}
+            )
+        assert response.status_code == 200
+        assert all(a["chore"]["id"] in chore_ids for a in response.json())
+        return len(response.json()), assign_counter.count, list_counter.count
+
+    few_rows, few_assign_queries, few_list_queries = await assign_and_list(alice_id, chore_ids[:1])
+    many_rows, many_assign_queries, many_list_queries = await assign_and_list(bob_id, chore_ids)
+
+    assert (few_rows, many_rows) == (1, 10)
+    assert few_assign_queries == many_assign_queries
+    assert few_list_queries == many_list_queries
+
+
+async def test_export_assignments_ndjson(authenticated_client, sample_data):
+    child_id = sample_data["children"]["alice"].id
+    response = await authenticated_client.get(
+        "/api/assignments/export", params={"child_id": child_id}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    expected = [a for a in sample_data["assignments"] if a.child_id == child_id]
+    assert len(rows) == len(expected)
+    assert {row["id"] for row in rows} == {a.id for a in expected}
+    assert rows[0]["chore_name"] == next(c.name for c in sample_data["chores"] if c.id == rows[0]["chore_id"])
+    assert rows[0]["week_start"] == expected[0].week_start.isoformat()
+
+
+async def test_export_assignments_csv(authenticated_client, sample_data):
+    response = await authenticated_client.get("/api/assignments/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == len(sample_data["assignments"])
+    assert set(rows[0]) == {
+        "id", "child_id", "chore_id", "chore_name", "week_start",
+        "occurrence_number", "is_completed", "completion_date"
+    }
+
+
+async def test_export_assignments_unknown_child(authenticated_client):
+    response = await authenticated_client.get("/api/assignments/export", params={"child_id": 99999})
+    assert response.status_code == 404
+
+
+async def test_get_users_requires_authentication(client):
+    """Test that listing users without a token is rejected, not a server error"""
+    response = await client.get("/api/users/")
+    assert response.status_code == 401
+
+
+async def test_get_users_filters_and_paginates(client, db_session, test_user):
+    db_session.add_all([
+        User(username=f"admin{i}", email=f"admin{i}@example.com", hashed_password="x", is_admin=True)
+        for i in range(3)
+    ])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'admin0'})}"}
+
+    response = await client.get("/api/users/", params={"is_admin": True, "limit": 2}, headers=headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert [user["username"] for user in page["items"]] == ["admin0", "admin1"]
+
+    response = await client.get(
+        "/api/users/",
+        params={"is_admin": True, "limit": 2, "after": page["next_cursor"]},
+        headers=headers
+    )
+    page = response.json()
+    assert [user["username"] for user in page["items"]] == ["admin2"]
+    assert page["next_cursor"] is None
+
+
+async def test_login_returns_token(client, test_user):
+    """Test that a correct password is verified and a token issued"""
+    response = await client.post("/token", data={"username": "testuser", "password": "testpassword"})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+async def test_login_rejects_wrong_password(client, test_user):
+    response = await client.post("/token", data={"username": "testuser", "password": "wrong"})
+    assert response.status_code == 401
+
+
+async def test_create_first_user_hashes_password(client, db_session):
+    """Test that the first user becomes admin and can log in with the new password"""
+    response = await client.post(
+        "/api/users/",
+        json={"username": "first", "email": "first@example.com", "password": "secret123"}
+    )
+    assert response.status_code == 200
+    assert response.json()["is_admin"] is True
+
+    response = await client.post("/token", data={"username": "first", "password": "secret123"})
+    assert response.status_code == 200
+
+
+async def test_assign_chores_is_idempotent(authenticated_client, sample_data, db_session):
+    """Test that repeating an assignment only adds the missing occurrences"""
+    child_id = sample_data["children"]["alice"].id
+    chores = sample_data["chores"]
+    payload = {"child_id": child_id, "chore_ids": [chores[2].id], "week_start": "2024-01-01"}
+    first = (await authenticated_client.post("/api/weekly-assignments/", json=payload)).json()
+    await authenticated_client.put(f"/api/assignments/{first[0]['id']}/complete")
+
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        **payload, "chore_ids": [chores[2].id, chores[0].id]
+    })
+    assert response.status_code == 200
+    second = response.json()
+    assert [a["id"] for a in second[:2]] == [a["id"] for a in first]
+    assert second[0]["is_completed"] is True
+    assert [(a["chore_id"], a["occurrence_number"]) for a in second] == [
+        (chores[2].id, 1), (chores[2].id, 2), (chores[0].id, 1)
+    ]
+
+    stored = await db_session.scalars(select(ChoreAssignment).where(
+        ChoreAssignment.child_id == child_id, ChoreAssignment.week_start == date(2024, 1, 1)
+    ))
+    assert len(stored.all()) == 3
+    summary = await db_session.scalar(select(WeeklyChildSummary).where(
+        WeeklyChildSummary.child_id == child_id, WeeklyChildSummary.week_start == date(2024, 1, 1)
+    ))
+    assert (summary.total_count, summary.completed_count) == (3, 1)
+
+async def test_assign_chores_replays_idempotency_key(authenticated_client, sample_data, count_queries):
+    """Test that a retry with the same Idempotency-Key gets the stored response"""
+    payload = {
+        "child_id": sample_data["children"]["bob"].id,
+        "chore_ids": [sample_data["chores"][1].id],
+        "week_start": "2024-01-01"
+    }
+    headers = {"Idempotency-Key": "retry-1"}
+    response = await authenticated_client.post("/api/weekly-assignments/", json=payload, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 7
+
+    with count_queries() as counter:
+        retry = await authenticated_client.post("/api/weekly-assignments/", json=payload, headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == response.json()
+    assert counter.count == 1
+
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        **payload, "week_start": "2024-01-08"
+    }, headers=headers)
+    assert response.status_code == 422
+
+async def test_weekly_assignments_match_response_schema(authenticated_client, sample_data):
+    """The row-built weekly listing serializes exactly like the validated response model"""
+    child_id = sample_data["children"]["bob"].id
+    chores = sample_data["chores"]
+    week_start = date(2024, 1, 1)
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        "child_id": child_id,
+        "chore_ids": [chores[0].id, chores[2].id],
+        "week_start": week_start.isoformat()
+    })
+    created = sorted(response.json(), key=lambda a: a["id"])
+    response = await authenticated_client.put(f"/api/assignments/{created[0]['id']}/complete")
+    created[0] = {**created[0], "is_completed": True, "completion_date": date.today().isoformat()}
+
+    response = await authenticated_client.get(
+        f"/api/weekly-assignments/{child_id}", params={"week_start": week_start.isoformat()}
+    )
+    assert response.status_code == 200
+    assert response.json() == created
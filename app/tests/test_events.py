@@ -0,0 +1,92 @@
+# app/tests/test_events.py
+import asyncio
+import json
+from datetime import date
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from app.cache import InvalidationBus
+from app.dependencies import event_broker
+from app.events import EventBroker, event_stream
+
+
+async def test_events_reach_only_their_users_streams():
+    broker = EventBroker()
+    async with broker.subscribe(1) as first, broker.subscribe(1) as second, broker.subscribe(2) as other:
+        await broker.publish(1, "child.created", {"id": 5})
+        assert first.get_nowait() == second.get_nowait() == {"type": "child.created", "data": {"id": 5}}
+        assert other.empty()
+    assert broker.stats()["streams"] == 0
+
+
+async def test_slow_stream_is_told_to_resync():
+    broker = EventBroker(queue_size=2)
+    async with broker.subscribe(1) as queue:
+        for i in range(3):
+            await broker.publish(1, "chore.created", {"id": i})
+        assert queue.get_nowait()["type"] == "resync"
+        assert queue.empty()
+    assert broker.stats()["dropped"] == 2
+
+
+async def test_events_reach_other_workers():
+    server = FakeServer()
+    buses = [InvalidationBus(FakeRedis(server=server)) for _ in range(2)]
+    brokers = [EventBroker(bus) for bus in buses]
+    for bus in buses:
+        await bus.start()
+    try:
+        async with brokers[1].subscribe(1) as queue:
+            await brokers[0].publish(1, "assignments.completed", {"ids": [3], "completed": True})
+            event = await asyncio.wait_for(queue.get(), timeout=2)
+        assert event == {"type": "assignments.completed", "data": {"ids": [3], "completed": True}}
+    finally:
+        for bus in buses:
+            await bus.stop()
+
+
+async def test_event_stream_formats_events_and_keepalives():
+    broker = EventBroker()
+    stream = event_stream(broker, 1, keepalive=0.01)
+    assert await anext(stream) == b"retry: 3000\n\n"
+    assert await anext(stream) == b": keepalive\n\n"
+    await broker.publish(1, "assignments.created", {"week_start": date(2024, 1, 1), "ids": [1]})
+    chunk = await anext(stream)
+    await stream.aclose()
+
+    name, data = chunk.decode().strip().split("\n")
+    assert name == "event: assignments.created"
+    assert json.loads(data.removeprefix("data: ")) == {"week_start": "2024-01-01", "ids": [1]}
+    assert broker.stats()["streams"] == 0
+
+
+async def test_writes_publish_events(authenticated_client, sample_data, test_user):
+    child_id = sample_data["children"]["bob"].id
+    chores = sample_data["chores"]
+    async with event_broker.subscribe(test_user.id) as queue:
+        response = await authenticated_client.post("/api/children/", json={"name": "Cara", "weekly_allowance": 5.0})
+        assert queue.get_nowait() == {
+            "type": "child.created",
+            "data": {"id": response.json()["id"], "name": "Cara", "weekly_allowance": 5.0},
+        }
+
+        response = await authenticated_client.post("/api/weekly-assignments/", json={
+            "child_id": child_id, "chore_ids": [chores[0].id], "week_start": "2024-01-01"
+        })
+        assignment_id = response.json()[0]["id"]
+        assert queue.get_nowait() == {
+            "type": "assignments.created",
+            "data": {"child_id": child_id, "week_start": "2024-01-01", "ids": [assignment_id]},
+        }
+
+        await authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
+        # Completing again changes nothing and publishes nothing
+        await authenticated_client.put(f"/api/assignments/{assignment_id}/complete")
+        assert queue.get_nowait() == {
+            "type": "assignments.completed", "data": {"ids": [assignment_id], "completed": True}
+        }
+        assert queue.empty()
+
+
+async def test_events_require_authentication(client):
+    response = await client.get("/api/events")
+    assert response.status_code == 401
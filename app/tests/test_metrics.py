@@ -0,0 +1,54 @@
+# app/tests/test_metrics.py
+import re
+import pytest
+from app.metrics import metrics
+
+
+@pytest.fixture
+def request_metrics(db_engine):
+    """Global registry, reset and fed by the test engine's statements"""
+    metrics.clear()
+    metrics.attach(db_engine)
+    yield metrics
+    metrics.detach(db_engine)
+    metrics.clear()
+
+
+def _sample(text, name, **labels):
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(label_text)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+async def test_requests_are_recorded_by_route_template(authenticated_client, sample_data, request_metrics):
+    child_id = sample_data["children"]["alice"].id
+    week_start = sample_data["assignments"][0].week_start.isoformat()
+    for _ in range(2):
+        await authenticated_client.get(f"/api/weekly-assignments/{child_id}?week_start={week_start}")
+    await authenticated_client.get("/api/weekly-assignments/99999?week_start=2024-01-01")
+
+    text = (await authenticated_client.get("/metrics")).text
+    route = "/api/weekly-assignments/{child_id}"
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route=route, status="200") == 2
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route=route, status="404") == 1
+    assert _sample(text, "http_request_duration_seconds_bucket", method="GET", route=route, status="200", le="+Inf") == 2
+    # The first request runs the child check and the assignments query, the second is a cache hit
+    assert _sample(text, "http_request_db_statements_sum", method="GET", route=route) >= 2
+    assert _sample(text, "http_request_db_seconds_sum", method="GET", route=route) > 0
+
+
+async def test_unknown_paths_share_one_label(client, request_metrics):
+    await client.get("/no/such/path")
+    await client.get("/another/missing/path")
+
+    text = (await client.get("/metrics")).text
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route="unmatched", status="404") == 2
+    assert "/no/such/path" not in text
+
+
+async def test_metrics_include_pool_and_cache_stats(client, request_metrics):
+    response = await client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_requests_in_flight 1" in response.text
+    assert re.search(r"^db_pool_checkouts \d+", response.text, re.MULTILINE)
+    assert re.search(r"^cache_responses_hit_ratio \S+", response.text, re.MULTILINE)
@@ -0,0 +1,68 @@
+# app/tests/test_profiling.py
+import pstats
+import pytest
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from app import profiling
+from app.main import app
+from app.profiling import ProfilingMiddleware, parameters_shape, slow_query_logger
+
+
+@pytest.fixture
+def profiling_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling.settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "sample_rate", 0.0)
+    monkeypatch.setattr(profiling.settings, "header_enabled", True)
+    return profiling.settings
+
+
+@pytest.fixture
+def log_messages():
+    messages = []
+    handler = logger.add(messages.append, format="{message}")
+    yield messages
+    logger.remove(handler)
+
+
+@pytest.fixture
+async def profiled_client(client):
+    """The app behind ProfilingMiddleware, sharing the test database overrides"""
+    async with AsyncClient(transport=ASGITransport(app=ProfilingMiddleware(app)), base_url="http://test") as profiled:
+        yield profiled
+
+
+def test_parameters_shape_hides_values():
+    assert parameters_shape({"username": "alice", "id_1": 3}) == "{username: str, id_1: int}"
+    assert parameters_shape(("secret", 1.5)) == "(str, float)"
+    assert parameters_shape([{"a": 1}, {"a": 2}]) == "2 x {a: int}"
+
+
+async def test_slow_queries_are_logged_with_route(
+    authenticated_client, db_engine, monkeypatch, log_messages, sample_data
+):
+    monkeypatch.setattr(profiling.settings, "slow_query_ms", 0.0)
+    slow_query_logger.attach(db_engine)
+    try:
+        await authenticated_client.get("/api/children/")
+    finally:
+        slow_query_logger.detach(db_engine)
+
+    slow = [m for m in log_messages if m.startswith("Slow query")]
+    assert any("on /api/children/" in m and "FROM children" in m for m in slow)
+    assert not any("testuser" in m for m in slow)
+
+
+async def test_header_requests_a_profile(profiled_client, authenticated_client, profiling_settings, tmp_path):
+    headers = {**authenticated_client.headers, "X-Profile": "1"}
+    response = await profiled_client.get("/api/chores/", headers=headers)
+    assert response.status_code == 200
+
+    [dump] = tmp_path.glob("*-GET-api_chores-*.pstats")
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+async def test_requests_are_not_profiled_by_default(profiled_client, authenticated_client, profiling_settings, tmp_path):
+    await profiled_client.get("/api/chores/", headers=authenticated_client.headers)
+    profiling_settings.header_enabled = False
+    await profiled_client.get("/api/chores/", headers={**authenticated_client.headers, "X-Profile": "1"})
+    assert list(tmp_path.iterdir()) == []
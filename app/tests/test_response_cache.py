@@ -0,0 +1,73 @@
+# app/tests/test_response_cache.py
+from app.dependencies import create_access_token, response_cache
+from app.models.user import User
+
+
+async def test_unchanged_poll_returns_304_without_queries(authenticated_client, sample_data, count_queries):
+    response = await authenticated_client.get("/api/chores/")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    with count_queries() as counter:
+        response = await authenticated_client.get("/api/chores/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert counter.count == 0
+
+
+async def test_cached_body_matches_fresh_response(authenticated_client, sample_data):
+    child_id = sample_data["children"]["alice"].id
+    week_start = sample_data["assignments"][0].week_start.isoformat()
+    path = f"/api/weekly-assignments/{child_id}?week_start={week_start}"
+
+    fresh = await authenticated_client.get(path)
+    before = response_cache.stats()
+    cached = await authenticated_client.get(path)
+    assert cached.status_code == 200
+    assert cached.json() == fresh.json()
+    assert cached.headers["etag"] == fresh.headers["etag"]
+    assert response_cache.stats()["hits"] == before["hits"] + 1
+
+
+async def test_write_invalidates_cached_responses(authenticated_client, sample_data):
+    response = await authenticated_client.get("/api/chores/")
+    etag = response.headers["etag"]
+
+    await authenticated_client.post("/api/chores/", json={"name": "Walk Dog", "description": ""})
+
+    response = await authenticated_client.get("/api/chores/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Walk Dog" in [chore["name"] for chore in response.json()["items"]]
+
+
+async def test_completion_invalidates_weekly_assignments(authenticated_client, sample_data):
+    assignment = sample_data["assignments"][0]
+    path = f"/api/weekly-assignments/{assignment.child_id}?week_start={assignment.week_start.isoformat()}"
+    etag = (await authenticated_client.get(path)).headers["etag"]
+
+    await authenticated_client.put(f"/api/assignments/{assignment.id}/complete")
+
+    response = await authenticated_client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    completed = next(a for a in response.json() if a["id"] == assignment.id)
+    assert completed["is_completed"] is True
+
+
+async def test_cache_is_per_user(client, db_session, sample_data):
+    owner_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': sample_data['user'].username})}"}
+    assert len((await client.get("/api/children/", headers=owner_headers)).json()["items"]) == 2
+
+    db_session.add(User(username="other", email="other@example.com", hashed_password="x"))
+    await db_session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'other'})}"}
+    assert (await client.get("/api/children/", headers=other_headers)).json()["items"] == []
+
+
+async def test_query_parameter_order_shares_entry(authenticated_client, sample_data):
+    first = await authenticated_client.get("/api/chores/?limit=2&frequency_per_week=7")
+    before = response_cache.stats()
+    second = await authenticated_client.get("/api/chores/?frequency_per_week=7&limit=2")
+    assert second.headers["etag"] == first.headers["etag"]
+    assert response_cache.stats()["hits"] == before["hits"] + 1
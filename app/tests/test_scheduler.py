@@ -0,0 +1,114 @@
+# app/tests/test_scheduler.py
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, func, insert, select
+from app.database import Base
+from app.models import Child, Chore, ChoreAssignment, ChoreSchedule, WeeklyChildSummary, WeeklyChoreCompletion
+from app.seed import SeedConfig, seed_database
+from app.services.scheduler import generate_week
+
+WEEK = date(2024, 1, 8)
+
+
+async def test_schedules_crud(authenticated_client, sample_data):
+    child_id = sample_data["children"]["alice"].id
+    chores = sample_data["chores"]
+    response = await authenticated_client.post("/api/schedules/", json={
+        "child_id": child_id, "chore_ids": [chores[0].id, chores[1].id, 99999]
+    })
+    assert response.status_code == 200
+    assert [s["chore_id"] for s in response.json()] == [chores[0].id, chores[1].id]
+
+    # Already scheduled chores are skipped
+    response = await authenticated_client.post("/api/schedules/", json={
+        "child_id": child_id, "chore_ids": [chores[1].id, chores[2].id]
+    })
+    schedules = response.json()
+    assert [s["chore_id"] for s in schedules] == [chores[0].id, chores[1].id, chores[2].id]
+
+    response = await authenticated_client.delete(f"/api/schedules/{schedules[0]['id']}")
+    assert response.status_code == 204
+    response = await authenticated_client.delete(f"/api/schedules/{schedules[0]['id']}")
+    assert response.status_code == 404
+    response = await authenticated_client.get("/api/schedules/", params={"child_id": child_id})
+    assert len(response.json()) == 2
+
+
+async def test_schedules_for_unknown_child(authenticated_client):
+    response = await authenticated_client.post("/api/schedules/", json={"child_id": 99999, "chore_ids": [1]})
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def scheduled_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scheduler.db'}")
+    Base.metadata.create_all(engine)
+    seed_database(engine, SeedConfig(households=10, weeks=1, end_week=date(2024, 1, 1)), hashed_password="x")
+    with engine.begin() as conn:
+        pairs = conn.execute(
+            select(Child.id, Chore.id, Child.user_id).join(Chore, Chore.user_id == Child.user_id)
+        ).all()
+        conn.execute(insert(ChoreSchedule), [
+            {"child_id": child_id, "chore_id": chore_id, "user_id": user_id}
+            for child_id, chore_id, user_id in pairs
+        ])
+        expected = conn.scalar(
+            select(func.sum(Chore.frequency_per_week)).join(ChoreSchedule, ChoreSchedule.chore_id == Chore.id)
+        )
+    yield engine, expected
+    engine.dispose()
+
+
+def _week_counts(engine):
+    with engine.connect() as conn:
+        return (
+            conn.scalar(select(func.count()).where(ChoreAssignment.week_start == WEEK)),
+            conn.scalar(select(func.sum(WeeklyChildSummary.total_count)).where(WeeklyChildSummary.week_start == WEEK)),
+        )
+
+
+def test_generate_week_is_sharded_and_idempotent(scheduled_engine):
+    engine, expected = scheduled_engine
+
+    assert generate_week(engine, WEEK, dry_run=True).assignments == expected
+    assert _week_counts(engine) == (0, None)
+
+    runs = [generate_week(engine, WEEK, shard=shard, shards=3, batch_size=2) for shard in range(3)]
+    assert sum(run.households for run in runs) == 10
+    assert sum(run.assignments for run in runs) == expected
+    assert _week_counts(engine) == (expected, expected)
+
+    assert generate_week(engine, WEEK).assignments == 0
+    assert generate_week(engine, WEEK, dry_run=True).assignments == 0
+    assert _week_counts(engine) == (expected, expected)
+
+
+def test_generate_week_fills_in_partial_weeks(scheduled_engine):
+    engine, expected = scheduled_engine
+    with engine.begin() as conn:
+        schedule = conn.execute(select(ChoreSchedule.__table__).limit(1)).one()
+        conn.execute(insert(ChoreAssignment), [{
+            "child_id": schedule.child_id, "chore_id": schedule.chore_id, "user_id": schedule.user_id,
+            "week_start": WEEK, "occurrence_number": 1, "is_completed": True,
+        }])
+
+    assert generate_week(engine, WEEK).assignments == expected - 1
+    assert _week_counts(engine) == (expected, expected)
+
+
+def test_generate_week_in_bitmap_storage(scheduled_engine, monkeypatch):
+    monkeypatch.setattr("app.services.storage.ASSIGNMENT_STORAGE", "bitmap")
+    engine, expected = scheduled_engine
+
+    assert generate_week(engine, WEEK, dry_run=True).assignments == expected
+    assert generate_week(engine, WEEK, batch_size=3).assignments == expected
+    assert generate_week(engine, WEEK).assignments == 0
+    with engine.connect() as conn:
+        rows = conn.scalar(select(func.count()).where(WeeklyChoreCompletion.week_start == WEEK))
+        schedules = conn.scalar(select(func.count()).select_from(ChoreSchedule))
+        assert conn.scalar(select(func.sum(WeeklyChildSummary.total_count)).where(
+            WeeklyChildSummary.week_start == WEEK
+        )) == expected
+    # One row per scheduled chore instead of one per occurrence
+    assert rows == schedules
+    assert _week_counts(engine)[0] == 0
@@ -0,0 +1,34 @@
+# app/tests/test_seed.py
+from datetime import date
+from sqlalchemy import create_engine, select
+from app.database import Base
+from app.models import ChoreAssignment, WeeklyChildSummary
+from app.seed import SeedConfig, seed_database
+
+
+def _seed(path, **overrides):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    config = SeedConfig(households=3, children=2, chores=3, weeks=4, end_week=date(2024, 1, 1), **overrides)
+    counts = seed_database(engine, config, hashed_password="x")
+    with engine.connect() as conn:
+        rows = conn.execute(select(ChoreAssignment.__table__).order_by(ChoreAssignment.id)).all()
+        summaries = conn.execute(select(WeeklyChildSummary.__table__)).all()
+    engine.dispose()
+    return counts, rows, summaries
+
+
+def test_seed_is_deterministic(tmp_path):
+    counts, rows, summaries = _seed(tmp_path / "a.db")
+    _, same_rows, _ = _seed(tmp_path / "b.db")
+    _, other_rows, _ = _seed(tmp_path / "c.db", seed=7)
+
+    assert counts["users"] == 3
+    assert counts["children"] == 6
+    assert counts["chore_assignments"] == len(rows) > 0
+    assert rows == same_rows
+    assert rows != other_rows
+    # One summary per child per week
+    assert counts["weekly_child_summary"] == len(summaries) == 6 * 4
+    # The current week is never completed
+    assert not any(row.is_completed for row in rows if row.week_start == date(2024, 1, 1))
@@ -0,0 +1,123 @@
+# app/tests/test_summaries.py
+from datetime import date, timedelta
+from sqlalchemy import select
+from app.dependencies import create_access_token
+from app.models.chores import WeeklyChildSummary
+from app.models.user import User
+from app.services.summaries import rebuild_summaries
+
+
+def _monday():
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+async def _summaries(client, **params):
+    week = _monday()
+    params = {"start": week.isoformat(), "end": week.isoformat(), **params}
+    response = await client.get("/api/summaries/", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_summary_tracks_assign_and_complete(authenticated_client, sample_data):
+    child = sample_data["children"]["bob"]
+    chores = sample_data["chores"]
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        "child_id": child.id,
+        "chore_ids": [chores[0].id, chores[2].id],
+        "week_start": (_monday() + timedelta(weeks=1)).isoformat()
+    })
+    assert response.status_code == 200
+    assignments = response.json()
+    assert len(assignments) == 3
+
+    for assignment in assignments[:2]:
+        response = await authenticated_client.put(f"/api/assignments/{assignment['id']}/complete")
+        assert response.status_code == 200
+    # Completing again must not count twice
+    await authenticated_client.put(f"/api/assignments/{assignments[0]['id']}/complete")
+
+    next_week = (_monday() + timedelta(weeks=1)).isoformat()
+    summaries = await _summaries(
+        authenticated_client, start=next_week, end=next_week, child_id=child.id
+    )
+    assert summaries == [{
+        "child_id": child.id,
+        "week_start": next_week,
+        "total_count": 3,
+        "completed_count": 2,
+        "earned_allowance": child.weekly_allowance * 2 / 3,
+        "completion_rate": 2 / 3,
+    }]
+
+
+async def test_rebuild_matches_assignments(authenticated_client, db_session, sample_data):
+    # sample_data writes assignments directly, so there are no summaries yet
+    assert await _summaries(authenticated_client) == []
+
+    connection = await db_session.connection()
+    rows = await connection.run_sync(rebuild_summaries)
+    assert rows == 2
+
+    summaries = {s["child_id"]: s for s in await _summaries(authenticated_client)}
+    for child in sample_data["children"].values():
+        expected = [a for a in sample_data["assignments"] if a.child_id == child.id]
+        assert summaries[child.id]["total_count"] == len(expected)
+        assert summaries[child.id]["completed_count"] == sum(a.is_completed for a in expected)
+
+
+async def test_rebuild_for_one_user_keeps_others(db_session, sample_data):
+    connection = await db_session.connection()
+    await connection.run_sync(rebuild_summaries)
+    before = (await db_session.scalars(select(WeeklyChildSummary))).all()
+
+    rows = await connection.run_sync(rebuild_summaries, sample_data["user"].id + 1)
+    assert rows == 0
+    after = (await db_session.scalars(select(WeeklyChildSummary))).all()
+    assert len(after) == len(before)
+
+
+async def test_batch_complete_updates_rows_and_summary(authenticated_client, sample_data, count_queries):
+    child = sample_data["children"]["alice"]
+    week = (_monday() + timedelta(weeks=2)).isoformat()
+    response = await authenticated_client.post("/api/weekly-assignments/", json={
+        "child_id": child.id,
+        "chore_ids": [chore.id for chore in sample_data["chores"]],
+        "week_start": week
+    })
+    ids = [assignment["id"] for assignment in response.json()]
+    assert len(ids) == 10
+
+    with count_queries() as counter:
+        response = await authenticated_client.put("/api/assignments/complete", json={
+            "assignment_ids": ids[:6] + [99999]
+        })
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()] == ["updated"] * 6 + ["not_found"]
+    # select, update, one summary upsert and commit, independent of batch size
+    assert counter.count <= 4
+
+    response = await authenticated_client.put("/api/assignments/complete", json={
+        "assignment_ids": ids[4:8], "completed": False
+    })
+    assert [r["status"] for r in response.json()] == ["updated", "updated", "unchanged", "unchanged"]
+
+    [summary] = await _summaries(authenticated_client, start=week, end=week, child_id=child.id)
+    assert summary["total_count"] == 10
+    assert summary["completed_count"] == 4
+
+
+async def test_batch_complete_ignores_other_users_assignments(client, db_session, sample_data):
+    other = User(username="other", email="other@example.com", hashed_password="x")
+    db_session.add(other)
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'other'})}"}
+
+    assignment = sample_data["assignments"][0]
+    response = await client.put(
+        "/api/assignments/complete", json={"assignment_ids": [assignment.id]}, headers=headers
+    )
+    assert response.json() == [{"id": assignment.id, "status": "not_found"}]
+    await db_session.refresh(assignment)
+    assert assignment.is_completed is False
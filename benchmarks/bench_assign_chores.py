@@ -0,0 +1,102 @@
+# benchmarks/bench_assign_chores.py
+"""
+Compare the batched assign_chores path with the previous per-chore loop.
+
+The timed block covers the database work and serializing the result
+through the endpoint's response model, so lazy loads triggered while
+building the response are counted too.
+
+    python -m benchmarks.bench_assign_chores [--chores 20] [--frequency 7] [--runs 50]
+"""
+import argparse
+import asyncio
+import json
+from datetime import date, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from benchmarks.common import (
+    QueryCounter, make_engine, make_session_factory, seed_household, summarize, timer
+)
+from app.models import Chore, ChoreAssignment
+from app.schemas.chores import ChoreAssignmentCreate, ChoreAssignment as ChoreAssignmentResponse
+from app.services.assignments import create_weekly_assignments
+
+response_adapter = TypeAdapter(List[ChoreAssignmentResponse])
+
+
+async def legacy_assign_chores(db, user_id, assignment):
+    """The original implementation: one SELECT per chore, one refresh per row."""
+    assignments = []
+    for chore_id in assignment.chore_ids:
+        chore = await db.scalar(select(Chore).where(
+            Chore.id == chore_id,
+            Chore.user_id == user_id
+        ))
+        if not chore:
+            continue
+        for occurrence in range(1, chore.frequency_per_week + 1):
+            db_assignment = ChoreAssignment(
+                child_id=assignment.child_id,
+                chore_id=chore_id,
+                user_id=user_id,
+                week_start=assignment.week_start,
+                occurrence_number=occurrence,
+                is_completed=False
+            )
+            db.add(db_assignment)
+            assignments.append(db_assignment)
+    await db.commit()
+    for a in assignments:
+        await db.refresh(a)
+    return assignments
+
+
+def serialize(result) -> bytes:
+    return response_adapter.dump_json(
+        response_adapter.validate_python(result, from_attributes=True)
+    )
+
+
+async def run(impl, engine, session_factory, user_id, child_id, chore_ids, runs):
+    samples = []
+    queries = 0
+    week = date(2024, 1, 1)
+    for i in range(runs):
+        payload = ChoreAssignmentCreate(
+            child_id=child_id,
+            chore_ids=chore_ids,
+            week_start=week + timedelta(weeks=i)
+        )
+        async with session_factory() as db:
+            with QueryCounter(engine) as counter, timer(samples):
+                result = await impl(db, user_id, payload)
+                # run_sync lets relationship lazy loads happen, as they would
+                # have in the original synchronous handler
+                await db.run_sync(lambda _: serialize(result))
+            queries = counter.count
+    return {"queries_per_call": queries, **summarize(samples)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chores", type=int, default=20)
+    parser.add_argument("--frequency", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    report = {"chores": args.chores, "frequency": args.frequency}
+    for name, impl in (("before", legacy_assign_chores), ("after", create_weekly_assignments)):
+        engine = make_engine()
+        session_factory = make_session_factory(engine)
+        async with session_factory() as db:
+            user, child, chore_ids = await seed_household(db, args.chores, args.frequency)
+        report[name] = await run(impl, engine, session_factory, user.id, child.id, chore_ids, args.runs)
+        await engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+# benchmarks/bench_auth.py
+"""
+Per-request cost of the get_current_user dependency with and without the
+verified-token and user caches.
+
+    python -m benchmarks.bench_auth [--calls 5000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import make_engine, make_session_factory, seed_household
+from app.dependencies import create_access_token, get_current_user, token_cache, user_cache
+
+SCENARIOS = {
+    "no_cache": (False, False),
+    "user_cache": (False, True),
+    "token_and_user_cache": (True, True),
+}
+
+
+async def run(session_factory, token, calls, use_token_cache, use_user_cache):
+    token_cache.clear()
+    user_cache.clear()
+    async with session_factory() as db:
+        start = time.perf_counter()
+        for _ in range(calls):
+            if not use_token_cache:
+                token_cache.clear()
+            if not use_user_cache:
+                user_cache.clear()
+            user = await get_current_user(token, db)
+            assert user is not None
+        elapsed = time.perf_counter() - start
+    return {"calls": calls, "us_per_call": round(elapsed / calls * 1_000_000, 2)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    session_factory = make_session_factory(engine)
+    async with session_factory() as db:
+        user, _, _ = await seed_household(db, chores=1)
+    token = create_access_token(data={"sub": user.username})
+
+    report = {}
+    for name, (use_token_cache, use_user_cache) in SCENARIOS.items():
+        report[name] = await run(session_factory, token, args.calls, use_token_cache, use_user_cache)
+    await engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+# benchmarks/bench_batch_complete.py
+"""
+Time to check off a day's assignments: one PUT per assignment, as the kiosk
+UI does today, versus a single PUT /api/assignments/complete.
+
+Each run assigns a fresh week over HTTP (untimed), then completes
+--batch of its assignments against a uvicorn worker on SQLite.
+
+    python -m benchmarks.bench_batch_complete [--batch 20] [--runs 30]
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import date, timedelta
+
+import httpx
+
+from benchmarks.common import make_engine, make_session_factory, seed_household, summarize, timer, uvicorn_server
+from app.dependencies import create_access_token
+
+
+async def seed(path, batch):
+    engine = make_engine(path)
+    async with make_session_factory(engine)() as db:
+        user, child, chore_ids = await seed_household(db, chores=batch, frequency=1)
+    await engine.dispose()
+    return user.username, child.id, chore_ids
+
+
+async def complete_one_by_one(client, ids):
+    for assignment_id in ids:
+        response = await client.put(f"/api/assignments/{assignment_id}/complete")
+        assert response.status_code == 200, response.text
+
+
+async def complete_batch(client, ids):
+    response = await client.put("/api/assignments/complete", json={"assignment_ids": ids})
+    assert response.status_code == 200, response.text
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=20, help="assignments completed per run")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    path = os.path.abspath("chores-bench-batch-complete.db")
+    username, child_id, chore_ids = await seed(path, args.batch)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+    report = {"assignments": args.batch}
+    week = date(2024, 1, 1)
+    try:
+        async with uvicorn_server(path, port=args.port) as url:
+            async with httpx.AsyncClient(base_url=url, headers=headers, timeout=60) as client:
+                for name, impl in (("per_item", complete_one_by_one), ("batch", complete_batch)):
+                    samples = []
+                    for _ in range(args.runs):
+                        response = await client.post("/api/weekly-assignments/", json={
+                            "child_id": child_id, "chore_ids": chore_ids, "week_start": week.isoformat()
+                        })
+                        assert response.status_code == 200, response.text
+                        week += timedelta(weeks=1)
+                        ids = [assignment["id"] for assignment in response.json()]
+                        with timer(samples):
+                            await impl(client, ids)
+                    report[name] = summarize(samples)
+    finally:
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+# benchmarks/bench_concurrency.py
+"""
+Throughput of a single uvicorn worker at increasing client concurrency.
+
+Starts ``uvicorn app.main:app --workers 1`` against a seeded SQLite file
+(or targets ``--url`` if a server is already running, e.g. on MySQL) and
+drives authenticated read requests from concurrent clients.
+
+    python -m benchmarks.bench_concurrency [--concurrency 1 8 32] [--requests 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+
+import httpx
+
+from benchmarks.common import (
+    make_engine, make_session_factory, seed_household, summarize, uvicorn_server, wait_until_ready
+)
+from app.dependencies import create_access_token
+from app.schemas.chores import ChoreAssignmentCreate
+from app.services.assignments import create_weekly_assignments
+
+WEEK_START = date(2024, 1, 1)
+
+
+async def seed(path):
+    engine = make_engine(path)
+    async with make_session_factory(engine)() as db:
+        user, child, chore_ids = await seed_household(db, chores=20, frequency=3)
+        await create_weekly_assignments(db, user.id, ChoreAssignmentCreate(
+            child_id=child.id, chore_ids=chore_ids, week_start=WEEK_START
+        ))
+    await engine.dispose()
+    return user.username, child.id
+
+
+@asynccontextmanager
+async def existing_server(url):
+    await wait_until_ready(url)
+    yield url
+
+
+async def drive(url, headers, paths, concurrency, total):
+    samples = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(paths[i % len(paths)])
+
+    async def client_loop(client):
+        nonlocal errors
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests_per_sec": round(total / elapsed, 1),
+        "errors": errors,
+        **summarize(samples),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--url", help="benchmark an already running server instead")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--child-id", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    username, child_id = args.username, args.child_id
+    if args.url is None:
+        path = os.path.abspath("chores-bench-concurrency.db")
+        username, child_id = await seed(path)
+        server = uvicorn_server(path, port=args.port)
+    else:
+        server = existing_server(args.url)
+
+    async with server as url:
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+        paths = [
+            "/api/chores/",
+            "/api/children/",
+            f"/api/weekly-assignments/{child_id}?week_start={WEEK_START.isoformat()}",
+        ]
+        report = {"url": url, "workers": 1, "results": []}
+        for concurrency in args.concurrency:
+            report["results"].append(
+                await drive(url, headers, paths, concurrency, args.requests)
+            )
+    if args.url is None:
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+# benchmarks/bench_indexes.py
+"""
+Query plans and latencies of the main access paths with and without the
+assignment indexes, on a SQLite database seeded with many assignments.
+
+    python -m benchmarks.bench_indexes [--rows 1000000] [--users 1000] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import MetaData, UniqueConstraint, create_engine, text
+
+from benchmarks.common import summarize
+from app.database import Base
+from app.seed import SeedConfig, seed_database
+
+NEW_INDEXES = {
+    "ix_children_user_id",
+    "ix_chores_user_id",
+    "ix_chore_assignments_child_user_week",
+    "ix_chore_assignments_user_id_id",
+}
+CHILDREN_PER_USER = 2
+CHORES_PER_USER = 5
+MAX_FREQUENCY = 3
+END_WEEK = date(2024, 12, 30)
+
+QUERIES = {
+    "weekly_assignments": (
+        "SELECT * FROM chore_assignments "
+        "WHERE child_id = :child_id AND user_id = :user_id AND week_start = :week_start"
+    ),
+    "complete_assignment": "SELECT * FROM chore_assignments WHERE id = :assignment_id AND user_id = :user_id",
+    "children_by_user": "SELECT * FROM children WHERE user_id = :user_id",
+    "chores_by_user": "SELECT * FROM chores WHERE user_id = :user_id",
+}
+
+
+def schema(with_indexes: bool) -> MetaData:
+    if with_indexes:
+        return Base.metadata
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for index in list(copy.indexes):
+            if index.name in NEW_INDEXES:
+                copy.indexes.discard(index)
+        for constraint in list(copy.constraints):
+            if isinstance(constraint, UniqueConstraint):
+                copy.constraints.discard(constraint)
+    return metadata
+
+
+def seed(engine, rows, users):
+    config = SeedConfig(
+        households=users, children=CHILDREN_PER_USER, chores=CHORES_PER_USER,
+        max_frequency=MAX_FREQUENCY, end_week=END_WEEK, summaries=False
+    )
+    config.weeks = max(1, round(rows * config.weeks / config.expected_assignments()))
+    seed_database(engine, config, hashed_password="x")
+    return config.weeks
+
+
+def measure(engine, weeks, repeat):
+    rng = random.Random(42)
+    with engine.connect() as conn:
+        children = conn.execute(text("SELECT id, user_id FROM children")).all()
+        max_id = conn.execute(text("SELECT MAX(id) FROM chore_assignments")).scalar()
+        report = {}
+        for name, sql in QUERIES.items():
+            samples = []
+            plan = None
+            for _ in range(repeat):
+                child_id, user_id = rng.choice(children)
+                params = {
+                    "user_id": user_id,
+                    "child_id": child_id,
+                    "week_start": END_WEEK - timedelta(weeks=rng.randrange(weeks)),
+                    "assignment_id": rng.randint(1, max_id),
+                }
+                if plan is None:
+                    plan = [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)]
+                start = time.perf_counter()
+                conn.execute(text(sql), params).fetchall()
+                samples.append(time.perf_counter() - start)
+            report[name] = {"plan": plan, **summarize(samples)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    report = {"rows": args.rows, "users": args.users}
+    for name, with_indexes in (("before", False), ("after", True)):
+        fd, path = tempfile.mkstemp(prefix="chores-bench-indexes-", suffix=".db")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{path}")
+        metadata = schema(with_indexes)
+        metadata.create_all(engine)
+        start = time.perf_counter()
+        weeks = seed(engine, args.rows, args.users)
+        report[name] = {
+            "seed_seconds": round(time.perf_counter() - start, 1),
+            "queries": measure(engine, weeks, args.repeat),
+        }
+        engine.dispose()
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_password_hashing.py
+"""
+Latency of unrelated requests while logins are in flight.
+
+Runs one uvicorn worker with bcrypt on the event loop
+(PASSWORD_HASH_WORKERS=0) and then on the bcrypt thread pool. In each
+run, concurrent clients keep calling POST /token while a probe client
+measures GET /api/chores/.
+
+    python -m benchmarks.bench_password_hashing [--logins 4] [--duration 5] [--rounds 12]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+from passlib.context import CryptContext
+
+from benchmarks.common import make_engine, make_session_factory, seed_household, summarize, uvicorn_server
+from app.dependencies import create_access_token
+
+PASSWORD = "benchmark-password"
+
+
+async def seed(path, rounds):
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(PASSWORD)
+    engine = make_engine(path)
+    async with make_session_factory(engine)() as db:
+        user, _, _ = await seed_household(db, chores=10, frequency=1, hashed_password=hashed)
+    await engine.dispose()
+    return user.username
+
+
+async def measure(url, username, logins, duration):
+    deadline = time.monotonic() + duration
+    probe_samples = []
+    login_samples = []
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': username})}"}
+
+    async def login_loop(client):
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            response = await client.post("/token", data={"username": username, "password": PASSWORD})
+            login_samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    async def probe_loop(client):
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            response = await client.get("/api/chores/", headers=headers)
+            probe_samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+            await asyncio.sleep(0.01)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        await asyncio.gather(probe_loop(client), *(login_loop(client) for _ in range(logins)))
+
+    return {
+        "logins_per_sec": round(len(login_samples) / duration, 1),
+        "login": summarize(login_samples),
+        "unrelated_request": summarize(probe_samples),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=4, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt rounds")
+    parser.add_argument("--workers", type=int, default=2, help="bcrypt threads for the offloaded run")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    path = os.path.abspath("chores-bench-password.db")
+    username = await seed(path, args.rounds)
+    report = {"bcrypt_rounds": args.rounds, "concurrent_logins": args.logins}
+    try:
+        for name, workers in (("inline", 0), ("thread_pool", args.workers)):
+            env = {"PASSWORD_HASH_WORKERS": str(workers), "BCRYPT_ROUNDS": str(args.rounds)}
+            async with uvicorn_server(path, port=args.port, env=env) as url:
+                report[name] = await measure(url, username, args.logins, args.duration)
+    finally:
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
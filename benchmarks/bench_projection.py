@@ -0,0 +1,120 @@
+# benchmarks/bench_projection.py
+"""
+Loading list responses as ORM entities versus column-projected rows.
+
+Seeds one household with --rows chores and --rows assignments in a single
+week, then for each listing compares:
+
+- orm: select the mapped entity (plus joinedload for the weekly list) and
+  validate the instances into the response model
+- columns: select only the response columns, as the list endpoints do,
+  and validate plain dicts
+
+Latency covers query plus validation over --runs runs; memory is the
+tracemalloc peak of one extra run divided by the row count.
+
+    python -m benchmarks.bench_projection [--rows 100000] [--runs 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tracemalloc
+from datetime import date
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import make_database, make_session_factory, summarize, timer
+from app.models import Chore, ChoreAssignment
+from app.routers.chores import CHORE_COLUMNS
+from app.schemas.chores import Chore as ChoreResponse, ChoreAssignment as ChoreAssignmentResponse
+from app.seed import SeedConfig, seed_database
+from app.services.assignments import weekly_assignment_payloads
+
+WEEK = date(2024, 1, 1)
+
+chore_adapter = TypeAdapter(List[ChoreResponse])
+assignment_adapter = TypeAdapter(List[ChoreAssignmentResponse])
+
+
+async def chores_orm(db, user_id, child_id):
+    chores = (await db.scalars(select(Chore).where(Chore.user_id == user_id))).all()
+    return chore_adapter.validate_python(chores, from_attributes=True)
+
+
+async def chores_columns(db, user_id, child_id):
+    rows = await db.execute(select(*CHORE_COLUMNS).where(Chore.user_id == user_id))
+    return chore_adapter.validate_python([row._asdict() for row in rows])
+
+
+async def weekly_orm(db, user_id, child_id):
+    assignments = (await db.scalars(select(ChoreAssignment).options(
+        joinedload(ChoreAssignment.chore)
+    ).where(
+        ChoreAssignment.child_id == child_id,
+        ChoreAssignment.user_id == user_id,
+        ChoreAssignment.week_start == WEEK
+    ))).all()
+    return assignment_adapter.validate_python(assignments, from_attributes=True)
+
+
+async def weekly_columns(db, user_id, child_id):
+    # Already JSON-ready; the endpoint dumps these without validating
+    return await weekly_assignment_payloads(db, user_id, child_id, WEEK)
+
+
+LISTINGS = {
+    "chores": {"orm": chores_orm, "columns": chores_columns},
+    "weekly_assignments": {"orm": weekly_orm, "columns": weekly_columns},
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    path = make_database(os.path.abspath("chores-bench-projection.db"))
+    sync_engine = create_engine(f"sqlite:///{path}")
+    seed_database(sync_engine, SeedConfig(
+        households=1, children=1, chores=args.rows, weeks=1, max_frequency=1,
+        end_week=WEEK, summaries=False
+    ), hashed_password="x")
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = make_session_factory(engine)
+    report = {"rows": args.rows}
+    try:
+        for listing, implementations in LISTINGS.items():
+            report[listing] = {}
+            for name, load in implementations.items():
+                samples = []
+                for _ in range(args.runs):
+                    async with session_factory() as db:
+                        with timer(samples):
+                            await load(db, 1, 1)
+
+                async with session_factory() as db:
+                    tracemalloc.start()
+                    items = await load(db, 1, 1)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                assert len(items) == args.rows, (listing, name, len(items))
+                report[listing][name] = {
+                    "bytes_per_row": round(peak / args.rows),
+                    **summarize(samples),
+                }
+    finally:
+        await engine.dispose()
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
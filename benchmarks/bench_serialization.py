@@ -0,0 +1,112 @@
+# benchmarks/bench_serialization.py
+"""
+Cost of producing the weekly assignment list body for a large week.
+
+Compares, on one week of --rows assignments:
+
+- orm_jsonable_encoder: ORM rows with joinedload, validated into the
+  response model, then jsonable_encoder + json.dumps (FastAPI's default
+  response_model path)
+- orm_type_adapter: ORM rows validated and dumped by a pydantic TypeAdapter
+- rows_orjson: column tuples turned into dicts and dumped by orjson, as
+  get_weekly_assignments does now
+
+Each is timed with its query ("total") and on pre-fetched data
+("serialize").
+
+    python -m benchmarks.bench_serialization [--rows 10000] [--runs 30]
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import date
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import make_engine, make_session_factory, seed_household, summarize, timer
+from app.models import ChoreAssignment
+from app.schemas.chores import ChoreAssignment as ChoreAssignmentResponse, ChoreAssignmentCreate
+from app.services.assignments import create_weekly_assignments, weekly_assignment_payloads
+
+FREQUENCY = 7
+WEEK = date(2024, 1, 1)
+
+adapter = TypeAdapter(List[ChoreAssignmentResponse])
+
+
+async def load_orm(db, user_id, child_id):
+    return (await db.scalars(select(ChoreAssignment).options(
+        joinedload(ChoreAssignment.chore)
+    ).where(
+        ChoreAssignment.child_id == child_id,
+        ChoreAssignment.user_id == user_id,
+        ChoreAssignment.week_start == WEEK
+    ))).all()
+
+
+def dump_jsonable_encoder(rows):
+    return json.dumps(jsonable_encoder(adapter.validate_python(rows, from_attributes=True))).encode()
+
+
+def dump_type_adapter(rows):
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+IMPLEMENTATIONS = {
+    "orm_jsonable_encoder": (load_orm, dump_jsonable_encoder),
+    "orm_type_adapter": (load_orm, dump_type_adapter),
+    "rows_orjson": (
+        lambda db, user_id, child_id: weekly_assignment_payloads(db, user_id, child_id, WEEK),
+        orjson.dumps,
+    ),
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000, help="assignments in the week")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    path = os.path.abspath("chores-bench-serialization.db")
+    engine = make_engine(path)
+    session_factory = make_session_factory(engine)
+    try:
+        async with session_factory() as db:
+            user, child, chore_ids = await seed_household(
+                db, chores=-(-args.rows // FREQUENCY), frequency=FREQUENCY
+            )
+            await create_weekly_assignments(
+                db, user.id, ChoreAssignmentCreate(child_id=child.id, chore_ids=chore_ids, week_start=WEEK)
+            )
+
+        report = {"rows": len(chore_ids) * FREQUENCY}
+        bodies = {}
+        for name, (load, dump) in IMPLEMENTATIONS.items():
+            total, serialize = [], []
+            for _ in range(args.runs):
+                # A fresh session per run, like a request, so the identity map starts empty
+                async with session_factory() as db:
+                    with timer(total):
+                        rows = await load(db, user.id, child.id)
+                        body = dump(rows)
+                    with timer(serialize):
+                        dump(rows)
+            bodies[name] = json.loads(body)
+            report[name] = {"total": summarize(total), "serialize": summarize(serialize), "bytes": len(body)}
+        assert all(sorted(b, key=lambda a: a["id"]) == sorted(bodies["rows_orjson"], key=lambda a: a["id"])
+                   for b in bodies.values())
+    finally:
+        await engine.dispose()
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+# benchmarks/bench_storage.py
+"""
+Row storage versus bitmap storage of weekly assignments.
+
+Seeds --households households with --weeks weeks of history in
+chore_assignments (chore frequencies drawn from 1..--max-frequency), then
+converts it to weekly_chore_completions and compares:
+
+- rows and on-disk bytes (table plus its indexes, from SQLite's dbstat)
+  of each storage
+- latency of reading one child's week, as GET /api/weekly-assignments
+  does, over --runs randomly chosen child/week pairs
+
+    python -m benchmarks.bench_storage [--households 200] [--weeks 52] [--max-frequency 7]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import make_database, make_session_factory, summarize, timer
+from app.models import ChoreAssignment, WeeklyChoreCompletion
+from app.seed import SeedConfig, seed_database
+from app.services import assignments as row_storage, completions as bitmap_storage
+
+END_WEEK = date(2024, 1, 1)
+
+
+def table_bytes(connection, table) -> int:
+    """Pages used by a table and all of its indexes."""
+    return connection.scalar(text(
+        "SELECT SUM(d.pgsize) FROM dbstat d JOIN sqlite_master m ON m.name = d.name"
+        " WHERE m.tbl_name = :table"
+    ), {"table": table.name})
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--households", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--max-frequency", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    path = make_database(os.path.abspath("chores-bench-storage.db"))
+    sync_engine = create_engine(f"sqlite:///{path}")
+    seed_database(sync_engine, SeedConfig(
+        households=args.households, weeks=args.weeks, max_frequency=args.max_frequency,
+        end_week=END_WEEK, summaries=False
+    ), hashed_password="x")
+    started = time.perf_counter()
+    bitmap_storage.convert_to_bitmap(sync_engine)
+    convert_seconds = time.perf_counter() - started
+
+    report = {"max_frequency": args.max_frequency, "convert_seconds": round(convert_seconds, 2)}
+    with sync_engine.connect() as conn:
+        for name, model in (("rows", ChoreAssignment), ("bitmap", WeeklyChoreCompletion)):
+            report[name] = {
+                "rows": conn.scalar(select(func.count()).select_from(model)),
+                "bytes": table_bytes(conn, model.__table__),
+            }
+        weeks = conn.execute(select(
+            WeeklyChoreCompletion.user_id, WeeklyChoreCompletion.child_id, WeeklyChoreCompletion.week_start
+        ).distinct()).all()
+    sync_engine.dispose()
+    report["row_ratio"] = round(report["rows"]["rows"] / report["bitmap"]["rows"], 2)
+    report["byte_ratio"] = round(report["rows"]["bytes"] / report["bitmap"]["bytes"], 2)
+
+    sample = random.Random(42).choices(weeks, k=args.runs)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = make_session_factory(engine)
+    try:
+        for name, storage in (("rows", row_storage), ("bitmap", bitmap_storage)):
+            samples = []
+            async with session_factory() as db:
+                for user_id, child_id, week_start in sample:
+                    with timer(samples):
+                        await storage.weekly_assignment_payloads(db, user_id, child_id, week_start)
+            report[name]["weekly_read"] = summarize(samples)
+    finally:
+        await engine.dispose()
+        os.remove(path)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
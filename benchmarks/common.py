@@ -0,0 +1,121 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the repository root, e.g.
+``python -m benchmarks.bench_assign_chores``.
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+os.environ.setdefault("TEST_MODE", "true")
+
+import httpx
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, QueryCounter
+from app.models import Child, Chore, User
+
+
+def make_database(path: str | None = None) -> str:
+    """Create a fresh SQLite database file with the app schema and return its path."""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="chores-bench-", suffix=".db")
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return path
+
+
+def make_engine(path: str | None = None):
+    """Async engine on a fresh SQLite database, like the one the API uses."""
+    return create_async_engine(f"sqlite+aiosqlite:///{make_database(path)}")
+
+
+def make_session_factory(engine):
+    """Session factory configured like app.database.AsyncSessionLocal."""
+    return async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+async def seed_household(
+    session, chores: int = 20, frequency: int = 7, username: str = "bench", hashed_password: str = "x"
+):
+    """Create a user with one child and ``chores`` chores."""
+    user = User(
+        username=username, email=f"{username}@example.com", hashed_password=hashed_password, is_active=True
+    )
+    session.add(user)
+    await session.flush()
+    child = Child(name="Child", weekly_allowance=10.0, user_id=user.id)
+    session.add(child)
+    session.add_all([
+        Chore(name=f"Chore {i}", description="", frequency_per_week=frequency, user_id=user.id)
+        for i in range(chores)
+    ])
+    await session.commit()
+    chore_ids = list(await session.scalars(select(Chore.id).where(Chore.user_id == user.id)))
+    return user, child, chore_ids
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return round(ordered[max(0, int(round(len(ordered) * fraction)) - 1)] * 1000, 3)
+
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+@contextmanager
+def timer(samples: list[float]):
+    start = time.perf_counter()
+    yield
+    samples.append(time.perf_counter() - start)
+
+
+async def wait_until_ready(url, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not become ready")
+
+
+@asynccontextmanager
+async def uvicorn_server(database_path: str, port: int = 8765, workers: int = 1, env: dict | None = None):
+    """Run ``uvicorn app.main:app`` on a SQLite file and yield its base URL."""
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(workers),
+         "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{database_path}", **(env or {})},
+    )
+    try:
+        await wait_until_ready(url)
+        yield url
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,235 @@
+# benchmarks/loadtest.py
+"""
+Mixed-workload load test of the full API with a JSON report.
+
+Seeds a database with synthetic households, starts uvicorn on it (or
+targets ``--url``), and runs ``--concurrency`` virtual users for
+``--duration`` seconds. Each virtual user acts for one household and
+picks operations by weight: login, listing children and chores, reading a
+week, completing an occurrence and assigning a new week. The RNG is
+seeded, so two runs issue the same request mix and their reports can be
+diffed between commits.
+
+    python -m benchmarks.loadtest [--households 50] [--weeks 52] [--concurrency 16]
+        [--duration 30] [--workers 1] [--output report.json]
+
+To run against MySQL, seed with ``--database-url mysql+pymysql://...``
+and point ``--url`` at a server using the same database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+
+import httpx
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, select
+
+from benchmarks.common import make_database, summarize, uvicorn_server, wait_until_ready
+from app.database import Base
+from app.dependencies import create_access_token
+from app.models import Child, Chore, ChoreAssignment, User
+from app.seed import SeedConfig, seed_database
+
+PASSWORD = "loadtest-password"
+
+# Relative frequency of each operation in the mix
+WORKLOAD = {
+    "login": 2,
+    "list_children": 10,
+    "list_chores": 15,
+    "weekly_assignments": 45,
+    "complete_assignment": 20,
+    "assign_week": 8,
+}
+
+
+@dataclass
+class Household:
+    username: str
+    child_ids: list
+    chore_ids: list
+    # Occurrences of the current, not yet completed week
+    assignment_ids: list
+    # Next week free for assign_week, past the seeded history
+    next_week: date
+
+
+def seed(database_url, config, bcrypt_rounds):
+    """Recreate the schema, seed it and load what the virtual users need."""
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=bcrypt_rounds).hash(PASSWORD)
+    seed_database(engine, replace(config, password=PASSWORD), hashed)
+
+    end_week = config.end_week
+    children = defaultdict(list)
+    chores = defaultdict(list)
+    assignments = defaultdict(list)
+    with engine.connect() as conn:
+        for child_id, user_id in conn.execute(select(Child.id, Child.user_id)):
+            children[user_id].append(child_id)
+        for chore_id, user_id in conn.execute(select(Chore.id, Chore.user_id)):
+            chores[user_id].append(chore_id)
+        for assignment_id, user_id in conn.execute(
+            select(ChoreAssignment.id, ChoreAssignment.user_id).where(ChoreAssignment.week_start == end_week)
+        ):
+            assignments[user_id].append(assignment_id)
+        households = [
+            Household(username, children[user_id], chores[user_id], assignments[user_id],
+                      end_week + timedelta(weeks=1))
+            for user_id, username in conn.execute(select(User.id, User.username).order_by(User.id))
+        ]
+    engine.dispose()
+    return households
+
+
+async def virtual_user(client, household, first_week, weeks, rng, deadline, samples, errors):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': household.username})}"}
+    operations = list(WORKLOAD)
+    weights = list(WORKLOAD.values())
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        if operation == "login":
+            request = client.post("/token", data={"username": household.username, "password": PASSWORD})
+        elif operation == "list_children":
+            request = client.get("/api/children/", headers=headers)
+        elif operation == "list_chores":
+            request = client.get("/api/chores/", headers=headers)
+        elif operation == "weekly_assignments":
+            week = first_week + timedelta(weeks=rng.randrange(weeks))
+            request = client.get(
+                f"/api/weekly-assignments/{rng.choice(household.child_ids)}",
+                params={"week_start": week.isoformat()}, headers=headers
+            )
+        elif operation == "complete_assignment":
+            request = client.put(
+                f"/api/assignments/{rng.choice(household.assignment_ids)}/complete", headers=headers
+            )
+        else:
+            request = client.post("/api/weekly-assignments/", json={
+                "child_id": rng.choice(household.child_ids),
+                "chore_ids": household.chore_ids,
+                "week_start": household.next_week.isoformat(),
+            }, headers=headers)
+            household.next_week += timedelta(weeks=1)
+
+        start = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        samples[operation].append(time.perf_counter() - start)
+        if not ok:
+            errors[operation] += 1
+
+
+@asynccontextmanager
+async def existing_server(url):
+    await wait_until_ready(url)
+    yield url
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--households", type=int, default=50)
+    parser.add_argument("--children", type=int, default=2, help="per household")
+    parser.add_argument("--chores", type=int, default=8, help="per household")
+    parser.add_argument("--max-frequency", type=int, default=3, help="chore frequencies are drawn from 1..N")
+    parser.add_argument("--weeks", type=int, default=52, help="weeks of seeded history")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for the data and the request mix")
+    parser.add_argument("--database-url", help="database to seed; default is a fresh SQLite file")
+    parser.add_argument("--url", help="target an already running server instead of starting uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        path = make_database(os.path.abspath("chores-loadtest.db"))
+        database_url = f"sqlite:///{path}"
+    end_week = date.today() - timedelta(days=date.today().weekday())
+    first_week = end_week - timedelta(weeks=args.weeks - 1)
+    config = SeedConfig(
+        households=args.households, children=args.children, chores=args.chores, weeks=args.weeks,
+        max_frequency=args.max_frequency, seed=args.seed, end_week=end_week
+    )
+    started = time.perf_counter()
+    households = seed(database_url, config, args.bcrypt_rounds)
+    seed_seconds = time.perf_counter() - started
+
+    if args.url is None:
+        server = uvicorn_server(path, port=args.port, workers=args.workers)
+    else:
+        server = existing_server(args.url)
+
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    try:
+        async with server as url:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+                deadline = time.monotonic() + args.duration
+                await asyncio.gather(*(
+                    virtual_user(
+                        client, households[i % len(households)], first_week, args.weeks,
+                        random.Random(args.seed + i), deadline, samples, errors
+                    )
+                    for i in range(args.concurrency)
+                ))
+    finally:
+        if path is not None:
+            os.remove(path)
+
+    total = sum(len(s) for s in samples.values())
+    report = {
+        "revision": git_revision(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "port")},
+        "seed_seconds": round(seed_seconds, 1),
+        "total": {
+            "errors": sum(errors.values()),
+            "requests_per_sec": round(total / args.duration, 1),
+            **summarize([t for s in samples.values() for t in s]),
+        },
+        "operations": {
+            operation: {
+                "errors": errors[operation],
+                "requests_per_sec": round(len(samples[operation]) / args.duration, 1),
+                **summarize(samples[operation]),
+            }
+            for operation in WORKLOAD if samples[operation]
+        },
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())